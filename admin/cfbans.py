@@ -1,20 +1,24 @@
 import asyncio
 from asyncio import TimeoutError
-import re
 
 from pyrogram import filters
 from pyrogram.types import Message, User
 from ub_core.utils.helpers import get_name
 
-from app import BOT, Config, CustomDB, Message, bot, extra_config
+from app import BOT, Config, Message, bot, extra_config
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.settings import FANOUT_CONCURRENCY
+from app.modules.utils.correlator import CORRELATOR
+from app.modules.utils.ratelimit import call_with_flood_retry
+from app.modules.utils import ban_jobs
+from app.modules.utils.dbcache import FED_LIST
 
-FED_DB = CustomDB["FED_LIST"]
+FED_DB = FED_LIST
 
-BASIC_FILTER = filters.user([609517172, 2059887769, 1376954911, 885745757]) & ~filters.service
-FBAN_REGEX = BASIC_FILTER & filters.regex(r"New FedBan|start.* a federation ban|FedBan Reason update.*|Would you like to update", re.IGNORECASE)
-UNFBAN_REGEX = BASIC_FILTER & filters.regex(r"New un-FedBan|I'll give|Un-FedBan", re.IGNORECASE)
+FED_REPLY_TIMEOUT = 10
+
+FED_BOT_IDS = [609517172, 2059887769, 1376954911, 885745757]
 
 def parse_selection(text: str, total_feds: int) -> list[int] | None:
     text = text.replace(" ", "")
@@ -76,7 +80,7 @@ async def _choose_and_perform_fed_action(bot: BOT, message: Message, with_proof:
     feds = []
     output = "<b>List Of Connected Feds:</b>\n"
     i = 1
-    async for fed in FED_DB.find():
+    for fed in await FED_DB.all():
         feds.append(fed); output += f"{i}. {fed['name']}\n"; i += 1
 
     if not feds: await progress.edit("You don't have any Feds Connected."); return
@@ -105,63 +109,74 @@ async def _choose_and_perform_fed_action(bot: BOT, message: Message, with_proof:
     await progress.edit("❯❯")
 
     cmd_text = f"/{action} <a href='tg://user?id={user_id}'>{user_id}</a> {reason}"
-    task_filter = FBAN_REGEX if action == "fban" else UNFBAN_REGEX
-    failed_feds = []
-
-    for fed in selected_feds:
-        try:
-            cmd_msg = await bot.send_message(fed["_id"], cmd_text, disable_preview=True)
-
+    job = await ban_jobs.create_job(
+        kind=action,
+        command=cmd_text,
+        user_id=user_id,
+        user_mention=user_mention,
+        reason=reason,
+        targets={fed["_id"]: fed["name"] for fed in selected_feds},
+        initiated_in=message.chat.title or "PM",
+        by=None if message.is_from_owner else get_name(message.from_user),
+    )
+    await ban_jobs.run_job(job, progress)
+
+async def run_fed_job(job: dict, progress: Message | None = None, states: tuple[str, ...] = (ban_jobs.PENDING,)):
+    action = job["kind"]
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+
+    async def perform_in_fed(chat_id: int, fed: dict):
+        async with semaphore:
             try:
-                await cmd_msg.get_response(filters=task_filter, timeout=8)
-                await asyncio.sleep(2)
-            except asyncio.TimeoutError:
-                pass
-
-            replies = []
-            async for msg in bot.get_chat_history(chat_id=fed["_id"], limit=30):
-                if msg.reply_to_message_id == cmd_msg.id:
-                    replies.append(msg)
-
-            if not replies:
-                failed_feds.append(fed["name"])
-            else:
-                for resp in replies:
-                    if resp.text and "Would you like to update" in resp.text:
-                        try:
-                            await resp.click("Update reason")
-                            await asyncio.sleep(0.2)
-                        except Exception:
-                            pass
-
-        except Exception as e:
-            await bot.log_text(f"Error during {action} in {fed['name']}: {e}", type=f"C{action.upper()}_ERROR")
-            failed_feds.append(fed["name"])
-        
-        await asyncio.sleep(1)
+                cmd_msg = await call_with_flood_retry(bot.send_message, chat_id, job["command"], disable_preview=True)
+                await ban_jobs.set_target_state(job, chat_id, ban_jobs.SENT)
+                resp = await CORRELATOR.wait_for(
+                    cmd_msg.chat.id, timeout=FED_REPLY_TIMEOUT, reply_to=cmd_msg.id, sender=FED_BOT_IDS
+                )
+
+                if not resp:
+                    await ban_jobs.set_target_state(job, chat_id, ban_jobs.FAILED, error="No reply from the fed bot.")
+                    return
+                if resp.text and "Would you like to update" in resp.text:
+                    try:
+                        await resp.click("Update reason")
+                    except Exception:
+                        pass
+                await ban_jobs.set_target_state(job, chat_id, ban_jobs.CONFIRMED)
+
+            except Exception as e:
+                await ban_jobs.set_target_state(job, chat_id, ban_jobs.FAILED, error=str(e))
+                await bot.log_text(f"Error during {action} in {fed['name']}: {e}", type=f"C{action.upper()}_ERROR")
+
+    await asyncio.gather(*(perform_in_fed(chat_id, fed) for chat_id, fed in ban_jobs.targets_in(job, states)))
+    await ban_jobs.finish_job(job)
     
-    total_selected = len(selected_feds)
+    total_selected = len(job["targets"])
+    failed_feds = [fed["name"] for _, fed in ban_jobs.targets_in(job, (ban_jobs.FAILED,))]
     action_past_tense = "Fbanned" if action == "fban" else "Un-Fbanned"
     failed_str = ""
 
     if failed_feds:
         status_line = f"<b>Failed</b> in: {len(failed_feds)}/{total_selected} chosen feds."
-        failed_str = "\n• " + "\n• ".join(failed_feds)
+        failed_str = "\n• " + "\n• ".join(failed_feds) + f"\n<b>Job</b>: <code>{job['_id']}</code>"
     else:
         status_line = f"<b>Status:</b> {action_past_tense} in <b>{total_selected}</b> chosen fed(s)."
 
-    summary_text = (f"❯❯❯ <b>{action_past_tense}</b> {user_mention}\n"
-                    f"<b>ID:</b> {user_id}\n"
-                    f"<b>Reason:</b> {reason}\n"
-                    f"<b>Initiated in:</b> {message.chat.title or 'PM'}\n"
+    summary_text = (f"❯❯❯ <b>{action_past_tense}</b> {job['user_mention']}\n"
+                    f"<b>ID:</b> {job['user_id']}\n"
+                    f"<b>Reason:</b> {job['reason']}\n"
+                    f"<b>Initiated in:</b> {job['initiated_in']}\n"
                     f"{status_line}")
     log_text = summary_text
     if failed_str: log_text += failed_str
 
-    if not message.is_from_owner: log_text += f"\n\n<b>By</b>: {get_name(message.from_user)}"
+    if job.get("by"): log_text += f"\n\n<b>By</b>: {job['by']}"
         
     await bot.send_message(extra_config.FBAN_LOG_CHANNEL, log_text, disable_preview=True)
-    await progress.edit(summary_text, del_in=SMALL_TIMEOUT, disable_preview=True)
+    if progress:
+        await progress.edit(summary_text, del_in=SMALL_TIMEOUT, disable_preview=True)
+
+ban_jobs.register_runner(["fban", "unfban"], run_fed_job, confirms=True)
 
 @bot.add_cmd(cmd="cfban")
 async def choose_fed_ban(bot: BOT, message: Message):
@@ -1,16 +1,20 @@
+import time
 import asyncio
 
 from pyrogram.enums import ChatType
+from pyrogram.errors import UserNotParticipant
 from pyrogram.types import Chat, User
 from ub_core.utils.helpers import get_name
 
-from app import BOT, Config, CustomDB, Message, bot, extra_config
+from app import BOT, Config, Message, bot, extra_config
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.settings import FANOUT_CONCURRENCY, FANOUT_PROGRESS_INTERVAL
+from app.modules.utils.ratelimit import call_with_flood_retry
+from app.modules.utils import ban_jobs
+from app.modules.utils.dbcache import GBAN_CHATS
 
-GBAN_TASK_LOCK = asyncio.Lock()
-
-GBAN_DB = CustomDB["GBAN_CHAT_LIST"]
+GBAN_DB = GBAN_CHATS
 
 
 @bot.add_cmd(cmd="addg")
@@ -187,54 +191,149 @@ async def perform_gban_task(
     progress: Message,
     message: Message,
 ):
-    async with GBAN_TASK_LOCK:
-        await progress.edit("❯❯")
+    await progress.edit("❯❯")
+
+    gban_chats = await GBAN_DB.all()
+
+    if not gban_chats:
+        await progress.edit("You don't have any bot chats on the GBAN list! Use `.addg` to add one.")
+        return
+
+    job = await ban_jobs.create_job(
+        kind=task_type,
+        command=command,
+        user_id=user_id,
+        user_mention=user_mention,
+        reason=reason,
+        targets={int(gban_chat["_id"]): gban_chat["name"] for gban_chat in gban_chats},
+        initiated_in=message.chat.title or "PM",
+        by=None if message.is_from_owner else get_name(message.from_user),
+    )
+    await ban_jobs.run_job(job, progress)
 
-        total: int = 0
-        failed: list[str] = []
-        success_count: int = 0
 
-        async for gban_chat in GBAN_DB.find():
-            chat_id = int(gban_chat["_id"])
-            total += 1
+async def run_gban_job(job: dict, progress: Message | None = None, states: tuple[str, ...] = (ban_jobs.PENDING,)):
+    targets = ban_jobs.targets_in(job, states)
+    total: int = len(targets)
+    done: int = 0
+    failed_now: int = 0
+    last_edit: float = time.monotonic()
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
 
+    async def send_to_chat(chat_id: int, target: dict):
+        nonlocal done, failed_now, last_edit
+
+        async with semaphore:
             try:
-                await bot.send_message(chat_id=chat_id, text=command, disable_preview=True)
-                success_count += 1
+                await call_with_flood_retry(bot.send_message, chat_id=chat_id, text=job["command"], disable_preview=True)
+                # Gbans stop at SENT: the bots in these chats give no reply that could confirm them.
+                await ban_jobs.set_target_state(job, chat_id, ban_jobs.SENT)
             except Exception as e:
+                await ban_jobs.set_target_state(job, chat_id, ban_jobs.FAILED, error=str(e))
                 await bot.log_text(
-                    text=f"Error while sending gban command to bot chat: {gban_chat['name']} [{chat_id}]"
+                    text=f"Error while sending gban command to bot chat: {target['name']} [{chat_id}]"
                     f"\nError: {e}",
                     type="GBAN_ERROR",
                 )
-                failed.append(gban_chat["name"])
-                continue
+                failed_now += 1
 
-            await asyncio.sleep(1)
+        done += 1
+        now = time.monotonic()
+        if progress and now - last_edit >= FANOUT_PROGRESS_INTERVAL and done < total:
+            last_edit = now
+            try:
+                await progress.edit(f"❯❯ {job['kind']}: <b>{done}/{total}</b> chats done, <b>{failed_now}</b> failed.")
+            except Exception:
+                pass
+
+    await asyncio.gather(*(send_to_chat(chat_id, target) for chat_id, target in targets))
+    await ban_jobs.finish_job(job)
+
+    action_past_tense = job["kind"].replace("-", "") + "ned"
+    failed = [target["name"] for _, target in ban_jobs.targets_in(job, (ban_jobs.FAILED,))]
+    total_chats = len(job["targets"])
+
+    resp_str = (
+        f"❯❯❯ <b>{action_past_tense}</b> {job['user_mention']}"
+        f"\n<b>ID</b>: {job['user_id']}"
+        f"\n<b>Reason</b>: {job['reason']}"
+        f"\n<b>Initiated in</b>: {job['initiated_in']}"
+    )
 
-        if not total:
-            await progress.edit("You don't have any bot chats on the GBAN list! Use `.addg` to add one.")
-            return
+    if failed:
+        resp_str += f"\n<b>Failed</b> in: {len(failed)}/{total_chats}\n• " + "\n• ".join(failed)
+        resp_str += f"\n<b>Job</b>: <code>{job['_id']}</code> (<code>.gbanjobs -retry {job['_id']}</code>)"
+    else:
+        resp_str += f"\n<b>Status</b>: {action_past_tense} in <b>{total_chats}</b> bots."
 
-        action_past_tense = task_type.replace("-", "") + "ned"
+    if job.get("by"):
+        resp_str += f"\n\n<b>By</b>: {job['by']}"
 
-        resp_str = (
-            f"❯❯❯ <b>{action_past_tense}</b> {user_mention}"
-            f"\n<b>ID</b>: {user_id}"
-            f"\n<b>Reason</b>: {reason}"
-            f"\n<b>Initiated in</b>: {message.chat.title or 'PM'}"
-        )
+    await bot.send_message(
+        chat_id=extra_config.FBAN_LOG_CHANNEL, text=resp_str, disable_preview=True
+    )
 
-        if failed:
-            resp_str += f"\n<b>Failed</b> in: {len(failed)}/{total}\n• " + "\n• ".join(failed)
-        else:
-            resp_str += f"\n<b>Status</b>: {action_past_tense} in <b>{total}</b> bots."
+    if progress:
+        await progress.edit(text=resp_str, del_in=SMALL_TIMEOUT, block=True, disable_preview=True)
 
-        if not message.is_from_owner:
-            resp_str += f"\n\n<b>By</b>: {get_name(message.from_user)}"
 
-        await bot.send_message(
-            chat_id=extra_config.FBAN_LOG_CHANNEL, text=resp_str, disable_preview=True
-        )
+ban_jobs.register_runner(["Gban", "Un-Gban"], run_gban_job)
 
-        await progress.edit(text=resp_str, del_in=SMALL_TIMEOUT, block=True, disable_preview=True)
+
+@bot.add_cmd(cmd="gbanjobs")
+async def gban_jobs_handler(bot: BOT, message: Message):
+    """
+    CMD: GBANJOBS
+    INFO: Shows recorded gban/fban fan-outs and the state of every target chat.
+    FLAGS:
+        -retry to resend a job to its pending and failed chats.
+        -del to delete a job record.
+    USAGE:
+        .gbanjobs | .gbanjobs [job id] | .gbanjobs -retry [job id] | .gbanjobs -del [job id]
+    """
+    job_id = next((word for word in (message.input or "").split() if not word.startswith("-")), "")
+
+    if not job_id:
+        jobs = sorted(ban_jobs.JOBS.values(), key=lambda job: job["created"], reverse=True)[:15]
+        if not jobs:
+            await message.reply("No ban jobs recorded.", del_in=MEDIUM_TIMEOUT)
+            return
+        lines = ["<b>Recent ban jobs:</b>\n"]
+        for job in jobs:
+            counts = ban_jobs.count_states(job)
+            confirmed = f"confirmed {counts['confirmed']} | " if ban_jobs.confirms(job) else ""
+            lines.append(
+                f"• <code>{job['_id']}</code> <b>{job['kind']}</b> {job['user_id']} [{job['status']}]\n"
+                f"  sent {counts['sent']} | {confirmed}"
+                f"pending {counts['pending']} | failed {counts['failed']}"
+            )
+        await message.reply("\n".join(lines), del_in=LARGE_TIMEOUT, block=True)
+        return
+
+    job = ban_jobs.get_job(job_id)
+    if not job:
+        await message.reply(f"No job with id <code>{job_id}</code>.", del_in=MEDIUM_TIMEOUT)
+        return
+
+    if ban_jobs.is_active(job_id) and ("-del" in message.flags or "-retry" in message.flags):
+        await message.reply(f"Job <code>{job_id}</code> is still running.", del_in=MEDIUM_TIMEOUT)
+        return
+
+    if "-del" in message.flags:
+        await ban_jobs.delete_job(job_id)
+        await message.reply(f"Job <code>{job_id}</code> deleted.", del_in=SMALL_TIMEOUT)
+        return
+
+    if "-retry" in message.flags:
+        progress: Message = await message.reply("❯❯")
+        await ban_jobs.run_job(job, progress, states=(ban_jobs.PENDING, ban_jobs.FAILED))
+        return
+
+    lines = [
+        f"<b>Job</b> <code>{job['_id']}</code>: <b>{job['kind']}</b> {job['user_mention']} [{job['status']}]",
+        f"<b>Reason</b>: {job['reason']}\n",
+    ]
+    for chat_id, target in job["targets"].items():
+        error = f" — <i>{target['error']}</i>" if target.get("error") else ""
+        lines.append(f"• {target['name']} (<code>{chat_id}</code>): <b>{target['state']}</b>{error}")
+    await message.reply("\n".join(lines), del_in=LARGE_TIMEOUT, block=True, disable_preview=True)
@@ -1,51 +1,16 @@
-import html
-from pyrogram.types import Message, User
+from pyrogram.types import Message
 
 from app import BOT, bot
 
-from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.remote_mod import remote_action_handler
 
 @bot.add_cmd(cmd="rkick")
 async def remote_kick_handler(bot: BOT, message: Message):
     """
     CMD: RKICK
-    INFO: Kick user remotely.
+    INFO: Kick users remotely. Users and chats can be comma separated lists; every chat gets one confirmation.
     USAGE:
-        .rkick [ID/username/reply] [ID/chatname/link] [reason]
+        .rkick [ID/username] [ID/chatname/link] [reason]
+        .rkick [user,user,...] [chat,chat,...] [reason]
     """
-    if not message.input or len(message.input.split()) < 2:
-        await message.reply("<b>Usage:</b> <code>.rkick [user] [chat] [reason]</code>", del_in=MEDIUM_TIMEOUT)
-        return
-
-    parts = message.input.split(maxsplit=2)
-    user_identifier = parts[0]
-    chat_identifier_raw = parts[1]
-    reason = parts[2] if len(parts) > 2 else "No reason provided."
-
-    if "t.me/" in chat_identifier_raw:
-        chat_identifier = chat_identifier_raw.split('/')[-1]
-    else:
-        chat_identifier = chat_identifier_raw
-
-    try:
-        target_user = await bot.get_users(user_identifier)
-        target_chat = await bot.get_chat(chat_identifier)
-    except Exception as e:
-        await message.reply(f"<b>Error:</b> Could not find user or chat.\n<code>{html.escape(str(e))}</code>", del_in=LONG_TIMEOUT)
-        return
-
-    if not isinstance(target_user, User):
-        await message.reply("<b>Error:</b> Invalid user specified.", del_in=LONG_TIMEOUT)
-        return
-
-    try:
-        await bot.ban_chat_member(chat_id=target_chat.id, user_id=target_user.id)
-        await bot.unban_chat_member(chat_id=target_chat.id, user_id=target_user.id)
-
-        confirmation_text = f"Kicked: {target_user.mention}\nReason: {reason}"
-
-        await bot.send_message(target_chat.id, confirmation_text)
-        await message.reply(f"Remote Kicked: {target_user.mention}\nChat: {html.escape(target_chat.title)}\nReason: {reason}")
-
-    except Exception as e:
-        await message.reply(f"<b>Error:</b> <code>{html.escape(str(e))}</code>", del_in=LONG_TIMEOUT)
+    await remote_action_handler(bot, message)
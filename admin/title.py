@@ -4,6 +4,8 @@ from pyrogram.enums import ChatType, ChatMemberStatus
 
 from app import BOT, bot
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.member_cache import MEMBER_CACHE
+from app.modules.utils.peer_cache import PEER_CACHE
 
 async def get_target_user(bot: BOT, message: Message) -> User | None:
     if message.replied:
@@ -11,7 +13,7 @@ async def get_target_user(bot: BOT, message: Message) -> User | None:
     if message.input:
         try:
             identifier = message.input.split(" ", 1)[0]
-            return await bot.get_users(identifier)
+            return await PEER_CACHE.get_user(identifier)
         except Exception:
             return None
     return None
@@ -29,7 +31,7 @@ async def set_admin_title_handler(bot: BOT, message: Message):
         await message.reply("This command can only be used in groups.", del_in=MEDIUM_TIMEOUT)
         return
 
-    me_member = await bot.get_chat_member(message.chat.id, bot.me.id)
+    me_member = await MEMBER_CACHE.get_own(message.chat.id)
     if not me_member.privileges or not me_member.privileges.can_promote_members:
         await message.reply("I need to be an admin with 'Promote Members' rights to do this.", del_in=MEDIUM_TIMEOUT)
         return
@@ -39,7 +41,7 @@ async def set_admin_title_handler(bot: BOT, message: Message):
         await message.reply("You need to specify a user (reply, ID, or username).", del_in=MEDIUM_TIMEOUT)
         return
         
-    target_member = await bot.get_chat_member(message.chat.id, target_user.id)
+    target_member = await MEMBER_CACHE.get(message.chat.id, target_user.id)
 
     if target_member.status not in [ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]:
         await message.reply("This user is not an administrator.", del_in=MEDIUM_TIMEOUT)
@@ -60,6 +62,7 @@ async def set_admin_title_handler(bot: BOT, message: Message):
             user_id=target_user.id,
             title=new_title
         )
+        MEMBER_CACHE.invalidate(message.chat.id, target_user.id)
         
         if new_title:
             response = f"Successfully set title for {target_user.mention} to '<code>{html.escape(new_title)}</code>'."
@@ -69,4 +72,6 @@ async def set_admin_title_handler(bot: BOT, message: Message):
         await message.reply(response)
 
     except Exception as e:
+        # Our cached rights may be out of date; check them again next time.
+        MEMBER_CACHE.invalidate(message.chat.id, bot.me.id)
         await message.reply(f"<b>Error:</b> Could not set title. <code>{e}</code>", del_in=LONG_TIMEOUT)
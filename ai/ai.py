@@ -1,21 +1,16 @@
-import os
 import html
-import asyncio
-import requests
+import httpx
 from pyrogram.types import Message, ReplyParameters
-from dotenv import load_dotenv
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils import http
+from app.modules.utils.env import ENV
 
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-MODULES_DIR = os.path.dirname(SCRIPT_DIR)
-ENV_PATH = os.path.join(MODULES_DIR, "extra_config.env")
-load_dotenv(dotenv_path=ENV_PATH)
-CF_ACCOUNT_ID = os.getenv("CF_ACCOUNT_ID")
-CF_API_TOKEN = os.getenv("CF_API_TOKEN")
-MODEL = os.getenv("TEXT_AI")
+CF_ACCOUNT_ID = ENV.CF_ACCOUNT_ID
+CF_API_TOKEN = ENV.CF_API_TOKEN
+MODEL = ENV.TEXT_AI
 
 @bot.add_cmd(cmd="ask")
 async def ask_handler(bot: BOT, message: Message):
@@ -54,7 +49,7 @@ async def ask_handler(bot: BOT, message: Message):
             "max_tokens": 2048 
         }
         
-        response = await asyncio.to_thread(requests.post, api_url, headers=headers, json=payload, timeout=300)
+        response = await http.post(api_url, headers=headers, json=payload, timeout=300)
         response.raise_for_status()
         response_data = response.json()
         
@@ -82,7 +77,7 @@ async def ask_handler(bot: BOT, message: Message):
         else:
             await progress_message.edit(f"API Error: {response_data.get('errors') or 'Unknown error'}", del_in=LONG_TIMEOUT)
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
          await progress_message.edit("<b>Error:</b> The request to the AI timed out.", del_in=LONG_TIMEOUT)
     except Exception as e:
         await progress_message.edit(f"<b>Error:</b> Could not get a response.\n<code>{html.escape(str(e))}</code>", del_in=LONG_TIMEOUT)
@@ -1,36 +1,35 @@
 import os
 import html
 import uuid
-import asyncio
-import requests
 from pyrogram.types import Message, ReplyParameters
-from dotenv import load_dotenv
-from PIL import Image
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.cpu_pool import run_cpu
+from app.modules.utils import http
+from app.modules.utils.env import ENV
+from app.modules.utils.lazy import lazy_import, temp_dir
+
+Image = lazy_import("PIL.Image")
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 MODULES_DIR = os.path.dirname(SCRIPT_DIR)
-ENV_PATH = os.path.join(MODULES_DIR, "extra_config.env")
-load_dotenv(dotenv_path=ENV_PATH)
 
-CF_ACCOUNT_ID = os.getenv("CF_ACCOUNT_ID")
-CF_API_TOKEN = os.getenv("CF_API_TOKEN")
-MODEL = os.getenv("IMAGE_AI")
+CF_ACCOUNT_ID = ENV.CF_ACCOUNT_ID
+CF_API_TOKEN = ENV.CF_API_TOKEN
+MODEL = ENV.IMAGE_AI
 
 UBOT_DIR = os.path.dirname(os.path.dirname(MODULES_DIR)) 
 LOGO_PATH = os.path.join(UBOT_DIR, "assets", "light.png")
 
 TEMP_DIR = "temp_imagine/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
 def sync_add_watermark(image_path: str) -> str:
     """Opens an image from a file, adds a watermark, and saves it to a new file."""
     
     base, ext = os.path.splitext(os.path.basename(image_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_wm.png")
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_wm.png")
 
     main_image = Image.open(image_path).convert("RGBA")
     
@@ -84,16 +83,16 @@ async def imagine_handler(bot: BOT, message: Message):
         headers = {"Authorization": f"Bearer {CF_API_TOKEN}", "Content-Type": "application/json"}
         payload = {"prompt": prompt}
         
-        response = await asyncio.to_thread(requests.post, api_url, headers=headers, json=payload)
+        response = await http.post(api_url, headers=headers, json=payload, timeout=300)
 
-        if response.ok:
+        if response.is_success:
             unique_id = str(uuid.uuid4())
-            generated_path = os.path.join(TEMP_DIR, f"{unique_id}.png")
+            generated_path = os.path.join(temp_dir(TEMP_DIR), f"{unique_id}.png")
             with open(generated_path, "wb") as f:
                 f.write(response.content)
             temp_files.append(generated_path)
             
-            # watermarked_path = await asyncio.to_thread(sync_add_watermark, generated_path)
+            # watermarked_path = await run_cpu(sync_add_watermark, generated_path)
             # temp_files.append(watermarked_path)
             
             await bot.send_photo(
@@ -1,16 +1,17 @@
-import requests
-import asyncio
 import html
 from pyrogram.types import LinkPreviewOptions, Message
 
 from app import BOT, bot, Message
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.settings import GITHUB_RELEASES_CACHE_TTL
+from app.modules.utils import http
+from app.modules.utils.response_cache import RESPONSE_CACHE
 
-def sync_get_releases(owner: str, repo: str) -> list:
+async def get_releases(owner: str, repo: str) -> list:
     api_url = f"https://api.github.com/repos/{owner}/{repo}/releases"
     headers = {"Accept": "application/vnd.github.v3+json"}
-    response = requests.get(api_url, headers=headers)
+    response = await http.get(api_url, headers=headers)
     response.raise_for_status()
     return response.json()
 
@@ -22,7 +23,9 @@ async def get_android_versions(bot, message: Message, owner: str, repo: str, sho
     progress_message = await message.reply(f"<code>Checking for latest {display_name} releases...</code>")
     
     try:
-        releases_data = await asyncio.to_thread(sync_get_releases, owner, repo)
+        releases_data = await RESPONSE_CACHE.get_or_fetch(
+            "github_releases", (owner, repo), lambda: get_releases(owner, repo), ttl=GITHUB_RELEASES_CACHE_TTL
+        )
         
         if not releases_data:
             raise ValueError("No releases found for this repository.")
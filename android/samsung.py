@@ -1,17 +1,23 @@
-import httpx
 import html
 import xml.etree.ElementTree as ET
 from pyrogram.types import Message, LinkPreviewOptions
 
 from app import BOT, bot
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.settings import SAMSUNG_FW_CACHE_TTL
+from app.modules.utils import http
+from app.modules.utils.response_cache import RESPONSE_CACHE
 
 HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.63 Safari/537.36"}
-client = httpx.AsyncClient(headers=HEADERS, http2=True, follow_redirects=True)
 
 async def get_samsung_ota_data(model: str, csc: str):
+    return await RESPONSE_CACHE.get_or_fetch(
+        "samsung_fw", (model, csc), lambda: fetch_samsung_ota_data(model, csc), ttl=SAMSUNG_FW_CACHE_TTL
+    )
+
+async def fetch_samsung_ota_data(model: str, csc: str):
     url = f'https://fota-cloud-dn.ospserver.net/firmware/{csc}/{model}/version.xml'
-    response = await client.get(url, timeout=10)
+    response = await http.get(url, headers=HEADERS, timeout=10)
     if response.status_code != 200:
         return None
     
@@ -1,32 +1,9 @@
-import httpx
 import html
-import yaml
 from pyrogram.types import Message, LinkPreviewOptions
 
 from app import BOT, bot
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
-
-DEVICES_YAML_URL = "https://raw.githubusercontent.com/XiaomiFirmwareUpdater/miui-updates-tracker/master/data/devices.yml"
-FIRMWARE_YAML_URL = "https://raw.githubusercontent.com/XiaomiFirmwareUpdater/miui-updates-tracker/master/data/latest.yml"
-
-DEVICE_DATA = {}
-HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"}
-client = httpx.AsyncClient(headers=HEADERS, http2=True, follow_redirects=True)
-
-async def load_device_data():
-    global DEVICE_DATA
-    if DEVICE_DATA: return
-    try:
-        response = await client.get(DEVICES_YAML_URL)
-        response.raise_for_status()
-        raw_data = yaml.safe_load(response.text)
-        clean_data = {}
-        for codename, names in raw_data.items():
-            if names and isinstance(names, list):
-                clean_data[codename] = names[0]
-        DEVICE_DATA = clean_data
-    except Exception:
-        DEVICE_DATA = None
+from app.modules.android.xiaomi_db import XIAOMI_DB
 
 def safe_escape(text: str) -> str:
     return html.escape(str(text))
@@ -42,13 +19,12 @@ async def whatis_handler(bot: BOT, message: Message):
     if not message.input: await message.reply("Please provide a codename.", del_in=MEDIUM_TIMEOUT); return
     progress = await message.reply("<code>Searching device...</code>")
     
-    if not DEVICE_DATA: await load_device_data()
-    if DEVICE_DATA is None: await progress.edit("<b>Error:</b> Could not load device database.", del_in=LONG_TIMEOUT); return
+    if not await XIAOMI_DB.ensure_loaded(): await progress.edit("<b>Error:</b> Could not load device database.", del_in=LONG_TIMEOUT); return
     
     codename = message.input.lower()
+    marketing_name = XIAOMI_DB.name_of(codename)
     
-    if codename in DEVICE_DATA:
-        marketing_name = DEVICE_DATA[codename]
+    if marketing_name:
         res = f"<code>{safe_escape(codename)}</code> is <b>{safe_escape(marketing_name)}</b>"
         await progress.edit(res)
     else:
@@ -64,14 +40,16 @@ async def codename_handler(bot: BOT, message: Message):
     """
     if not message.input: await message.reply("Please provide a name.", del_in=MEDIUM_TIMEOUT); return
     progress = await message.reply("<code>Searching device...</code>")
-    if not DEVICE_DATA: await load_device_data()
-    if DEVICE_DATA is None: await progress.edit("<b>Error:</b> Could not load device database.", del_in=LONG_TIMEOUT); return
+    if not await XIAOMI_DB.ensure_loaded(): await progress.edit("<b>Error:</b> Could not load device database.", del_in=LONG_TIMEOUT); return
 
     term = message.input.lower()
-    matches = {codename: name for codename, name in DEVICE_DATA.items() if term in name.lower()}
+    matches = XIAOMI_DB.search(term)
+    header = f"<b>Found {len(matches)} matching devices:</b>"
+    if not matches:
+        matches = XIAOMI_DB.suggest(term)
+        header = f"<b>No exact match. Closest devices:</b>"
     
     if matches:
-        header = f"<b>Found {len(matches)} matching devices:</b>"
         
         formatted_lines = [f"<b>{safe_escape(name)}</b> is <code>{safe_escape(codename)}</code>" for codename, name in matches.items()]
         blockquote_content = "\n\n".join(sorted(formatted_lines))
@@ -109,9 +87,9 @@ async def miui_handler(bot: BOT, message: Message):
     try:
         target_codename = query
         
-        if not DEVICE_DATA: await load_device_data()
-        if DEVICE_DATA is not None and query not in DEVICE_DATA:
-            possible_devices = {codename: name for codename, name in DEVICE_DATA.items() if query in name.lower()}
+        db_loaded = await XIAOMI_DB.ensure_loaded()
+        if db_loaded and not XIAOMI_DB.name_of(query) and not XIAOMI_DB.firmware_for(query):
+            possible_devices = XIAOMI_DB.search(query)
             
             if len(possible_devices) == 1:
                 target_codename = list(possible_devices.keys())[0]
@@ -138,23 +116,11 @@ async def miui_handler(bot: BOT, message: Message):
                 await progress.edit(res, link_preview_options=LinkPreviewOptions(is_disabled=True))
                 return
         
-        if DEVICE_DATA is not None:
-            target_device_name = DEVICE_DATA.get(target_codename, query.capitalize())
-        else:
-            target_device_name = query.capitalize()
-        
-        response = await client.get(FIRMWARE_YAML_URL, timeout=15)
-        response.raise_for_status()
-        all_firmware = yaml.safe_load(response.text)
-        
-        matches = []
-        for fw in all_firmware:
-            codename_field = fw.get("codename")
-            if not codename_field: continue
-            if isinstance(codename_field, list):
-                if target_codename in [c.lower() for c in codename_field]: matches.append(fw)
-            elif isinstance(codename_field, str):
-                if target_codename == codename_field.lower(): matches.append(fw)
+        if not db_loaded:
+            await progress.edit("<b>Error:</b> Could not load firmware database.", del_in=LONG_TIMEOUT); return
+
+        target_device_name = XIAOMI_DB.name_of(target_codename) or query.capitalize()
+        matches = XIAOMI_DB.firmware_for(target_codename)
         
         if not matches:
             await progress.edit(f"<b>No firmware</b> found for <code>{query}</code>.", del_in=LONG_TIMEOUT); return
@@ -0,0 +1,241 @@
+import os
+import json
+import time
+import asyncio
+
+from app import bot
+from app.modules.settings import XIAOMI_DB_REFRESH, XIAOMI_DB_RETRY, XIAOMI_DB_SNAPSHOT
+from app.modules.utils import http
+from app.modules.utils.lazy import lazy_import
+
+yaml = lazy_import("yaml")
+
+DEVICES_YAML_URL = "https://raw.githubusercontent.com/XiaomiFirmwareUpdater/miui-updates-tracker/master/data/devices.yml"
+FIRMWARE_YAML_URL = "https://raw.githubusercontent.com/XiaomiFirmwareUpdater/miui-updates-tracker/master/data/latest.yml"
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"}
+FIRMWARE_FIELDS = ("link", "version", "branch", "android", "size")
+FUZZY_CUTOFF = 0.3  # minimum trigram similarity for a "did you mean" match
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _yaml_loader():
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _parse_devices(text: str) -> dict[str, str]:
+    raw = yaml.load(text, Loader=_yaml_loader()) or {}
+    return {str(codename).lower(): names[0] for codename, names in raw.items() if names and isinstance(names, list)}
+
+
+def _parse_firmware(text: str) -> dict[str, list[dict]]:
+    firmware: dict[str, list[dict]] = {}
+    for fw in yaml.load(text, Loader=_yaml_loader()) or []:
+        codenames = fw.get("codename")
+        if not codenames:
+            continue
+        entry = {field: fw.get(field) for field in FIRMWARE_FIELDS}
+        for codename in codenames if isinstance(codenames, list) else [codenames]:
+            firmware.setdefault(str(codename).lower(), []).append(entry)
+    return firmware
+
+
+class XiaomiIndex:
+    """
+    Parsed devices.yml/latest.yml with lookup indexes:
+    codename -> marketing name, codename -> firmware list, and trigram/token postings over marketing names.
+    Snapshotted to disk and refreshed in the background with conditional requests.
+    """
+
+    def __init__(self):
+        self.devices: dict[str, str] = {}
+        self.firmware: dict[str, list[dict]] = {}
+        self.validators: dict[str, dict] = {}
+        self.checked_at: float = 0
+        self._trigram_postings: dict[str, set[str]] = {}
+        self._token_postings: dict[str, set[str]] = {}
+        self._failed_at: float = 0
+        self._lock = asyncio.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.devices)
+
+    @staticmethod
+    def _build_postings(devices: dict[str, str]) -> tuple[dict, dict]:
+        trigram_postings: dict[str, set[str]] = {}
+        token_postings: dict[str, set[str]] = {}
+        for codename, name in devices.items():
+            lowered = name.lower()
+            for gram in _trigrams(lowered):
+                trigram_postings.setdefault(gram, set()).add(codename)
+            for token in lowered.split():
+                token_postings.setdefault(token, set()).add(codename)
+        return trigram_postings, token_postings
+
+    def _set_devices(self, devices: dict[str, str], postings: tuple[dict, dict]):
+        # Swapped in together on the event loop so lookups never see names and postings out of step.
+        self.devices = devices
+        self._trigram_postings, self._token_postings = postings
+
+    # --- lookups ---
+
+    def name_of(self, codename: str) -> str | None:
+        return self.devices.get(codename.lower())
+
+    def firmware_for(self, codename: str) -> list[dict]:
+        return self.firmware.get(codename.lower(), [])
+
+    def search(self, term: str) -> dict[str, str]:
+        """Devices whose marketing name contains `term`, found through the trigram postings."""
+        term = term.lower().strip()
+        if not term:
+            return {}
+        # Every trigram inside the term is also a trigram of any name containing it; terms under
+        # three characters have none and fall back to a plain scan.
+        grams = {term[i : i + 3] for i in range(len(term) - 2)}
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self._trigram_postings.get(g, ()))):
+            postings = self._trigram_postings.get(gram, set())
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return {}
+        pool = self.devices if candidates is None else {codename: self.devices[codename] for codename in candidates}
+        return {codename: name for codename, name in pool.items() if term in name.lower()}
+
+    def suggest(self, term: str, limit: int = 10) -> dict[str, str]:
+        """Closest marketing names by token overlap and trigram similarity, for misspelt queries."""
+        term = term.lower().strip()
+        query_grams = _trigrams(term)
+        scores: dict[str, int] = {}
+        for gram in query_grams:
+            for codename in self._trigram_postings.get(gram, ()):
+                scores[codename] = scores.get(codename, 0) + 1
+        for token in term.split():
+            for codename in self._token_postings.get(token, ()):
+                scores[codename] = scores.get(codename, 0) + 3
+
+        ranked = []
+        for codename, shared in scores.items():
+            name_grams = len(_trigrams(self.devices[codename].lower()))
+            similarity = shared / (len(query_grams) + name_grams - min(shared, name_grams))
+            if similarity >= FUZZY_CUTOFF:
+                ranked.append((similarity, codename))
+        ranked.sort(reverse=True)
+        return {codename: self.devices[codename] for _, codename in ranked[:limit]}
+
+    # --- loading ---
+
+    @classmethod
+    def _read_snapshot_sync(cls) -> tuple[dict, tuple[dict, dict]] | None:
+        try:
+            with open(XIAOMI_DB_SNAPSHOT) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return snapshot, cls._build_postings(snapshot.get("devices", {}))
+
+    async def load_snapshot(self) -> bool:
+        loaded = await asyncio.to_thread(self._read_snapshot_sync)
+        if not loaded or self.devices:
+            return bool(self.devices)
+        snapshot, postings = loaded
+        self._set_devices(snapshot.get("devices", {}), postings)
+        self.firmware = snapshot.get("firmware", {})
+        self.validators = snapshot.get("validators", {})
+        self.checked_at = snapshot.get("checked_at", 0)
+        return bool(self.devices)
+
+    def _save_snapshot_sync(self):
+        os.makedirs(os.path.dirname(XIAOMI_DB_SNAPSHOT) or ".", exist_ok=True)
+        snapshot = {
+            "devices": self.devices,
+            "firmware": self.firmware,
+            "validators": self.validators,
+            "checked_at": self.checked_at,
+        }
+        temp_path = f"{XIAOMI_DB_SNAPSHOT}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(temp_path, XIAOMI_DB_SNAPSHOT)
+
+    async def _fetch_if_changed(self, url: str) -> tuple[str, dict] | None:
+        """
+        Returns (new body, its validators), or None when the server reports it unchanged.
+        The validators are only stored by the caller once the body has been parsed and applied.
+        """
+        headers = dict(HEADERS)
+        validator = self.validators.get(url, {})
+        if self.devices and validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if self.devices and validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
+
+        response = await http.get(url, headers=headers, timeout=30)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        validator = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        return response.text, validator
+
+    async def refresh(self):
+        devices_result, firmware_result = await asyncio.gather(
+            self._fetch_if_changed(DEVICES_YAML_URL), self._fetch_if_changed(FIRMWARE_YAML_URL)
+        )
+
+        # A body that fails to parse leaves its old validators in place, so the next refresh downloads it again.
+        if devices_result is not None:
+            devices_text, validator = devices_result
+            devices = await asyncio.to_thread(_parse_devices, devices_text)
+            self._set_devices(devices, await asyncio.to_thread(self._build_postings, devices))
+            self.validators[DEVICES_YAML_URL] = validator
+        if firmware_result is not None:
+            firmware_text, validator = firmware_result
+            self.firmware = await asyncio.to_thread(_parse_firmware, firmware_text)
+            self.validators[FIRMWARE_YAML_URL] = validator
+        self.checked_at = time.time()
+        await asyncio.to_thread(self._save_snapshot_sync)
+
+    async def ensure_loaded(self) -> bool:
+        """Loads the index if it is empty, and starts a background refresh when it is due. False if no data is available."""
+        if self.devices:
+            if time.time() - self.checked_at > XIAOMI_DB_REFRESH and not self._lock.locked():
+                asyncio.create_task(self._refresh_in_background())
+            return True
+
+        async with self._lock:
+            if self.devices:
+                return True
+            # A failed download is retried after XIAOMI_DB_RETRY instead of hammering GitHub on every command.
+            if self._failed_at and time.monotonic() - self._failed_at < XIAOMI_DB_RETRY:
+                return False
+            try:
+                await self.refresh()
+                self._failed_at = 0
+            except Exception:
+                self._failed_at = time.monotonic()
+        return bool(self.devices)
+
+    async def _refresh_in_background(self):
+        async with self._lock:
+            if time.time() - self.checked_at <= XIAOMI_DB_REFRESH:
+                return
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep serving the current index; try again on the next lookup after the retry window.
+                self.checked_at = time.time() - XIAOMI_DB_REFRESH + XIAOMI_DB_RETRY
+                await bot.log_text(text=f"#XIAOMI\nFirmware index refresh failed: {e}", type="XIAOMI_ERROR")
+
+
+XIAOMI_DB = XiaomiIndex()
+
+
+async def init_task():
+    await XIAOMI_DB.load_snapshot()
@@ -1,10 +1,12 @@
 import html
-import pyfiglet
 from pyrogram.enums import ParseMode
 
 from app import BOT, Message, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.lazy import lazy_import
+
+pyfiglet = lazy_import("pyfiglet")
 
 @bot.add_cmd(cmd="ascii")
 async def ascii(bot: BOT, message: Message):
@@ -7,9 +7,9 @@ from pyrogram.types import Message, ReplyParameters
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_codeit/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
 LANGUAGES = {
     "python": ("Python", "py"), "py": ("Python", "py"),
@@ -111,7 +111,7 @@ def generate_code(language: str, text: str) -> str:
 
 def sync_save_code_to_file(code_string: str, file_ext: str) -> str:
     unique_id = str(uuid.uuid4())
-    output_path = os.path.join(TEMP_DIR, f"main_{unique_id}.{file_ext}")
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"main_{unique_id}.{file_ext}")
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(code_string)
     return output_path
@@ -1,12 +1,14 @@
 import io
 import contextlib
 import html
-from cowsay import cow
 from pyrogram.enums import ParseMode
 
 from app import BOT, Message, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.lazy import lazy_import
+
+cowsay_lib = lazy_import("cowsay")
 
 @bot.add_cmd(cmd="cowsay")
 async def cowsay(bot: BOT, message: Message):
@@ -23,7 +25,7 @@ async def cowsay(bot: BOT, message: Message):
 
     string_io = io.StringIO()
     with contextlib.redirect_stdout(string_io):
-        cow(text)
+        cowsay_lib.cow(text)
     
     cow_said = string_io.getvalue()
 
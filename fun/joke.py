@@ -1,11 +1,11 @@
 import html
-import requests
 import asyncio
 from pyrogram.types import Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils import http
 
 API_URL = "https://official-joke-api.appspot.com/random_joke"
 
@@ -13,9 +13,9 @@ def safe_escape(text: str) -> str:
     escaped_text = html.escape(str(text))
     return escaped_text.replace("&#x27;", "’")
 
-def sync_get_joke() -> dict:
-    """Synchronously fetches a random joke."""
-    response = requests.get(API_URL)
+async def get_joke() -> dict:
+    """Fetches a random joke."""
+    response = await http.get(API_URL)
     response.raise_for_status()
     return response.json()
 
@@ -29,7 +29,7 @@ async def joke_handler(bot: BOT, message: Message):
     progress_message = await message.reply("<code>Finding a good joke...</code>")
     
     try:
-        joke_data = await asyncio.to_thread(sync_get_joke)
+        joke_data = await get_joke()
         
         setup = joke_data.get("setup")
         punchline = joke_data.get("punchline")
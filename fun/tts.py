@@ -1,15 +1,16 @@
 import os
 import html
 import asyncio
-from gtts import gTTS
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.lazy import lazy_import, temp_dir
+
+gtts = lazy_import("gtts")
 
 TEMP_DIR = "temp_audio"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
 def safe_escape(text: str) -> str:
     escaped_text = html.escape(str(text))
@@ -19,8 +20,8 @@ def sync_gtts(text: str, lang: str) -> str:
     """
     Synchronous function to generate a speech file using gTTS.
     """
-    output_path = os.path.join(TEMP_DIR, f"{hash(text + lang)}.mp3")
-    tts = gTTS(text=text, lang=lang, slow=False)
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"{hash(text + lang)}.mp3")
+    tts = gtts.gTTS(text=text, lang=lang, slow=False)
     tts.save(output_path)
     return output_path
 
@@ -1,11 +1,12 @@
 import html
-import requests
-import asyncio
 from pyrogram.types import LinkPreviewOptions, Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.settings import URBAN_CACHE_TTL
+from app.modules.utils import http
+from app.modules.utils.response_cache import RESPONSE_CACHE
 
 API_URL = "http://api.urbandictionary.com/v0/define"
 
@@ -13,10 +14,10 @@ def safe_escape(text: str) -> str:
     escaped_text = html.escape(str(text))
     return escaped_text.replace("&#x27;", "’")
 
-def sync_urban_search(term: str) -> dict | None:
-    """Synchronously searches Urban Dictionary for a term."""
+async def urban_search(term: str) -> dict | None:
+    """Searches Urban Dictionary for a term."""
     params = {"term": term}
-    response = requests.get(API_URL, params=params)
+    response = await http.get(API_URL, params=params)
     response.raise_for_status()
     data = response.json()
     
@@ -41,7 +42,9 @@ async def urban_dictionary_handler(bot: BOT, message: Message):
     progress_message = await message.reply(f"<code>Searching Urban Dictionary for: {safe_escape(term_to_search)}...</code>")
 
     try:
-        result = await asyncio.to_thread(sync_urban_search, term_to_search)
+        result = await RESPONSE_CACHE.get_or_fetch(
+            "urban", term_to_search, lambda: urban_search(term_to_search), ttl=URBAN_CACHE_TTL
+        )
         
         if result:
             word = result.get("word", "N/A")
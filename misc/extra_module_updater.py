@@ -1,7 +1,5 @@
 import os
 import html
-import asyncio
-import requests
 from datetime import datetime
 from pyrogram.types import LinkPreviewOptions
 
@@ -9,6 +7,7 @@ from ub_core.utils import run_shell_cmd
 from app import BOT, Message
 
 from app.modules.settings import REPO_OWNER, REPO_NAME, TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils import http
 
 REPO_API_URL = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}"
 
@@ -16,8 +15,8 @@ APP_DIR = os.path.join(os.getcwd(), "app")
 MODULES_DIR = os.path.join(APP_DIR, "modules")
 UPDATE_FILE_PATH = os.path.join(MODULES_DIR, "update.json")
 
-def fetch_latest_commit_date_sync() -> str:
-    response = requests.get(REPO_API_URL, timeout=10)
+async def fetch_latest_commit_date() -> str:
+    response = await http.get(REPO_API_URL, timeout=10)
     response.raise_for_status()
     data = response.json()
     pushed_at = datetime.strptime(data['pushed_at'], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M UTC")
@@ -66,7 +65,7 @@ async def unified_update_handler(bot: BOT, message: Message):
 
     progress_msg = await message.reply("<code>Checking for updates...</code>")
     try:
-        remote_date = await asyncio.to_thread(fetch_latest_commit_date_sync)
+        remote_date = await fetch_latest_commit_date()
         local_date = get_local_version_date()
         
         if local_date == remote_date:
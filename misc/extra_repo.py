@@ -1,13 +1,12 @@
 import os
 import html
-import asyncio
-import requests
 from datetime import datetime
 from pyrogram.types import Message, LinkPreviewOptions, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import REPO_OWNER, REPO_NAME, TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils import http
 
 REPO_API_URL = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}"
 REPO_URL = f"https://github.com/{REPO_OWNER}/{REPO_NAME}"
@@ -19,8 +18,8 @@ MODULES_DIR = os.path.dirname(SCRIPT_DIR)
 BOT_ROOT = os.path.dirname(os.path.dirname(MODULES_DIR))
 BACKGROUND_IMAGE_PATH = os.path.join(BOT_ROOT, "assets", "dark.png")
 
-def fetch_repo_data_sync() -> dict:
-    response = requests.get(REPO_API_URL, timeout=10)
+async def fetch_repo_data() -> dict:
+    response = await http.get(REPO_API_URL, timeout=10)
     response.raise_for_status()
     data = response.json()
     
@@ -44,7 +43,7 @@ async def repo_handler(bot: BOT, message: Message):
     progress_msg = await message.reply("<code>Fetching repository information...</code>")
     
     try:
-        repo_data = await asyncio.to_thread(fetch_repo_data_sync)
+        repo_data = await fetch_repo_data()
         
         caption = (
             f"<a href='{REPO_URL}'><b>PlainUB-Extras</b></a>, additional modules and features designed for use with "
@@ -1,15 +1,17 @@
 import asyncio
 import html
-from googlesearch import search
 from pyrogram.types import LinkPreviewOptions, Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.lazy import lazy_import
+
+googlesearch = lazy_import("googlesearch")
 
 def sync_search(query: str):
     """Synchronous search function to be run in a separate thread."""
-    return list(search(query, num_results=5, sleep_interval=1))
+    return list(googlesearch.search(query, num_results=5, sleep_interval=1))
 
 @bot.add_cmd(cmd=["g", "google"])
 async def google_search_handler(bot: BOT, message: Message):
@@ -1,20 +1,19 @@
 import html
-import requests
-import asyncio
 from pyrogram.types import LinkPreviewOptions, Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils import http
 
 API_URL = "https://tinyurl.com/api-create.php"
 
-def sync_shorten(url: str) -> str:
+async def shorten(url: str) -> str:
     """
-    Synchronous shorten function using tinyurl.com's simple text API.
+    Shortens a URL using tinyurl.com's simple text API.
     """
     params = {"url": url}
-    response = requests.get(API_URL, params=params)
+    response = await http.get(API_URL, params=params)
     response.raise_for_status()
     return response.text
 
@@ -38,7 +37,7 @@ async def shortlink_handler(bot: BOT, message: Message):
     progress_message = await message.reply("<code>Shortening link...</code>")
     
     try:
-        shortened_url = await asyncio.to_thread(sync_shorten, url_to_shorten)
+        shortened_url = await shorten(url_to_shorten)
         
         if shortened_url and shortened_url.startswith("http"):
             final_text = (
@@ -1,11 +1,13 @@
 import html
 import asyncio
-from deep_translator import GoogleTranslator
 from pyrogram.types import LinkPreviewOptions, Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.lazy import lazy_import
+
+deep_translator = lazy_import("deep_translator")
 
 DEFAULT_TARGET_LANG = "en"
 
@@ -18,7 +20,7 @@ def sync_translate(text: str, target: str) -> tuple[str, str]:
     Synchronous function to perform translation with auto-detection.
     Returns a tuple of (translated_text, detected_source_language).
     """
-    translator = GoogleTranslator(source="auto", target=target)
+    translator = deep_translator.GoogleTranslator(source="auto", target=target)
     translated_text = translator.translate(text)
     detected_source = translator.get_supported_languages(as_dict=True).get(translator.source, translator.source)
     return translated_text, detected_source
@@ -1,14 +1,22 @@
 import html
-import asyncio
-import requests
 from pyrogram.types import Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.settings import WEATHER_CACHE_TTL
+from app.modules.utils import http
+from app.modules.utils.response_cache import RESPONSE_CACHE
 
 API_URL = "https://wttr.in/"
 
+async def fetch_weather(location: str) -> dict:
+    params = {"format": "j1"}
+    headers = {"User-Agent": "curl/7.81.0"}
+    response = await http.get(f"{API_URL}{location}", params=params, headers=headers, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
 @bot.add_cmd(cmd=["weather", "wttr"])
 async def weather_handler(bot: BOT, message: Message):
     """
@@ -25,15 +33,9 @@ async def weather_handler(bot: BOT, message: Message):
     progress_msg = await message.reply(f"<code>Fetching weather...</code>")
 
     try:
-        def do_request():
-            params = {"format": "j1"}
-            headers = {"User-Agent": "curl/7.81.0"}
-            return requests.get(f"{API_URL}{location}", params=params, headers=headers, timeout=10)
-
-        response = await asyncio.to_thread(do_request)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = await RESPONSE_CACHE.get_or_fetch(
+            "weather", location, lambda: fetch_weather(location), ttl=WEATHER_CACHE_TTL
+        )
 
         try:
             current = data['current_condition'][0]
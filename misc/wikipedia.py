@@ -1,23 +1,34 @@
 import html
-import wikipediaapi
 import asyncio
 from pyrogram.types import LinkPreviewOptions, Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.settings import WIKI_CACHE_TTL
+from app.modules.utils.response_cache import RESPONSE_CACHE
+from app.modules.utils.lazy import lazy_import
+
+wikipediaapi = lazy_import("wikipediaapi")
 
 WIKI_LANG = "en"
 USER_AGENT = "MyCoolUserBot/1.0 (https://github.com/telegram)"
-wiki_api = wikipediaapi.Wikipedia(language=WIKI_LANG, user_agent=USER_AGENT)
 
 def safe_escape(text: str) -> str:
     escaped_text = html.escape(str(text))
     return escaped_text.replace("&#x27;", "’")
 
+_wiki_api = None
+
+def get_wiki_api():
+    global _wiki_api
+    if _wiki_api is None:
+        _wiki_api = wikipediaapi.Wikipedia(language=WIKI_LANG, user_agent=USER_AGENT)
+    return _wiki_api
+
 def sync_wiki_search(query: str) -> tuple[str, str, str] | None:
     """Synchronous function to search the English Wikipedia."""
-    page = wiki_api.page(query)
+    page = get_wiki_api().page(query)
 
     if page.exists():
         summary = page.summary[:350]
@@ -42,7 +53,9 @@ async def wiki_handler(bot: BOT, message: Message):
     progress_message = await message.reply(f"<code>Searching Wikipedia for: {safe_escape(query)}...</code>")
 
     try:
-        result = await asyncio.to_thread(sync_wiki_search, query)
+        result = await RESPONSE_CACHE.get_or_fetch(
+            "wiki", query, lambda: asyncio.to_thread(sync_wiki_search, query), ttl=WIKI_CACHE_TTL
+        )
         
         if result:
             title, summary, url = result
@@ -17,3 +17,91 @@ FED_BOTS_TO_QUERY = [
     885745757,  # Sophie
     2059887769, # Odin
 ]
+FEDSTAT_REPLY_TIMEOUT = 20  # seconds to wait for a bot's final answer (its "checking..." notice does not count)
+FEDSTAT_CACHE_TTL = 10 * 60  # seconds a user's answer from one bot is reused; fed bots rate-limit /fbanstat
+FEDSTAT_BOT_INTERVAL = 2  # minimum seconds between two /fbanstat commands sent to the same bot
+FEDSTAT_BULK_LIMIT = 200  # users accepted by one .fstat -bulk run
+FEDSTAT_BULK_PROGRESS_INTERVAL = 5  # seconds between partial result edits during .fstat -bulk
+
+# --- FFMPEG JOB ENGINE ---
+FFMPEG_MAX_JOBS = 2  # encoders allowed to run at the same time
+FFMPEG_JOB_TIMEOUT = 900  # seconds before a running job is killed
+FFMPEG_STALL_TIMEOUT = 120  # seconds without progress output before a job is killed
+FFMPEG_PROGRESS_INTERVAL = 5  # seconds between progress message edits
+
+# --- MEDIA RESULT CACHE ---
+MEDIA_CACHE_MAX_ENTRIES = 500  # uploaded results remembered by file_unique_id
+
+# --- IMAGE PROCESS POOL ---
+CPU_POOL_WORKERS = 0  # worker processes for Pillow work, 0 = one per CPU core
+
+# --- ENCODER PROFILES ---
+# libx264 preset/CRF used when a command has to re-encode video; missing keys fall back to "default".
+ENCODE_PROFILES = {
+    "default": {"preset": "veryfast", "crf": 23, "audio_bitrate": "160k"},
+    "cut": {"crf": 20},
+    "speed": {"crf": 24},
+    "reverse": {"crf": 24},
+    "upscale": {"preset": "faster", "crf": 20},
+    "enhance": {"preset": "faster", "crf": 20},
+}
+KEYFRAME_SNAP_TOLERANCE = 0.5  # seconds a cut may move to reach a keyframe and skip re-encoding
+
+# --- MEDIA METADATA CACHE ---
+MEDIA_INFO_CACHE_SIZE = 256  # ffprobe results remembered by file_unique_id
+
+# --- CHECKFILE PARTIAL DOWNLOAD ---
+CHECKFILE_FULL_DOWNLOAD_LIMIT = 20 * 1024 * 1024  # files up to this size are simply downloaded whole
+CHECKFILE_HEAD_CHUNKS = 4  # 1 MB chunks read from the start for header-only analysis
+CHECKFILE_TAIL_CHUNKS = 2  # 1 MB chunks read from the end (moov atom, Matroska cues, ID3v1...)
+
+# --- BAN FAN-OUT RATE LIMIT ---
+FANOUT_RATE = 3.0  # messages per second sent to bot chats during a fan-out
+FANOUT_BURST = 5  # messages that may go out back to back before the rate applies
+FANOUT_CONCURRENCY = 10  # chats handled at the same time
+FANOUT_MAX_RETRIES = 3  # FloodWait retries per chat before it counts as failed
+FANOUT_PROGRESS_INTERVAL = 3  # seconds between progress message edits
+
+# --- REMOTE MODERATION ---
+REMOTE_MOD_MAX_LISTED = 50  # users named in one per-chat .rban/.rmute/.rkick confirmation, the rest are counted
+
+# --- PEER CACHE ---
+PEER_CACHE_TTL = 5 * 60  # seconds a resolved user/chat is reused by ID or username
+PEER_NEGATIVE_TTL = 10 * 60  # seconds a username or user ID Telegram reported as nonexistent is answered from cache
+PEER_CACHE_SIZE = 2000  # cached peers (each alias counts), least recently used dropped first
+
+# --- CHAT MEMBER CACHE ---
+MEMBER_CACHE_TTL = 60  # seconds a get_chat_member answer is reused (chat member updates replace it sooner)
+MEMBER_SELF_TTL = 30 * 60  # seconds our own admin rights per chat are served, refreshed in the background after MEMBER_CACHE_TTL
+MEMBER_CACHE_SIZE = 1000  # cached (chat, user) pairs, least recently used dropped first
+
+# --- DB LIST CACHE ---
+DB_CACHE_REFRESH = 300  # seconds before GBAN/FED lists are re-read from the DB (FED_LIST is also edited by core .addf/.delf)
+
+# --- SHARED HTTP CLIENT ---
+HTTP_TIMEOUT = 15  # default seconds per request; slow APIs (AI) pass their own
+HTTP_MAX_CONNECTIONS = 50  # open connections across all hosts
+HTTP_MAX_KEEPALIVE = 20  # idle connections kept for reuse
+HTTP_PER_HOST_LIMIT = 6  # requests in flight to one host at a time
+HTTP_RETRIES = 2  # extra attempts on connection errors and 429/5xx replies
+
+# --- RESPONSE CACHE ---
+RESPONSE_CACHE_SIZE = 512  # cached upstream answers across all sources, least recently used dropped first
+WEATHER_CACHE_TTL = 15 * 60  # wttr.in
+GITHUB_RELEASES_CACHE_TTL = 10 * 60  # .magisk / .ksu / .ksun
+URBAN_CACHE_TTL = 6 * 3600
+WIKI_CACHE_TTL = 6 * 3600
+SAMSUNG_FW_CACHE_TTL = 30 * 60  # .checkfw / .getfw
+# Frankfurter rates are cached until the next ECB publication (about 16:00 CET on working days).
+
+# --- XIAOMI FIRMWARE INDEX ---
+XIAOMI_DB_REFRESH = 6 * 3600  # seconds between background checks of the tracker YAMLs (conditional requests)
+XIAOMI_DB_RETRY = 5 * 60  # seconds before a failed download is attempted again
+XIAOMI_DB_SNAPSHOT = "cache_xiaomi/index.json"  # parsed index kept on disk for instant startup
+
+# --- HANDLER GROUPS ---
+# Pyrogram runs only the first matching handler of a group, so each passive watcher gets its own group,
+# kept apart from core's command handlers; lower groups see an update first.
+CORRELATOR_HANDLER_GROUP = 7  # bot replies matched to pending .fedstat/.fban requests
+NOTES_HANDLER_GROUP = 8  # #note shortcuts in own messages
+MEMBER_CACHE_HANDLER_GROUP = 9  # chat member updates refreshing MEMBER_CACHE
@@ -0,0 +1,115 @@
+import os
+import ast
+import sys
+import html
+import asyncio
+
+from app import BOT, Message, bot
+
+from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.lazy import LAZY_LOADS, LAZY_MODULES
+
+MODULES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Already imported by the core before any module loads, so they cost a module nothing.
+CORE_PACKAGES = {"app", "pyrogram", "ub_core", "dotenv"}
+
+
+def collect_imports() -> dict[str, tuple[set[str], set[str]]]:
+    """Maps each module file to (third-party packages imported at module level, packages passed to lazy_import)."""
+    stdlib = set(sys.stdlib_module_names)
+    found = {}
+    for folder, _, files in os.walk(MODULES_DIR):
+        if ".git" in folder:
+            continue
+        for file in files:
+            if not file.endswith(".py"):
+                continue
+            path = os.path.join(folder, file)
+            try:
+                with open(path) as f:
+                    tree = ast.parse(f.read())
+            except (OSError, SyntaxError):
+                continue
+
+            eager, lazy = set(), set()
+            for node in tree.body:
+                if isinstance(node, ast.Import):
+                    eager.update(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    eager.add(node.module)
+            for node in ast.walk(tree):
+                if (
+                    isinstance(node, ast.Call) and getattr(node.func, "id", None) == "lazy_import"
+                    and node.args and isinstance(node.args[0], ast.Constant)
+                ):
+                    lazy.add(node.args[0].value)
+
+            eager = {name for name in eager if name.split(".")[0] not in stdlib | CORE_PACKAGES}
+            found[os.path.relpath(path, MODULES_DIR)] = (eager, lazy)
+    return found
+
+
+async def measure_import_times(packages: set[str]) -> dict[str, float]:
+    """
+    Cumulative import time of each package in a fresh interpreter, from python -X importtime.
+    A dependency shared by several packages is counted for the first one that pulls it in.
+    """
+    code = (
+        # __import__ rather than importlib, whose top-level import is missing from the -X importtime log.
+        f"for name in {sorted(packages)!r}:\n"
+        "    try: __import__(name)\n"
+        "    except Exception: pass\n"
+    )
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-X", "importtime", "-c", code,
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+
+    times = {}
+    for line in stderr.decode(errors="replace").splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        if name.strip() in packages and not name.startswith("  "):
+            times[name.strip()] = int(parts[1]) / 1_000_000
+    return times
+
+
+@bot.add_cmd(cmd=["importtime", "itime"])
+async def import_time_handler(bot: BOT, message: Message):
+    """
+    CMD: IMPORTTIME / ITIME
+    INFO: Reports the startup cost of each module: third-party libraries it imports at load time,
+          measured in a fresh interpreter, plus the lazily loaded libraries used so far.
+    USAGE:
+        .importtime
+    """
+    progress = await message.reply("<code>Measuring import times...</code>")
+
+    modules = await asyncio.to_thread(collect_imports)
+    all_eager = set().union(*(eager for eager, _ in modules.values())) if modules else set()
+    times = await measure_import_times(all_eager) if all_eager else {}
+
+    costs = sorted(
+        ((sum(times.get(name, 0) for name in eager), path, eager) for path, (eager, _) in modules.items() if eager),
+        reverse=True,
+    )
+
+    lines = ["<b>Module startup cost</b> <i>(eager third-party imports)</i>:\n"]
+    for cost, path, eager in costs[:15]:
+        lines.append(f"• <code>{html.escape(path)}</code>: <b>{cost * 1000:.0f} ms</b> <i>({', '.join(sorted(eager))})</i>")
+    if not costs:
+        lines.append("<i>No module imports a third-party library at load time.</i>")
+    lines.append(f"\n<b>Total for all eager libraries:</b> {sum(times.values()) * 1000:.0f} ms")
+
+    lines.append("\n<b>Lazily loaded libraries:</b>")
+    for name, module in sorted(LAZY_MODULES.items()):
+        if module.loaded:
+            lines.append(f"• <code>{name}</code>: loaded on first use in {LAZY_LOADS.get(name, 0) * 1000:.0f} ms")
+        else:
+            lines.append(f"• <code>{name}</code>: not loaded yet")
+
+    await progress.edit("\n".join(lines), del_in=LARGE_TIMEOUT)
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+dbcache = pytest.importorskip("app.modules.utils.dbcache")
+
+
+class PoppingCollection:
+    """Behaves like CustomDB: add_data pops "_id" from the dict it is given."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find(self):
+        for doc in list(self.docs.values()):
+            yield doc
+
+    async def add_data(self, data: dict):
+        doc_id = data.pop("_id")
+        self.docs[doc_id] = {"_id": doc_id, **self.docs.get(doc_id, {}), **data}
+        return True
+
+
+def test_add_data_caches_entry():
+    async def run():
+        collection = dbcache.CachedCollection("TEST_COLLECTION")
+        collection.db = PoppingCollection()
+
+        data = {"_id": -100123, "name": "Test Chat"}
+        await collection.add_data(data)
+
+        assert data["_id"] == -100123
+        assert await collection.find_one(-100123) == {"_id": -100123, "name": "Test Chat"}
+        assert collection.db.docs[-100123]["name"] == "Test Chat"
+
+    asyncio.run(run())
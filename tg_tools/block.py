@@ -1,23 +1,12 @@
-import os
 import html
-from dotenv import load_dotenv
 from pyrogram.types import Message, User
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.env import ENV
 
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-APP_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
-BOT_ROOT = os.path.dirname(APP_DIR)
-
-CONFIG_ENV_PATH = os.path.join(BOT_ROOT, "config.env")
-
-if os.path.exists(CONFIG_ENV_PATH):
-    load_dotenv(dotenv_path=CONFIG_ENV_PATH)
-
-LOG_CHAT_STR = os.getenv("LOG_CHAT")
-LOG_CHAT = int(LOG_CHAT_STR) if LOG_CHAT_STR and LOG_CHAT_STR.strip() else None
+LOG_CHAT = ENV.LOG_CHAT
 
 @bot.add_cmd(cmd=["block", "unblock"])
 async def block_unblock_handler(bot: BOT, message: Message):
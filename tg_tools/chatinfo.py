@@ -7,6 +7,7 @@ from pyrogram.types import Chat, Message, LinkPreviewOptions, ReplyParameters
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.peer_cache import PEER_CACHE
 
 TEMP_CINFO_DIR = "temp_cinfo_photos/"
 
@@ -77,11 +78,9 @@ async def chat_info_handler(bot: BOT, message: Message):
 
     if not target_identifier:
         target_identifier = message.chat.id
-    elif "t.me/" in target_identifier:
-        target_identifier = target_identifier.split('/')[-1]
 
     try:
-        target_chat = await bot.get_chat(target_identifier)
+        target_chat = await PEER_CACHE.get_chat(target_identifier)
         if target_chat.type == ChatType.PRIVATE:
             return await progress_msg.edit("This command is for groups and channels. Use <code>.info</code> for users.", del_in=MEDIUM_TIMEOUT)
         
@@ -1,57 +1,136 @@
+import io
+import csv
+import time
 import asyncio
 import html
 import re
-from datetime import datetime, timezone
 
-from pyrogram import filters
-from pyrogram.errors import PeerIdInvalid, UserIsBlocked
+from pyrogram.errors import MessageTooLong, PeerIdInvalid, UserIsBlocked
 from pyrogram.types import LinkPreviewOptions, Message, User
 
+from ub_core.utils.helpers import get_name
+
 from app import BOT, bot
 
+from app.modules.settings import FEDSTAT_CACHE_TTL, FEDSTAT_REPLY_TIMEOUT, FEDSTAT_BOT_INTERVAL
+from app.modules.settings import FEDSTAT_BULK_LIMIT, FEDSTAT_BULK_PROGRESS_INTERVAL
 from app.modules.settings import FED_BOTS_TO_QUERY, TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.correlator import CORRELATOR
+from app.modules.utils.peer_cache import PEER_CACHE
+
+NOT_BANNED_PHRASES = ["no bans", "not banned", "hasn't been banned", "0 federation(s)!", "isn’t fbanned", "fbanned anywhere!", "You are fbanned"]
+# Matched against the lower-cased reply, exactly like the old `any(phrase in lower_text ...)` loop.
+NOT_BANNED_RE = re.compile("|".join(re.escape(phrase) for phrase in NOT_BANNED_PHRASES))
+
+# Bulk input: numeric IDs, @usernames and t.me/username links.
+BULK_TARGET_RE = re.compile(r"(?:@|t\.me/)(\w{4,32})|\b(\d{5,20})\b")
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+CLEAR = "not banned"
+BANNED = "banned"
+ERROR = "error"
 
 def safe_escape(text: str) -> str:
     escaped_text = html.escape(str(text))
     return escaped_text.replace("&#x27;", "’")
     
+def is_not_banned(text: str) -> bool:
+    return bool(NOT_BANNED_RE.search(text.lower()))
+
 def parse_text_response(response: Message) -> str:
     bot_name = response.from_user.first_name
     text = response.text
-    lower_text = text.lower()
-    not_banned_phrases = ["no bans", "not banned", "hasn't been banned", "0 federation(s)!", "isn’t fbanned", "fbanned anywhere!", "You are fbanned"]
-    if any(phrase in lower_text for phrase in not_banned_phrases):
+    if is_not_banned(text):
         return f"<b>• {bot_name}:</b> <i>Not Banned</i>"
     else:
         return f"<b>• {bot_name}:</b> <blockquote expandable>{safe_escape(text)}</blockquote>"
 
-async def find_latest_file_in_history(bot: BOT, chat_id: int, after_message_id: int, timeout: int = 15) -> Message | None:
-    start_time = datetime.now(timezone.utc)
-    while (datetime.now(timezone.utc) - start_time).total_seconds() < timeout:
-        try:
-            async for message in bot.get_chat_history(chat_id, limit=1):
-                if message.document and message.id > after_message_id:
-                    return message
-        except Exception:
-            pass
-        await asyncio.sleep(0.5)
-    return None
+async def wait_for_file(chat_id: int, after_message_id: int, timeout: int = 15) -> Message | None:
+    return await CORRELATOR.wait_for(
+        chat_id, timeout=timeout, sender=chat_id, after_id=after_message_id, predicate=lambda msg: bool(msg.document)
+    )
+
+
+class FedStatService:
+    """
+    Queries fed bots for /fbanstat. Each bot's User is fetched once per process and each bot answers
+    one query at a time, at most one every FEDSTAT_BOT_INTERVAL seconds (they rate-limit fed commands),
+    while different bots are queried in parallel. Successful answers are reused for FEDSTAT_CACHE_TTL seconds.
+    """
+
+    def __init__(self):
+        self.bot_users: dict[int, User] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._last_sent: dict[int, float] = {}
+        # (bot_id, user_id) -> (expires_at, result text, file message, status)
+        self._results: dict[tuple[int, int], tuple[float, str, Message | None, str]] = {}
 
+    async def get_bot_user(self, bot: BOT, bot_id: int) -> User:
+        if bot_id not in self.bot_users:
+            self.bot_users[bot_id] = await bot.get_users(bot_id)
+        return self.bot_users[bot_id]
 
-async def query_single_bot(bot: BOT, bot_id: int, user_to_check: User) -> tuple[str, Message | None]:
+    def bot_name(self, bot_id: int) -> str:
+        bot_user = self.bot_users.get(bot_id)
+        return bot_user.first_name if bot_user else str(bot_id)
+
+    def cached(self, bot_id: int, user_id: int) -> tuple[str, Message | None, str] | None:
+        entry = self._results.get((bot_id, user_id))
+        if entry and entry[0] > time.monotonic():
+            return entry[1:]
+        self._results.pop((bot_id, user_id), None)
+        return None
+
+    async def query(self, bot: BOT, bot_id: int, user_id: int, use_cache: bool = True) -> tuple[str, Message | None, str]:
+        """Returns (result text, file message, status) where status is CLEAR, BANNED or ERROR."""
+        if use_cache and (result := self.cached(bot_id, user_id)):
+            return result
+
+        lock = self._locks.setdefault(bot_id, asyncio.Lock())
+        async with lock:
+            # A query for the same user may have finished while this one waited for the bot.
+            if use_cache and (result := self.cached(bot_id, user_id)):
+                return result
+            wait = self._last_sent.get(bot_id, 0) + FEDSTAT_BOT_INTERVAL - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                text, file_message, status = await query_single_bot(bot, bot_id, user_id)
+            finally:
+                self._last_sent[bot_id] = time.monotonic()
+
+        if status != ERROR:
+            self._results[(bot_id, user_id)] = (time.monotonic() + FEDSTAT_CACHE_TTL, text, file_message, status)
+        return text, file_message, status
+
+    async def query_all(self, bot: BOT, user_id: int, use_cache: bool = True) -> list[tuple[str, Message | None, str]]:
+        return await asyncio.gather(*(self.query(bot, bot_id, user_id, use_cache) for bot_id in FED_BOTS_TO_QUERY))
+
+
+FEDSTAT = FedStatService()
+
+
+def is_final_answer(msg: Message) -> bool:
+    return not (msg.text and "checking" in msg.text.lower())
+
+
+async def query_single_bot(bot: BOT, bot_id: int, user_id: int) -> tuple[str, Message | None, str]:
+    """Returns (result text, file message, status). Only CLEAR and BANNED answers are worth caching."""
     try:
-        bot_info = await bot.get_users(bot_id)
+        bot_info = await FEDSTAT.get_bot_user(bot, bot_id)
     except PeerIdInvalid:
-        return f"<b>• ID <code>{bot_id}</code>:</b> <i>Could not contact bot. (Have you started chat with him before?)</i>", None
+        return f"<b>• ID <code>{bot_id}</code>:</b> <i>Could not contact bot. (Have you started chat with him before?)</i>", None, ERROR
     except Exception as e:
-        return f"<b>• ID <code>{bot_id}</code>:</b> <i>An unknown error occurred while getting bot info: {e}</i>", None
+        return f"<b>• ID <code>{bot_id}</code>:</b> <i>An unknown error occurred while getting bot info: {e}</i>", None, ERROR
     
     try:
-        sent_cmd = await bot.send_message(chat_id=bot_id, text=f"/fbanstat {user_to_check.id}")
-        response = await sent_cmd.get_response(filters=filters.user(bot_id), timeout=20)
-
-        if response.text and "checking" in response.text.lower():
-            response = await sent_cmd.get_response(filters=filters.user(bot_id), timeout=20)
+        sent_cmd = await bot.send_message(chat_id=bot_id, text=f"/fbanstat {user_id}")
+        # One deadline for the whole exchange; "checking..." notices are skipped rather than restarting the wait.
+        response = await CORRELATOR.wait_for(
+            bot_id, timeout=FEDSTAT_REPLY_TIMEOUT, sender=bot_id, after_id=sent_cmd.id, predicate=is_final_answer
+        )
+        if not response:
+            raise asyncio.TimeoutError
         
         if response.reply_markup and "Make the fedban file" in str(response.reply_markup):
             last_message_id = response.id
@@ -60,27 +139,27 @@ async def query_single_bot(bot: BOT, bot_id: int, user_to_check: User) -> tuple[
             except Exception:
                 pass
             
-            file_message = await find_latest_file_in_history(bot, bot_id, after_message_id=last_message_id)
+            file_message = await wait_for_file(bot_id, after_message_id=last_message_id)
 
             if file_message:
                 result_text = f"<b>• {bot_info.first_name}:</b> <i>The bot sent a file with the full ban list. Forwarding...</i>"
             else:
                 result_text = f"<b>• {bot_info.first_name}:</b> <blockquote expandable>You can only use fed commands once every 5 minutes.</blockquote>"
-            return result_text, file_message
+            return result_text, file_message, BANNED if file_message else ERROR
 
         elif response.text:
-            return parse_text_response(response), None
+            return parse_text_response(response), None, CLEAR if is_not_banned(response.text) else BANNED
         
         else:
-            return f"<b>• {bot_info.first_name}:</b> <i>Received an unsupported response type.</i>", None
+            return f"<b>• {bot_info.first_name}:</b> <i>Received an unsupported response type.</i>", None, ERROR
 
     except (UserIsBlocked, PeerIdInvalid):
-        return f"<b>• {bot_info.first_name}:</b> <i>The bot is blocked or unreachable.</i>", None
+        return f"<b>• {bot_info.first_name}:</b> <i>The bot is blocked or unreachable.</i>", None, ERROR
     except asyncio.TimeoutError:
-        return f"<b>• {bot_info.first_name}:</b> <i>No response (timeout).</i>", None
+        return f"<b>• {bot_info.first_name}:</b> <i>No response (timeout).</i>", None, ERROR
     except Exception as e:
         print(f"An unknown error occurred with bot {bot_info.first_name}: {e}")
-        return f"<b>• {bot_info.first_name}:</b> <i>An unknown error occurred.</i>", None
+        return f"<b>• {bot_info.first_name}:</b> <i>An unknown error occurred.</i>", None, ERROR
 
 
 @bot.add_cmd(cmd=["fstat", "fedstat"])
@@ -88,29 +167,36 @@ async def fed_stat_handler(bot: BOT, message: Message):
     """
     CMD: FSTAT / FEDSTAT
     INFO: Checks a user's federation ban status across multiple bots.
+    FLAGS:
+        -f to skip cached answers and ask every bot again.
+        -bulk to check every ID/@username in the replied message or .txt/.csv file and get a CSV report.
     USAGE:
         .fstat [user_id/@username/reply]
+        .fstat -bulk [reply to a list or file of IDs]
     """
     progress: Message = await message.reply("<code>Checking fedstat...</code>")
 
+    if "-bulk" in message.flags:
+        return await bulk_fed_stat(bot, message, progress)
+
     target_identifier = "me"
-    if message.input:
-        target_identifier = message.input
+    target_words = [word for word in (message.input or "").split() if not word.startswith("-")]
+    if target_words:
+        target_identifier = target_words[0]
     elif message.replied:
         target_identifier = message.replied.from_user.id
 
     try:
-        user_to_check: User = await bot.get_users(target_identifier)
+        user_to_check: User = await PEER_CACHE.get_user(target_identifier)
     except Exception as e:
         return await progress.edit(f"<b>Error:</b> Could not find the specified user.\n<code>{e}</code>", del_in=MEDIUM_TIMEOUT)
 
-    tasks = [query_single_bot(bot, bot_id, user_to_check) for bot_id in FED_BOTS_TO_QUERY]
-    all_results = await asyncio.gather(*tasks)
+    all_results = await FEDSTAT.query_all(bot, user_to_check.id, use_cache="-f" not in message.flags)
 
     result_texts = []
     files_to_forward = []
 
-    for text, file_message in all_results:
+    for text, file_message, _ in all_results:
         result_texts.append(text)
         if file_message:
             files_to_forward.append(file_message)
@@ -135,3 +221,114 @@ async def fed_stat_handler(bot: BOT, message: Message):
 
     for file in files_to_forward:
         await file.forward(message.chat.id)
+
+
+async def read_bulk_targets(message: Message) -> list[int | str]:
+    """IDs and usernames from the command input and the replied text, caption or document, in order, without duplicates."""
+    sources = [message.input or ""]
+    replied = message.replied
+    if replied:
+        sources.append(replied.text or replied.caption or "")
+        if replied.document:
+            file = await replied.download(in_memory=True)
+            sources.append(bytes(file.getbuffer()).decode("utf-8", errors="ignore"))
+
+    targets: dict[int | str, None] = {}
+    for source in sources:
+        for username, user_id in BULK_TARGET_RE.findall(source):
+            targets[int(user_id) if user_id else username.lower()] = None
+    return list(targets)
+
+
+async def resolve_bulk_targets(bot: BOT, targets: list[int | str]) -> tuple[dict[int, str], list[str]]:
+    """Maps every target to a user id with a display name. Usernames that do not resolve are returned separately."""
+    users, failed = await PEER_CACHE.get_users(targets)
+    names: dict[int, str] = {user.id: get_name(user) for user in users}
+    unresolved: list[str] = []
+
+    for target in failed:
+        # Fed bots can still be asked about IDs this account has never seen.
+        if target.lstrip("-").isdigit():
+            names[int(target)] = target
+        else:
+            unresolved.append(target)
+
+    return names, unresolved
+
+
+def plain_text(result_text: str) -> str:
+    return html.unescape(HTML_TAG_RE.sub("", result_text.split(":</b>", 1)[-1])).strip()
+
+
+async def bulk_fed_stat(bot: BOT, message: Message, progress: Message):
+    targets = await read_bulk_targets(message)
+    if not targets:
+        return await progress.edit(
+            "<b>Usage:</b> reply to a message or .txt/.csv file containing user IDs or @usernames.", del_in=MEDIUM_TIMEOUT
+        )
+    if len(targets) > FEDSTAT_BULK_LIMIT:
+        return await progress.edit(
+            f"<b>Too many users:</b> {len(targets)}. At most <b>{FEDSTAT_BULK_LIMIT}</b> per run.", del_in=MEDIUM_TIMEOUT
+        )
+
+    await progress.edit(f"<code>Resolving {len(targets)} users...</code>")
+    names, unresolved = await resolve_bulk_targets(bot, targets)
+    user_ids = list(names)
+    use_cache = "-f" not in message.flags
+
+    # user_id -> bot_id -> (result text, status)
+    results: dict[int, dict[int, tuple[str, str]]] = {user_id: {} for user_id in user_ids}
+    flagged: list[int] = []
+    done: int = 0
+    last_edit: float = time.monotonic()
+
+    async def report_progress():
+        nonlocal last_edit
+        now = time.monotonic()
+        if now - last_edit < FEDSTAT_BULK_PROGRESS_INTERVAL or done == len(user_ids):
+            return
+        last_edit = now
+        text = f"<code>Checking fedstat...</code>\n<b>{done}/{len(user_ids)}</b> users done, <b>{len(flagged)}</b> banned somewhere."
+        if flagged:
+            text += "\n" + "\n".join(f"• <code>{user_id}</code> {safe_escape(names[user_id])}" for user_id in flagged[-10:])
+        try:
+            await progress.edit(text)
+        except Exception:
+            pass
+
+    async def bot_queue(bot_id: int):
+        # One queue per bot: users are checked in order, the service paces and serializes the commands.
+        nonlocal done
+        for user_id in user_ids:
+            text, _, status = await FEDSTAT.query(bot, bot_id, user_id, use_cache)
+            results[user_id][bot_id] = (text, status)
+            if status == BANNED and user_id not in flagged:
+                flagged.append(user_id)
+            if len(results[user_id]) == len(FED_BOTS_TO_QUERY):
+                done += 1
+            await report_progress()
+
+    await asyncio.gather(*(bot_queue(bot_id) for bot_id in FED_BOTS_TO_QUERY))
+
+    report = io.StringIO()
+    writer = csv.writer(report)
+    writer.writerow(["user_id", "name", "bot", "status", "detail"])
+    for user_id in user_ids:
+        for bot_id in FED_BOTS_TO_QUERY:
+            text, status = results[user_id][bot_id]
+            writer.writerow([user_id, names[user_id], FEDSTAT.bot_name(bot_id), status, plain_text(text)])
+    for username in unresolved:
+        writer.writerow(["", f"@{username}", "", ERROR, "Could not resolve username."])
+
+    report_file = io.BytesIO(report.getvalue().encode("utf-8"))
+    report_file.name = f"fedstat_bulk_{len(user_ids)}.csv"
+
+    summary = (
+        f"<b>Bulk Fedstat:</b> checked <b>{len(user_ids)}</b> users across <b>{len(FED_BOTS_TO_QUERY)}</b> bots.\n"
+        f"<b>Banned somewhere:</b> {len(flagged)}"
+    )
+    if unresolved:
+        summary += f"\n<b>Unresolved:</b> {len(unresolved)}"
+
+    await message.reply_document(document=report_file, caption=summary)
+    await progress.delete()
@@ -8,6 +8,8 @@ from pyrogram.types import Message, User, LinkPreviewOptions, ReplyParameters
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.member_cache import MEMBER_CACHE
+from app.modules.utils.peer_cache import PEER_CACHE
 
 TEMP_INFO_DIR = "temp_info_photos/"
 
@@ -29,7 +31,7 @@ def get_user_status(user: User) -> str:
     return status_map.get(user.status, str(user.status))
 
 async def format_user_info(user: User, is_full: bool, message: Message) -> tuple[str, str | None]:
-    full_chat_info = await bot.get_chat(user.id)
+    full_chat_info = await PEER_CACHE.get_chat(user.id)
     
     if is_full:
         info_lines = ["<b>User Info:</b>"]
@@ -51,7 +53,7 @@ async def format_user_info(user: User, is_full: bool, message: Message) -> tuple
 
         if message.chat.type in [ChatType.GROUP, ChatType.SUPERGROUP]:
             try:
-                member = await bot.get_chat_member(message.chat.id, user.id)
+                member = await MEMBER_CACHE.get(message.chat.id, user.id)
                 if member:
                     info_lines.append("\n<b>Group Status:</b>")
                     group_details = []
@@ -81,7 +83,7 @@ async def format_user_info(user: User, is_full: bool, message: Message) -> tuple
         if user.username: info_lines.append(f"• <b>Username:</b> @{user.username}")
         try:
             if message.chat.type in [ChatType.GROUP, ChatType.SUPERGROUP]:
-                member = await bot.get_chat_member(message.chat.id, user.id)
+                member = await MEMBER_CACHE.get(message.chat.id, user.id)
                 status_map = {ChatMemberStatus.OWNER: "Owner", ChatMemberStatus.ADMINISTRATOR: "Admin", ChatMemberStatus.MEMBER: "Member", ChatMemberStatus.RESTRICTED: "Restricted", ChatMemberStatus.LEFT: "Not in chat", ChatMemberStatus.BANNED: "Banned"}
                 if member.status in status_map:
                     status_str = status_map.get(member.status)
@@ -107,7 +109,7 @@ async def info_handler(bot: BOT, message: Message):
         else:
             target_identifier = message.from_user.id
     try:
-        target_user = await bot.get_users(target_identifier)
+        target_user = await PEER_CACHE.get_user(target_identifier)
         final_text, photo_id = await format_user_info(target_user, is_full_mode, message)
         
         if photo_id:
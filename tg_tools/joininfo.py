@@ -5,6 +5,7 @@ from pyrogram.errors import UserNotParticipant
 
 from app import BOT, bot
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.member_cache import MEMBER_CACHE
 
 async def get_target_user(bot: BOT, message: Message) -> User | None:
     """Helper function to find the target user."""
@@ -36,7 +37,7 @@ async def join_date_handler(bot: BOT, message: Message):
         return
         
     try:
-        member = await bot.get_chat_member(message.chat.id, target_user.id)
+        member = await MEMBER_CACHE.get(message.chat.id, target_user.id)
         
         if member.joined_date:
             join_date_str = member.joined_date.strftime('%d %b %Y, %H:%M UTC')
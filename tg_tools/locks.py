@@ -4,6 +4,7 @@ from pyrogram.enums import ChatType
 
 from app import BOT, bot
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.member_cache import MEMBER_CACHE
 
 LOCK_TYPES = {
     "msg": ["can_send_messages"],
@@ -35,7 +36,7 @@ async def change_lock(bot: BOT, message: Message, lock: bool):
         await message.reply("This command can only be used in groups.", del_in=MEDIUM_TIMEOUT)
         return
 
-    member = await bot.get_chat_member(message.chat.id, bot.me.id)
+    member = await MEMBER_CACHE.get_own(message.chat.id)
     if not member.privileges or not member.privileges.can_restrict_members:
         await message.reply("I need admin rights to change chat permissions.", del_in=MEDIUM_TIMEOUT)
         return
@@ -93,6 +94,8 @@ async def change_lock(bot: BOT, message: Message, lock: bool):
             response += f"\n<b>Not found:</b> `{' '.join(not_found_perms)}`"
         await message.reply(response, del_in=MEDIUM_TIMEOUT)
     except Exception as e:
+        # Our cached rights may be out of date; check them again next time.
+        MEMBER_CACHE.invalidate(message.chat.id, bot.me.id)
         await message.reply(f"<b>Error:</b> Could not change permissions. <code>{e}</code>", del_in=LONG_TIMEOUT)
 
 
@@ -1,18 +1,122 @@
 import html
-from pyrogram.types import Message, ReplyParameters, LinkPreviewOptions
+import bisect
+import asyncio
+import difflib
+from pyrogram import filters
+from pyrogram.enums import ParseMode
+from pyrogram.types import (
+    InputMediaAudio,
+    InputMediaDocument,
+    InputMediaPhoto,
+    InputMediaVideo,
+    LinkPreviewOptions,
+    Message,
+    ReplyParameters,
+)
 
-from app import BOT, Config, CustomDB, Message, bot
+from app import BOT, CustomDB, Message, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.settings import NOTES_HANDLER_GROUP
+from app.modules.utils.env import ENV
 
 NOTES_DB = CustomDB["NOTES"]
-MEDIA_STORAGE_CHANNEL = getattr(Config, "LOG_CHAT", None)
-if MEDIA_STORAGE_CHANNEL:
-    MEDIA_STORAGE_CHANNEL = int(MEDIA_STORAGE_CHANNEL)
+MEDIA_STORAGE_CHANNEL = ENV.LOG_CHAT
+
+NOTES_PER_PAGE = 50
+MIGRATION_DELAY = 20  # seconds after startup before old media notes get their file_id recorded
+
+# Media kinds that send_cached_media can resend from a file_id.
+CACHEABLE_MEDIA = {"photo", "video", "audio", "document", "animation", "sticker", "voice", "video_note"}
+# Kinds that Telegram lets share one media group, and the InputMedia used for each.
+MEDIA_GROUPS = {
+    "photo": ("visual", InputMediaPhoto),
+    "video": ("visual", InputMediaVideo),
+    "document": ("document", InputMediaDocument),
+    "audio": ("audio", InputMediaAudio),
+}
 
 def safe_escape(text: str) -> str:
     return html.escape(str(text))
 
+
+class NotesIndex:
+    """In-memory copy of NOTES_DB. The DB stays the durable store; every read is served from here."""
+
+    def __init__(self):
+        self.notes: dict[str, dict] = {}
+        self.names: list[str] = []
+
+    async def load(self):
+        self.notes = {note["_id"]: note async for note in NOTES_DB.find()}
+        self.names = sorted(self.notes)
+
+    def get(self, name: str) -> dict | None:
+        return self.notes.get(name)
+
+    async def save(self, name: str, data: dict):
+        await NOTES_DB.add_data({"_id": name, **data})
+        if name not in self.notes:
+            bisect.insort(self.names, name)
+        self.notes[name] = {"_id": name, **data}
+
+    async def delete(self, name: str) -> bool:
+        deleted = await NOTES_DB.delete_data(id=name)
+        if name in self.notes:
+            del self.notes[name]
+            self.names.remove(name)
+            return True
+        return bool(deleted)
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self.names, prefix)
+        end = bisect.bisect_left(self.names, prefix + "\uffff")
+        return self.names[start:end]
+
+    def search(self, query: str) -> list[str]:
+        if query.endswith("*"):
+            return self.with_prefix(query.rstrip("*"))
+        found = [name for name in self.names if query in name]
+        close = difflib.get_close_matches(query, self.names, n=10, cutoff=0.6)
+        return found + [name for name in close if name not in found]
+
+
+NOTES = NotesIndex()
+
+
+def extract_media(message: Message | None) -> dict | None:
+    if not message or not message.media:
+        return None
+    kind = message.media.name.lower()
+    media = getattr(message, kind, None) if kind in CACHEABLE_MEDIA else None
+    if not media:
+        return None
+    return {"file_id": media.file_id, "type": kind, "caption": message.caption.html if message.caption else None}
+
+
+async def migrate_media_notes():
+    """Records file_id/type/caption for media notes saved before they were stored, reading the log channel copies in batches."""
+    await asyncio.sleep(MIGRATION_DELAY)
+    pending = [note for note in NOTES.notes.values() if isinstance(note["content"], int) and "media" not in note]
+    for start in range(0, len(pending), 200):
+        batch = pending[start : start + 200]
+        try:
+            stored = await bot.get_messages(MEDIA_STORAGE_CHANNEL, [note["content"] for note in batch])
+        except Exception as e:
+            await bot.log_text(text=f"#NOTES\nMedia note migration stopped: {e}", type="NOTES_ERROR")
+            return
+        for note, stored_message in zip(batch, stored):
+            if NOTES.get(note["_id"]) is not note:
+                continue  # re-saved or deleted while the batch was in flight
+            # media=None marks a checked note whose copy is text, an unsupported kind, or gone.
+            await NOTES.save(note["_id"], {"content": note["content"], "media": extract_media(stored_message)})
+
+
+async def init_task():
+    await NOTES.load()
+    if MEDIA_STORAGE_CHANNEL:
+        asyncio.create_task(migrate_media_notes())
+
 @bot.add_cmd(cmd=["addnote", "save"])
 async def save_note_handler(bot: BOT, message: Message):
     """
@@ -33,15 +137,21 @@ async def save_note_handler(bot: BOT, message: Message):
     note_name = args[0].lower()
 
     content = None
+    media = None
     if message.replied:
+        # The log channel copy stays as a fallback for when the file_id stops working.
         forwarded_message = await message.replied.forward(MEDIA_STORAGE_CHANNEL)
         content = forwarded_message.id
+        media = extract_media(message.replied)
     elif len(args) > 1:
         content = args[1]
     else:
         await message.reply("You need to provide content for the note or reply to a message.", del_in=MEDIUM_TIMEOUT); return
 
-    await NOTES_DB.add_data({"_id": note_name, "content": content})
+    data = {"content": content}
+    if isinstance(content, int):
+        data["media"] = media
+    await NOTES.save(note_name, data)
     await message.reply(f"Note `{note_name}` saved successfully.", del_in=MEDIUM_TIMEOUT)
 
 @bot.add_cmd(cmd=["delnote", "clear"])
@@ -57,7 +167,7 @@ async def delete_note_handler(bot: BOT, message: Message):
         await message.reply("You need to specify which note to delete.", del_in=MEDIUM_TIMEOUT); return
 
     note_name = note_name.lower()
-    deleted = await NOTES_DB.delete_data(id=note_name)
+    deleted = await NOTES.delete(note_name)
     if deleted:
         await message.reply(f"Note `{note_name}` has been deleted.", del_in=MEDIUM_TIMEOUT)
     else:
@@ -67,36 +177,41 @@ async def delete_note_handler(bot: BOT, message: Message):
 async def list_notes_handler(bot: BOT, message: Message):
     """
     CMD: NOTES
-    INFO: Lists all saved notes.
+    INFO: Lists saved notes, 50 per page. Accepts a search term: a trailing * matches by prefix, anything else matches by substring or similar spelling.
     USAGE:
-        .notes
+        .notes | .notes [page]
+        .notes [pre*] [page]
+        .notes [name]
     """
-    notes_list = []
-    async for note in NOTES_DB.find():
-        notes_list.append(f"• `{note['_id']}`")
-    
-    if not notes_list:
-        await message.reply("You have no saved notes."); return
-        
-    response_text = "<b>Your saved notes:</b>\n\n" + "\n".join(notes_list)
+    args = (message.input or "").lower().split()
+    page = 1
+    if args and args[-1].isdigit():
+        page = int(args.pop())
+    query = " ".join(args)
+
+    names = NOTES.search(query) if query else NOTES.names
+    if not names:
+        text = f"No notes match `{query}`." if query else "You have no saved notes."
+        await message.reply(text); return
+
+    pages = (len(names) + NOTES_PER_PAGE - 1) // NOTES_PER_PAGE
+    page = min(max(page, 1), pages)
+    shown = names[(page - 1) * NOTES_PER_PAGE : page * NOTES_PER_PAGE]
+
+    header = f"<b>Notes matching</b> <code>{safe_escape(query)}</code>" if query else "<b>Your saved notes</b>"
+    response_text = f"{header} ({len(names)}):\n\n" + "\n".join(f"• `{name}`" for name in shown)
+    if pages > 1:
+        next_hint = f"\n<i>Next: .notes {safe_escape(query) + ' ' if query else ''}{page + 1}</i>" if page < pages else ""
+        response_text += f"\n\n<b>Page {page}/{pages}</b>{next_hint}"
     await message.reply(response_text)
 
-@bot.add_cmd(cmd="get")
-async def get_note_by_command(bot: BOT, message: Message):
-    """
-    CMD: GET
-    INFO: Retrieves a saved note. Note names are case-insensitive.
-    USAGE:
-        .get [note_name]
-    """
-    note_name = message.input
-    if not note_name:
-        await message.reply("You need to specify which note to get.", del_in=MEDIUM_TIMEOUT); return
 
-    note_name = note_name.lower()
-    note = await NOTES_DB.find_one({"_id": note_name})
+async def send_note(message: Message, note_name: str):
+    note = NOTES.get(note_name)
     if not note:
-        await message.reply(f"Note `{note_name}` not found.", del_in=MEDIUM_TIMEOUT); return
+        suggestions = NOTES.search(note_name)[:5]
+        hint = ("\nDid you mean: " + ", ".join(f"`{name}`" for name in suggestions)) if suggestions else ""
+        await message.reply(f"Note `{note_name}` not found.{hint}", del_in=MEDIUM_TIMEOUT); return
 
     await message.delete()
     content = note["content"]
@@ -105,6 +220,20 @@ async def get_note_by_command(bot: BOT, message: Message):
     if message.reply_to_message:
         reply_params = ReplyParameters(message_id=message.reply_to_message.id)
 
+    media = note.get("media")
+    if media:
+        try:
+            await bot.send_cached_media(
+                chat_id=message.chat.id,
+                file_id=media["file_id"],
+                caption=media["caption"] or "",
+                parse_mode=ParseMode.HTML,
+                reply_parameters=reply_params
+            )
+            return
+        except Exception:
+            pass
+
     if isinstance(content, int):
         if not MEDIA_STORAGE_CHANNEL:
             await bot.send_message(message.chat.id, "<i>Error: `LOG_CHAT` is not configured, cannot retrieve media note.</i>", del_in=LONG_TIMEOUT); return
@@ -124,3 +253,84 @@ async def get_note_by_command(bot: BOT, message: Message):
             reply_parameters=reply_params,
             link_preview_options=LinkPreviewOptions(is_disabled=True)
         )
+
+
+@bot.add_cmd(cmd="get")
+async def get_note_by_command(bot: BOT, message: Message):
+    """
+    CMD: GET
+    INFO: Retrieves a saved note. Note names are case-insensitive. Sending just #note_name does the same.
+    USAGE:
+        .get [note_name] | #note_name
+    """
+    note_name = message.input
+    if not note_name:
+        await message.reply("You need to specify which note to get.", del_in=MEDIUM_TIMEOUT); return
+
+    await send_note(message, note_name.lower())
+
+
+@bot.on_message(filters.me & filters.text & filters.regex(r"^#[^\s#]+$"), group=NOTES_HANDLER_GROUP)
+async def get_note_by_hashtag(bot: BOT, message: Message):
+    note_name = message.text[1:].lower()
+    # Plain hashtags that are not notes are left alone.
+    if NOTES.get(note_name):
+        await send_note(message, note_name)
+
+
+@bot.add_cmd(cmd="getall")
+async def get_all_notes_handler(bot: BOT, message: Message):
+    """
+    CMD: GETALL
+    INFO: Sends every saved note, or the ones matching a search term. Photos/videos, documents and audio are sent as media groups.
+    USAGE:
+        .getall | .getall [pre*] | .getall [name]
+    """
+    query = (message.input or "").lower().strip()
+    names = NOTES.search(query) if query else NOTES.names
+    if not names:
+        await message.reply("No notes to send.", del_in=MEDIUM_TIMEOUT); return
+
+    await message.delete()
+    groups: dict[str, list] = {"visual": [], "document": [], "audio": []}
+    singles = []
+
+    for name in names:
+        note = NOTES.get(name)
+        media = note.get("media")
+        if media and media["type"] in MEDIA_GROUPS:
+            group, input_media = MEDIA_GROUPS[media["type"]]
+            groups[group].append(input_media(media["file_id"], caption=media["caption"] or "", parse_mode=ParseMode.HTML))
+        else:
+            singles.append(name)
+
+    for items in groups.values():
+        for start in range(0, len(items), 10):
+            chunk = items[start : start + 10]
+            try:
+                if len(chunk) == 1:
+                    await bot.send_cached_media(
+                        message.chat.id, chunk[0].media, caption=chunk[0].caption, parse_mode=ParseMode.HTML
+                    )
+                else:
+                    await bot.send_media_group(message.chat.id, chunk)
+            except Exception as e:
+                await bot.send_message(message.chat.id, f"<i>Error: Could not send a batch of media notes: {safe_escape(e)}</i>", del_in=LONG_TIMEOUT)
+
+    for name in singles:
+        note = NOTES.get(name)
+        media = note.get("media")
+        try:
+            if media:
+                await bot.send_cached_media(
+                    message.chat.id, media["file_id"], caption=media["caption"] or "", parse_mode=ParseMode.HTML
+                )
+            elif isinstance(note["content"], int):
+                if MEDIA_STORAGE_CHANNEL:
+                    await bot.copy_message(message.chat.id, MEDIA_STORAGE_CHANNEL, note["content"])
+            else:
+                await bot.send_message(
+                    message.chat.id, str(note["content"]), link_preview_options=LinkPreviewOptions(is_disabled=True)
+                )
+        except Exception:
+            await bot.send_message(message.chat.id, f"<i>Error: Note `{name}` could not be sent.</i>", del_in=LONG_TIMEOUT)
@@ -6,6 +6,7 @@ from pyrogram.errors import PeerIdInvalid, UserNotParticipant
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.member_cache import MEMBER_CACHE
 
 def safe_escape(text: str) -> str:
     if not isinstance(text, str):
@@ -39,7 +40,7 @@ async def check_permissions_handler(bot: BOT, message: Message):
         target_user = message.from_user
 
     try:
-        member = await bot.get_chat_member(message.chat.id, target_user.id)
+        member = await MEMBER_CACHE.get(message.chat.id, target_user.id)
     except UserNotParticipant:
         await message.reply(f"User {target_user.mention} is not a member of this chat.")
         return
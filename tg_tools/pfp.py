@@ -4,6 +4,7 @@ from pyrogram.types import Message, User, Chat, ReplyParameters
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.peer_cache import PEER_CACHE
 
 @bot.add_cmd(cmd="pfp")
 async def pfp_handler(bot: BOT, message: Message):
@@ -22,9 +23,9 @@ async def pfp_handler(bot: BOT, message: Message):
         if message.input:
             identifier = message.input.strip()
             try:
-                target_entity = await bot.get_users(identifier)
+                target_entity = await PEER_CACHE.get_user(identifier)
             except Exception:
-                target_entity = await bot.get_chat(identifier)
+                target_entity = await PEER_CACHE.get_chat(identifier)
 
         elif message.replied:
             if message.replied.from_user:
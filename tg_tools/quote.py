@@ -1,29 +1,16 @@
-import asyncio
 import html
-from datetime import datetime, timezone
 from asyncio import TimeoutError
-from pyrogram import filters
-from pyrogram.types import Message, User
+from pyrogram.types import Message
 
 from app import BOT, bot
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.correlator import CORRELATOR
 
 QUOTLY_BOT_ID = 1031952739
 QUOTLY_TIMEOUT = 20
 
-async def find_response_in_history(bot: BOT, chat_id: int, after_message_id: int, timeout: int) -> Message | None:
-    start_time = datetime.now(timezone.utc)
-    while (datetime.now(timezone.utc) - start_time).total_seconds() < timeout:
-        try:
-            async for last_message in bot.get_chat_history(chat_id, limit=1):
-                if last_message.id > after_message_id and (
-                    not last_message.from_user or not last_message.from_user.is_self
-                ):
-                    return last_message
-        except Exception:
-            pass
-        await asyncio.sleep(1)
-    return None
+async def wait_for_response(chat_id: int, after_message_id: int, timeout: int) -> Message | None:
+    return await CORRELATOR.wait_for(chat_id, timeout=timeout, sender=chat_id, after_id=after_message_id)
 
 
 @bot.add_cmd(cmd=["q", "quote"])
@@ -49,20 +36,18 @@ async def quote_sticker_handler(bot: BOT, message: Message):
     message_ids = list(range(start_id, start_id + count))
 
     try:
-        last_message_id = 0
-        async for last_msg in bot.get_chat_history(QUOTLY_BOT_ID, limit=1):
-            last_message_id = last_msg.id
-
-        await bot.forward_messages(
+        forwarded = await bot.forward_messages(
             chat_id=QUOTLY_BOT_ID,
             from_chat_id=message.chat.id,
             message_ids=message_ids
         )
+        if not isinstance(forwarded, list):
+            forwarded = [forwarded]
+        last_message_id = max((msg.id for msg in forwarded), default=0)
         
         await progress_message.edit("<code>Waiting for @QuotLyBot's response...</code>")
 
-        quotly_response = await find_response_in_history(
-            bot,
+        quotly_response = await wait_for_response(
             chat_id=QUOTLY_BOT_ID,
             after_message_id=last_message_id,
             timeout=QUOTLY_TIMEOUT
@@ -1,29 +1,16 @@
 import os
 import html
-import asyncio
-import shutil
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import PRIORITY_HIGH, run_command
+from app.modules.utils.encode import AUDIO_COPY_EXTENSIONS
+from app.modules.utils.metadata import get_media_info, get_file_unique_id
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_extract_audio/"
-os.makedirs(TEMP_DIR, exist_ok=True)
-
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(
-        command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    return (
-        stdout.decode('utf-8', 'replace').strip(),
-        stderr.decode('utf-8', 'replace').strip(),
-        process.returncode
-    )
-
 
 @bot.add_cmd(cmd=["getaudio", "geta"])
 async def extract_audio_handler(bot: BOT, message: Message):
@@ -50,19 +37,27 @@ async def extract_audio_handler(bot: BOT, message: Message):
     video_path = None
     audio_path = None
     try:
-        video_path = await bot.download_media(replied_msg, file_name=TEMP_DIR)
+        video_path = await bot.download_media(replied_msg, file_name=temp_dir(TEMP_DIR))
         
         await progress_msg.edit("<code>Extracting audio track...</code>")
         
         base, _ = os.path.splitext(os.path.basename(video_path))
-        audio_path = os.path.join(TEMP_DIR, f"{base}.mp3")
-        
-        command = f'ffmpeg -i "{video_path}" -vn -acodec copy -y "{audio_path}"'
-        _, stderr, returncode = await run_command(command)
+        info = await get_media_info(video_path, get_file_unique_id(replied_msg))
+        duration = info.duration
+        copy_ext = AUDIO_COPY_EXTENSIONS.get(info.audio_codec)
+
+        returncode = 1
+        if copy_ext:
+            audio_path = os.path.join(temp_dir(TEMP_DIR), f"{base}{copy_ext}")
+            command = f'ffmpeg -i "{video_path}" -vn -c:a copy -y "{audio_path}"'
+            _, stderr, returncode = await run_command(command, priority=PRIORITY_HIGH, progress=progress_msg, label="Extracting audio track...", duration=duration)
 
         if returncode != 0:
+            if audio_path and os.path.exists(audio_path):
+                os.remove(audio_path)
+            audio_path = os.path.join(temp_dir(TEMP_DIR), f"{base}.mp3")
             command = f'ffmpeg -i "{video_path}" -vn -c:a libmp3lame -q:a 2 -y "{audio_path}"'
-            _, stderr, returncode = await run_command(command)
+            _, stderr, returncode = await run_command(command, priority=PRIORITY_HIGH, progress=progress_msg, label="Extracting audio track...", duration=duration)
             if returncode != 0:
                 raise RuntimeError(f"FFmpeg failed to extract audio: {stderr}")
 
@@ -82,6 +77,6 @@ async def extract_audio_handler(bot: BOT, message: Message):
     except Exception as e:
         await progress_msg.edit(f"<b>Error:</b> <code>{html.escape(str(e))}</code>", del_in=LONG_TIMEOUT)
     finally:
-        if os.path.exists(TEMP_DIR):
-            shutil.rmtree(TEMP_DIR)
-        os.makedirs(TEMP_DIR, exist_ok=True)
+        for f in (video_path, audio_path):
+            if f and os.path.exists(f):
+                os.remove(f)
@@ -1,24 +1,23 @@
 import os
 import html
-import asyncio
 import math
-import json
+import mimetypes
 from datetime import datetime
-from PIL import Image
-from PIL.ExifTags import TAGS
 from pyrogram.types import Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.settings import CHECKFILE_FULL_DOWNLOAD_LIMIT, CHECKFILE_HEAD_CHUNKS, CHECKFILE_TAIL_CHUNKS
+from app.modules.utils.metadata import get_media_info
+from app.modules.utils.lazy import lazy_import, temp_dir
+
+Image = lazy_import("PIL.Image")
+ExifTags = lazy_import("PIL.ExifTags")
 
 TEMP_DIR = "temp_checkfile/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-    stdout, stderr = await process.communicate()
-    return (stdout.decode('utf-8', 'replace').strip(), stderr.decode('utf-8', 'replace').strip(), process.returncode)
+STREAM_CHUNK_SIZE = 1024 * 1024  # chunk size used by Pyrogram's stream_media
 
 def format_bytes(size_bytes: int) -> str:
     if size_bytes == 0: return "0 B"
@@ -26,13 +25,25 @@ def format_bytes(size_bytes: int) -> str:
     p = math.pow(1024, i); s = round(size_bytes / p, 2)
     return f"{s} {size_name[i]}"
 
-async def get_probe_data(file_path: str) -> dict | None:
-    try:
-        command = f'ffprobe -v quiet -print_format json -show_format -show_streams "{file_path}"'
-        stdout, _, code = await run_command(command)
-        if code == 0 and stdout: return json.loads(stdout)
-    except: pass
-    return None
+async def fetch_header_ranges(message: Message, file_size: int, file_path: str) -> int:
+    """
+    Streams only the first and last chunks of a file into a sparse file of the real size, so container
+    headers and trailing indexes sit at their true offsets. Returns the number of bytes fetched.
+    """
+    total_chunks = math.ceil(file_size / STREAM_CHUNK_SIZE)
+    head_chunks = min(CHECKFILE_HEAD_CHUNKS, total_chunks)
+    tail_start = max(head_chunks, total_chunks - CHECKFILE_TAIL_CHUNKS)
+    fetched = 0
+    with open(file_path, "wb") as f:
+        f.truncate(file_size)
+        for offset, limit in ((0, head_chunks), (tail_start, total_chunks - tail_start)):
+            if limit <= 0:
+                continue
+            f.seek(offset * STREAM_CHUNK_SIZE)
+            async for chunk in bot.stream_media(message, limit=limit, offset=offset):
+                f.write(chunk)
+                fetched += len(chunk)
+    return fetched
 
 def get_exif_data(file_path: str) -> dict:
     try:
@@ -41,7 +52,7 @@ def get_exif_data(file_path: str) -> dict:
             if not exif: return {}
             exif_data = {}
             for tag_id, value in exif.items():
-                tag = TAGS.get(tag_id, tag_id)
+                tag = ExifTags.TAGS.get(tag_id, tag_id)
                 if isinstance(value, bytes):
                     try: value = value.decode('utf-8', 'ignore')
                     except: value = str(value)
@@ -56,14 +67,40 @@ async def checkfile_handler(bot: BOT, message: Message):
         await message.reply("Please reply to any media file to check it.", del_in=MEDIUM_TIMEOUT)
         return
 
-    progress_message = await message.reply("<code>Downloading for deep analysis...</code>")
+    media_object = (replied_msg.photo or replied_msg.video or replied_msg.animation or replied_msg.document or replied_msg.audio or replied_msg.voice or replied_msg.sticker)
+    file_size = getattr(media_object, 'file_size', 0) or 0
+    try_header_only = file_size > CHECKFILE_FULL_DOWNLOAD_LIMIT and not replied_msg.photo
+
+    progress_message = await message.reply(
+        "<code>Reading file headers...</code>" if try_header_only else "<code>Downloading for deep analysis...</code>"
+    )
     
     original_path = ""
     temp_files = []
     try:
-        media_object = (replied_msg.photo or replied_msg.video or replied_msg.animation or replied_msg.document or replied_msg.audio or replied_msg.voice or replied_msg.sticker)
-        original_path = await bot.download_media(media_object, file_name=os.path.join(TEMP_DIR, ""))
-        temp_files.append(original_path)
+        media_info, header_only, fetched = None, False, 0
+        if try_header_only:
+            ext = os.path.splitext(getattr(media_object, 'file_name', None) or "")[1] or mimetypes.guess_extension(getattr(media_object, 'mime_type', None) or "") or ""
+            partial_path = os.path.join(temp_dir(TEMP_DIR), f"{media_object.file_unique_id}{ext}")
+            temp_files.append(partial_path)
+            try:
+                fetched = await fetch_header_ranges(replied_msg, file_size, partial_path)
+                media_info = await get_media_info(partial_path)
+            except Exception:
+                media_info = None
+            # Headers that don't parse (moov/index in the middle, unknown layout) need the whole file.
+            # The header-only report stays local: its duration/streams may be estimates, so it never
+            # goes into the shared METADATA cache that the editing tools trust.
+            if media_info and (media_info.has_video or media_info.has_audio):
+                original_path, header_only = partial_path, True
+            else:
+                if os.path.exists(partial_path): os.remove(partial_path)
+                await progress_message.edit("<code>Headers inconclusive, downloading for deep analysis...</code>")
+
+        if not header_only:
+            original_path = await bot.download_media(media_object, file_name=os.path.join(temp_dir(TEMP_DIR), ""))
+            temp_files.append(original_path)
+            media_info = await get_media_info(original_path, media_object.file_unique_id)
         
         await progress_message.edit("<code>Analyzing...</code>")
         
@@ -81,8 +118,10 @@ async def checkfile_handler(bot: BOT, message: Message):
         info_lines.append(f"<b>  - Extension:</b> <code>{extension}</code>")
         info_lines.append(f"<b>  - MIME Type:</b> <code>{getattr(media_object, 'mime_type', 'N/A')}</code>")
         info_lines.append(f"<b>  - Size:</b> <code>{format_bytes(getattr(media_object, 'file_size', 0))}</code>")
+        if header_only:
+            info_lines.append(f"<b>  - Analysis:</b> <code>Header only ({format_bytes(fetched)} read)</code>")
         
-        probe_data = await get_probe_data(original_path)
+        probe_data = media_info.raw
         if probe_data:
             info_lines.append("\n<b>Technical Details:</b>")
             
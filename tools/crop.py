@@ -1,44 +1,27 @@
 import os
 import html
-import asyncio
 import re
-from PIL import Image
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import run_command
+from app.modules.utils.encode import encode_args
+from app.modules.utils.metadata import get_media_info
+from app.modules.utils.cpu_pool import image_ops, run_cpu
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_crop/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-    stdout, stderr = await process.communicate()
-    return (stdout.decode('utf-8', 'replace').strip(), stderr.decode('utf-8', 'replace').strip(), process.returncode)
 
-def sync_crop_image(input_path: str, width: int, height: int) -> str:
+async def sync_crop_video(input_path: str, width: int, height: int, progress: Message | None = None, file_unique_id: str | None = None) -> str:
     base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_cropped{ext}")
-    with Image.open(input_path) as img:
-        orig_width, orig_height = img.size
-        if width > orig_width or height > orig_height:
-            raise ValueError(f"Crop dimensions ({width}x{height}) cannot be larger than the original image.")
-        left = (orig_width - width) / 2
-        top = (orig_height - height) / 2
-        right = left + width
-        bottom = top + height
-        cropped_img = img.crop((left, top, right, bottom))
-        if cropped_img.mode in ("RGBA", "P"): cropped_img = cropped_img.convert("RGB")
-        cropped_img.save(output_path)
-    return output_path
-
-async def sync_crop_video(input_path: str, width: int, height: int) -> str:
-    base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_cropped{ext}")
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_cropped{ext}")
     crop_filter = f"crop={width}:{height}:(in_w-{width})/2:(in_h-{height})/2"
-    command = f'ffmpeg -i "{input_path}" -vf "{crop_filter}" -c:a copy -y "{output_path}"'
-    _, stderr, code = await run_command(command)
+    info = await get_media_info(input_path, file_unique_id)
+    command = f'ffmpeg -i "{input_path}" -vf "{crop_filter}" {encode_args("crop", info, ext, video_filtered=True)} -y "{output_path}"'
+    _, stderr, code = await run_command(command, progress=progress, label=f"Cropping to {width}x{height}...", duration=info.duration)
     if code != 0: raise RuntimeError(f"FFmpeg crop failed: {stderr}")
     return output_path
 
@@ -83,9 +66,11 @@ async def crop_handler(bot: BOT, message: Message):
         is_image = replied_msg.photo or (replied_msg.document and replied_msg.document.mime_type.startswith('image/'))
         
         if is_image:
-            modified_path = await asyncio.to_thread(sync_crop_image, original_path, crop_width, crop_height)
+            base, ext = os.path.splitext(os.path.basename(original_path))
+            output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_cropped{ext}")
+            modified_path = await run_cpu(image_ops.crop_image, original_path, output_path, crop_width, crop_height)
         else:
-            modified_path = await sync_crop_video(original_path, crop_width, crop_height)
+            modified_path = await sync_crop_video(original_path, crop_width, crop_height, progress=progress_message, file_unique_id=media_object.file_unique_id)
 
         temp_files.append(modified_path)
         
@@ -1,79 +1,122 @@
 import html
-import asyncio
-import requests
+import array
+import datetime
 from pyrogram.types import Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils import http
+from app.modules.utils.response_cache import RESPONSE_CACHE
 
 API_URL = "https://api.frankfurter.app/latest"
+BASE_CURRENCY = "EUR"
+ECB_REFRESH_UTC = datetime.time(15, 0)  # ECB publishes around 16:00 CET; Frankfurter follows shortly after
+STALE_RATES_FOR = 3600  # serve yesterday's table while the new one is fetched
+
+def seconds_until_rate_refresh() -> float:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    refresh = datetime.datetime.combine(now.date(), ECB_REFRESH_UTC, tzinfo=datetime.timezone.utc)
+    if now >= refresh:
+        refresh += datetime.timedelta(days=1)
+    return (refresh - now).total_seconds()
+
+
+class RateTable:
+    """One ECB publication: every currency's rate against EUR, packed in an array indexed by currency code."""
+
+    def __init__(self, date: str, rates: dict[str, float]):
+        self.date = date
+        self.index: dict[str, int] = {BASE_CURRENCY: 0}
+        self.rates = array.array("d", [1.0])
+        for code, rate in rates.items():
+            self.index[code] = len(self.rates)
+            self.rates.append(rate)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.index
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        return self.rates[self.index[to_currency]] / self.rates[self.index[from_currency]]
+
+
+async def fetch_rate_table() -> RateTable:
+    response = await http.get(API_URL, params={"from": BASE_CURRENCY}, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    return RateTable(data.get("date", ""), data["rates"])
+
+async def get_rate_table() -> RateTable:
+    return await RESPONSE_CACHE.get_or_fetch(
+        "currency", BASE_CURRENCY, fetch_rate_table, ttl=seconds_until_rate_refresh, stale_for=STALE_RATES_FOR
+    )
 
 @bot.add_cmd(cmd=["cash", "currency"])
 async def currency_converter_handler(bot: BOT, message: Message):
     """
     CMD: CASH / CURRENCY
-    INFO: Converts an amount from one currency to another using real-time rates.
+    INFO: Converts an amount from one currency to one or more others using the latest ECB rates.
     USAGE:
         .cash [amount] [FROM_CURRENCY] [TO_CURRENCY]
+        .cash [amount] [FROM_CURRENCY] [TO,TO,TO]
     EXAMPLE:
         .cash 100 PLN USD
         .cash 50 EUR JPY
+        .cash 100 PLN USD,EUR,GBP,JPY
     """
     
     if not message.input:
         await message.reply(
             "<b>Usage:</b> <code>.cash [amount] [FROM] [TO]</code>\n"
-            "<b>Example:</b> <code>.cash 100 PLN USD</code>",
+            "<b>Example:</b> <code>.cash 100 PLN USD</code> | <code>.cash 100 PLN USD,EUR,GBP</code>",
             del_in=10
         )
         return
 
     parts = message.input.split()
-    if len(parts) != 3:
-        await message.reply("<b>Invalid format.</b> Please use: `amount FROM TO`.", del_in=MEDIUM_TIMEOUT)
+    if len(parts) < 3:
+        await message.reply("<b>Invalid format.</b> Please use: `amount FROM TO` or `amount FROM TO,TO`.", del_in=MEDIUM_TIMEOUT)
         return
 
     try:
-        amount_str, from_currency, to_currency = parts
-        amount = float(amount_str)
-        from_currency = from_currency.upper()
-        to_currency = to_currency.upper()
+        amount = float(parts[0])
     except ValueError:
-        await message.reply("<b>Invalid amount.</b> Please provide a valid number.", del_in=MEDIUM_TIMOEUT)
+        await message.reply("<b>Invalid amount.</b> Please provide a valid number.", del_in=MEDIUM_TIMEOUT)
         return
 
-    progress_msg = await message.reply(
-        f"<code>Converting {amount:.2f} {from_currency} to {to_currency}...</code>"
-    )
+    from_currency = parts[1].upper()
+    to_currencies = [code.upper() for part in parts[2:] for code in part.split(",") if code]
 
     try:
-        def do_request():
-            params = {
-                "amount": amount,
-                "from": from_currency,
-                "to": to_currency
-            }
-            return requests.get(API_URL, params=params, timeout=10)
-
-        response = await asyncio.to_thread(do_request)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if 'rates' not in data or to_currency not in data['rates']:
-            raise ValueError(f"Could not get conversion rate for '{to_currency}'. It may be an invalid currency code.")
-        
-        converted_amount = data['rates'][to_currency]
-        single_rate = converted_amount / amount if amount != 0 else 0
-
-        result_text = (
-            f"<b>Conversion Result:</b>\n\n"
-            f"<code>{amount:.2f} {from_currency}</code> = <b><code>{converted_amount:.2f} {to_currency}</code></b>\n\n"
-            f"<i>Exchange rate: 1 {from_currency} ≈ {single_rate:.4f} {to_currency}</i>"
-        )
-        
-        await progress_msg.edit(result_text)
+        table = await get_rate_table()
+
+        invalid = [code for code in [from_currency, *to_currencies] if code not in table]
+        if invalid:
+            raise ValueError(f"Could not get conversion rate for '{', '.join(invalid)}'. It may be an invalid currency code.")
+
+        if len(to_currencies) == 1:
+            to_currency = to_currencies[0]
+            single_rate = table.rate(from_currency, to_currency)
+            converted_amount = amount * single_rate
+            result_text = (
+                f"<b>Conversion Result:</b>\n\n"
+                f"<code>{amount:.2f} {from_currency}</code> = <b><code>{converted_amount:.2f} {to_currency}</code></b>\n\n"
+                f"<i>Exchange rate: 1 {from_currency} ≈ {single_rate:.4f} {to_currency}</i>"
+            )
+        else:
+            lines = [f"<b>Conversion Result:</b>\n\n<code>{amount:.2f} {from_currency}</code> =\n"]
+            for to_currency in to_currencies:
+                single_rate = table.rate(from_currency, to_currency)
+                lines.append(
+                    f"• <b><code>{amount * single_rate:.2f} {to_currency}</code></b>"
+                    f"  <i>(1 {from_currency} ≈ {single_rate:.4f})</i>"
+                )
+            result_text = "\n".join(lines)
+
+        if table.date:
+            result_text += f"\n<i>ECB rates of {table.date}</i>"
+
+        await message.reply(result_text)
 
     except Exception as e:
-        await progress_msg.edit(f"<b>Error:</b> <code>{html.escape(str(e))}</code>", del_in=LONG_TIMEOUT)
+        await message.reply(f"<b>Error:</b> <code>{html.escape(str(e))}</code>", del_in=LONG_TIMEOUT)
@@ -1,28 +1,32 @@
 import os
 import html
-import asyncio
-import shutil
 from pyrogram.types import Message
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import PRIORITY_HIGH, run_command
+from app.modules.utils.encode import encode_args, snap_to_keyframe
+from app.modules.utils.metadata import get_media_info, get_file_unique_id
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_cut/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(
-        command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    return (
-        stdout.decode('utf-8', 'replace').strip(),
-        stderr.decode('utf-8', 'replace').strip(),
-        process.returncode
-    )
+def parse_timestamp(value: str) -> float | None:
+    """Converts [[hh:]mm:]ss[.ms] into seconds."""
+    try:
+        seconds = 0.0
+        for part in value.strip().split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+def cut_duration(start_time: str, end_time: str) -> float | None:
+    start, end = parse_timestamp(start_time), parse_timestamp(end_time)
+    if start is None or end is None or end <= start:
+        return None
+    return end - start
 
 
 @bot.add_cmd(cmd="cut")
@@ -57,26 +61,41 @@ async def cut_media_handler(bot: BOT, message: Message):
         return
         
     start_time, end_time = time_parts[0].strip(), time_parts[1].strip()
+    start, end = parse_timestamp(start_time), parse_timestamp(end_time)
+    if start is None or end is None or end <= start:
+        await message.reply("<b>Invalid time range.</b> The end must come after the start.", del_in=MEDIUM_TIMEOUT)
+        return
 
     progress_msg = await message.reply("<code>Downloading media...</code>")
     
     downloaded_path = None
     output_path = None
     try:
-        downloaded_path = await bot.download_media(replied_msg, file_name=TEMP_DIR)
+        downloaded_path = await bot.download_media(replied_msg, file_name=temp_dir(TEMP_DIR))
         
         await progress_msg.edit(f"<code>Trimming from {start_time} to {end_time}...</code>")
         
         base, ext = os.path.splitext(os.path.basename(downloaded_path))
-        output_path = os.path.join(TEMP_DIR, f"{base}_cut{ext}")
-        
-        command = (
-            f'ffmpeg -i "{downloaded_path}" '
-            f'-ss {start_time} -to {end_time} '
-            f'-c copy -y "{output_path}"'
-        )
+        output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_cut{ext}")
+
+        info = await get_media_info(downloaded_path, get_file_unique_id(replied_msg))
+        snapped_start = await snap_to_keyframe(downloaded_path, info, start)
+        if snapped_start is not None:
+            # Starting on a keyframe lets every stream be copied without decoding.
+            command = (
+                f'ffmpeg -ss {snapped_start} -i "{downloaded_path}" '
+                f'-t {end - snapped_start} '
+                f'-c copy -avoid_negative_ts make_zero -y "{output_path}"'
+            )
+        else:
+            command = (
+                f'ffmpeg -ss {start} -i "{downloaded_path}" '
+                f'-t {end - start} '
+                f'{encode_args("cut", info, ext, video_filtered=True)} -y "{output_path}"'
+            )
 
-        _, stderr, returncode = await run_command(command)
+        label = f"Trimming from {start_time} to {end_time}..."
+        _, stderr, returncode = await run_command(command, priority=PRIORITY_HIGH, progress=progress_msg, label=label, duration=cut_duration(start_time, end_time))
 
         if returncode != 0:
             raise RuntimeError(f"FFmpeg failed: {stderr}")
@@ -87,6 +106,8 @@ async def cut_media_handler(bot: BOT, message: Message):
         await progress_msg.edit("<code>Uploading file...</code>")
 
         caption = f"Trimmed from <code>{start_time}</code> to <code>{end_time}</code>."
+        if snapped_start is not None and abs(snapped_start - start) > 0.05:
+            caption += f"\n<i>Start moved to the keyframe at {snapped_start:.2f}s.</i>"
         
         is_video = replied_msg.video or (replied_msg.document and "video" in replied_msg.document.mime_type)
         if is_video:
@@ -109,6 +130,6 @@ async def cut_media_handler(bot: BOT, message: Message):
     except Exception as e:
         await progress_msg.edit(f"<b>Error:</b> <code>{html.escape(str(e))}</code>", del_in=LONG_TIMEOUT)
     finally:
-        if os.path.exists(TEMP_DIR):
-            shutil.rmtree(TEMP_DIR)
-        os.makedirs(TEMP_DIR, exist_ok=True)
+        for f in (downloaded_path, output_path):
+            if f and os.path.exists(f):
+                os.remove(f)
@@ -1,44 +1,28 @@
 import os
 import html
-import asyncio
-from PIL import Image, ImageEnhance, ImageFilter
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import PRIORITY_LOW, run_command
+from app.modules.utils.encode import encode_args
+from app.modules.utils.metadata import get_media_info
+from app.modules.utils.cpu_pool import image_ops, run_cpu
+from app.modules.utils.media_cache import MEDIA_CACHE
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_enhance/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-    stdout, stderr = await process.communicate()
-    return (stdout.decode('utf-8', 'replace').strip(), stderr.decode('utf-8', 'replace').strip(), process.returncode)
 
-def sync_enhance_image(input_path: str) -> tuple[str, int, int]:
+async def sync_enhance_video(input_path: str, progress: Message | None = None, file_unique_id: str | None = None) -> tuple[str, int, int]:
     base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_enhanced.png")
-    with Image.open(input_path) as img:
-        if img.mode not in ("RGB", "RGBA"): img = img.convert("RGBA")
-        orig_width, orig_height = img.size
-        new_width, new_height = orig_width * 2, orig_height * 2
-        upscaled_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        enhancer_sharp = ImageEnhance.Sharpness(upscaled_img)
-        sharpened_img = enhancer_sharp.enhance(2.0)
-        smoothed_img = sharpened_img.filter(ImageFilter.SMOOTH)
-        enhancer_contrast = ImageEnhance.Contrast(smoothed_img)
-        final_image = enhancer_contrast.enhance(1.2)
-        final_image.save(output_path, "PNG")
-    return output_path, new_width, new_height
-
-async def sync_enhance_video(input_path: str) -> tuple[str, int, int]:
-    base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_enhanced{ext}")
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_enhanced{ext}")
     
-    probe_command = f'ffprobe -v error -select_streams v:0 -show_entries stream=width,height -of csv=s=x:p=0 "{input_path}"'
-    stdout, _, _ = await run_command(probe_command)
-    orig_width, orig_height = map(int, stdout.split('x'))
+    info = await get_media_info(input_path, file_unique_id)
+    if not (info.width and info.height):
+        raise RuntimeError("Could not read the video resolution.")
+    orig_width, orig_height = info.width, info.height
     new_width, new_height = orig_width * 2, orig_height * 2
 
     filter_chain = (
@@ -47,8 +31,8 @@ async def sync_enhance_video(input_path: str) -> tuple[str, int, int]:
         f"hqdn3d"
     )
 
-    command = f'ffmpeg -i "{input_path}" -vf "{filter_chain}" -c:a copy -y "{output_path}"'
-    _, stderr, code = await run_command(command)
+    command = f'ffmpeg -i "{input_path}" -vf "{filter_chain}" {encode_args("enhance", info, ext, video_filtered=True)} -y "{output_path}"'
+    _, stderr, code = await run_command(command, priority=PRIORITY_LOW, progress=progress, label="Enhancing...", duration=info.duration)
     if code != 0: raise RuntimeError(f"FFmpeg enhance failed: {stderr}")
         
     return output_path, new_width, new_height
@@ -73,12 +57,17 @@ async def enhance_handler(bot: BOT, message: Message):
     if not is_media:
         return await message.reply("Please reply to an image or video to enhance it.", del_in=MEDIUM_TIMEOUT)
 
+    media_object = (replied_msg.photo or replied_msg.video or replied_msg.document)
+    reply_params = ReplyParameters(message_id=replied_msg.id)
+    cache_key = MEDIA_CACHE.make_key(media_object.file_unique_id, "enhance")
+    if await MEDIA_CACHE.send(cache_key, message.chat.id, reply_parameters=reply_params):
+        return
+
     progress_message = await message.reply("<code>Downloading media...</code>")
     
     original_path, modified_path = "", ""
     temp_files = []
     try:
-        media_object = (replied_msg.photo or replied_msg.video or replied_msg.document)
         original_path = await bot.download_media(media_object)
         temp_files.append(original_path)
         
@@ -87,19 +76,21 @@ async def enhance_handler(bot: BOT, message: Message):
         await progress_message.edit("<code>Enhancing...</code>")
         
         if is_image:
-            modified_path, new_width, new_height = await asyncio.to_thread(sync_enhance_image, original_path)
+            base, _ = os.path.splitext(os.path.basename(original_path))
+            output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_enhanced.png")
+            modified_path, new_width, new_height = await run_cpu(image_ops.enhance_image, original_path, output_path)
         else:
-            modified_path, new_width, new_height = await sync_enhance_video(original_path)
+            modified_path, new_width, new_height = await sync_enhance_video(original_path, progress=progress_message, file_unique_id=media_object.file_unique_id)
         
         temp_files.append(modified_path)
         
         await progress_message.edit("<code>Sending as file...</code>")
         
         caption = f"Enhanced to: `{new_width}x{new_height}`"
-        reply_params = ReplyParameters(message_id=replied_msg.id)
         
-        await bot.send_document(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+        sent = await bot.send_document(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         
+        await MEDIA_CACHE.store(cache_key, sent, caption)
         await progress_message.delete()
 
     except Exception as e:
@@ -6,16 +6,16 @@ from pyrogram.types import Message, ReplyParameters
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_filecreator/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
 def sync_create_file(filename: str, content: str) -> str:
     """Synchronously creates a file with the given content in the temp directory."""
     if ".." in filename or "/" in filename:
         raise ValueError("Invalid filename. It cannot contain '..' or '/'.")
         
-    output_path = os.path.join(TEMP_DIR, filename)
+    output_path = os.path.join(temp_dir(TEMP_DIR), filename)
     
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(content)
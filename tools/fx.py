@@ -0,0 +1,202 @@
+import os
+import html
+from pyrogram.types import Message, ReplyParameters
+
+from app import BOT, bot
+
+from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import run_command
+from app.modules.utils.encode import encode_args
+from app.modules.utils.metadata import get_media_info
+from app.modules.utils.media_cache import MEDIA_CACHE
+from app.modules.tools.cut import parse_timestamp
+from app.modules.tools.speed import build_atempo_filter
+from app.modules.tools.resizer import build_scale_filter
+from app.modules.utils.lazy import temp_dir
+
+TEMP_DIR = "temp_fx/"
+
+FX_STEPS = ("cut", "speed", "volume", "resize")
+
+
+def parse_pipeline(text: str) -> list[tuple[str, tuple]]:
+    """Parses 'cut 0:10-0:20 | speed 1.5 | volume 150 | resize 720x-1' into validated steps."""
+    steps = []
+    for raw_step in text.split("|"):
+        parts = raw_step.strip().split(maxsplit=1)
+        if len(parts) != 2:
+            raise ValueError(f"Step '{raw_step.strip()}' needs a value.")
+        name, value = parts[0].lower(), parts[1].strip()
+
+        if name == "cut":
+            start_str, _, end_str = value.partition("-")
+            start, end = parse_timestamp(start_str), parse_timestamp(end_str)
+            if start is None or end is None or end <= start:
+                raise ValueError(f"Invalid cut range '{value}'. Use start-end, e.g. 0:10-0:20.")
+            steps.append(("cut", (start, end)))
+        elif name == "speed":
+            factor = float(value)
+            if factor <= 0:
+                raise ValueError("Speed factor must be a positive number.")
+            steps.append(("speed", (factor,)))
+        elif name in ("volume", "vol"):
+            level = float(value)
+            if level < 0:
+                raise ValueError("Volume level cannot be negative.")
+            steps.append(("volume", (level,)))
+        elif name == "resize":
+            width_str, _, height_str = value.lower().partition("x")
+            width, height = int(width_str), int(height_str)
+            if width == -1 and height == -1 or not all(d == -1 or 0 < d <= 8192 for d in (width, height)):
+                raise ValueError("Resize dimensions must be between 1 and 8192, or -1 to keep the aspect ratio.")
+            steps.append(("resize", (width, height)))
+        else:
+            raise ValueError(f"Unknown step '{name}'. Available: {', '.join(FX_STEPS)}.")
+    return steps
+
+
+def compile_pipeline(
+    steps: list[tuple[str, tuple]], has_video: bool, has_audio: bool, duration: float | None
+) -> tuple[str, str, list[str], float | None]:
+    """
+    Folds all steps into one filter graph.
+    Returns (input options, filter_complex, output labels, expected output duration).
+    """
+    input_options = ""
+    video_filters, audio_filters = [], []
+
+    for index, (name, args) in enumerate(steps):
+        if name == "cut":
+            start, end = args
+            if duration:
+                end = min(end, duration)
+                if start >= end:
+                    raise ValueError(f"Cut starts at {start:g}s, but the media is only {duration:g}s long at that step.")
+            if index == 0:
+                input_options = f"-ss {start} -to {end} "
+            else:
+                video_filters.append(f"trim=start={start}:end={end},setpts=PTS-STARTPTS")
+                audio_filters.append(f"atrim=start={start}:end={end},asetpts=PTS-STARTPTS")
+            duration = end - start
+        elif name == "speed":
+            factor = args[0]
+            video_filters.append(f"setpts=PTS/{factor}")
+            audio_filters.append(build_atempo_filter(factor))
+            if duration:
+                duration /= factor
+        elif name == "volume":
+            audio_filters.append(f"volume={args[0] / 100}")
+        elif name == "resize":
+            if not has_video:
+                raise ValueError("Resize needs a video stream.")
+            width, height = (-2 if d == -1 else d for d in args)
+            video_filters.append(build_scale_filter(width, height))
+
+    graph, outputs = [], []
+    if has_video:
+        graph.append(f"[0:v]{','.join(video_filters) or 'null'}[v]")
+        outputs.append("[v]")
+    if has_audio:
+        graph.append(f"[0:a]{','.join(audio_filters) or 'anull'}[a]")
+        outputs.append("[a]")
+    if not outputs:
+        raise ValueError("The media has no audio or video stream.")
+    return input_options, ";".join(graph), outputs, duration
+
+
+def describe_pipeline(steps: list[tuple[str, tuple]]) -> str:
+    described = []
+    for name, args in steps:
+        if name == "cut":
+            described.append(f"cut {args[0]:g}s-{args[1]:g}s")
+        elif name == "resize":
+            described.append(f"resize {args[0]}x{args[1]}")
+        else:
+            described.append(f"{name} {args[0]:g}")
+    return " → ".join(described)
+
+
+@bot.add_cmd(cmd="fx")
+async def fx_handler(bot: BOT, message: Message):
+    """
+    CMD: FX
+    INFO: Applies several edits to the replied video/audio in a single encode.
+    STEPS: cut [start]-[end] | speed [factor] | volume [level] | resize [w]x[h] (-1 keeps aspect ratio)
+    USAGE:
+        .fx cut 0:10-0:20 | speed 1.5 | volume 150 | resize 720x-1
+    """
+    replied_msg = message.replied
+    is_media = replied_msg and (
+        replied_msg.video or replied_msg.animation or replied_msg.audio or replied_msg.voice or
+        (replied_msg.document and replied_msg.document.mime_type.startswith(("video/", "audio/")))
+    )
+    if not is_media:
+        return await message.reply("Please reply to a video or audio file.", del_in=MEDIUM_TIMEOUT)
+
+    if not message.input:
+        return await message.reply(
+            "<b>Usage:</b> <code>.fx cut 0:10-0:20 | speed 1.5 | volume 150 | resize 720x-1</code>", del_in=MEDIUM_TIMEOUT
+        )
+
+    try:
+        steps = parse_pipeline(message.input)
+    except ValueError as e:
+        return await message.reply(f"<b>Invalid pipeline:</b> {html.escape(str(e))}", del_in=MEDIUM_TIMEOUT)
+
+    description = describe_pipeline(steps)
+    media_object = (replied_msg.video or replied_msg.animation or replied_msg.audio or replied_msg.voice or replied_msg.document)
+    reply_params = ReplyParameters(message_id=replied_msg.id)
+    cache_key = MEDIA_CACHE.make_key(media_object.file_unique_id, "fx", pipeline=description)
+    if await MEDIA_CACHE.send(cache_key, message.chat.id, reply_parameters=reply_params):
+        return
+
+    progress_message = await message.reply("<code>Downloading media...</code>")
+
+    original_path, output_path = "", ""
+    try:
+        original_path = await bot.download_media(media_object, file_name=temp_dir(TEMP_DIR))
+
+        info = await get_media_info(original_path, media_object.file_unique_id)
+        has_video, has_audio = info.has_video, info.has_audio
+
+        input_options, filter_graph, outputs, out_duration = compile_pipeline(steps, has_video, has_audio, info.duration)
+
+        base, _ = os.path.splitext(os.path.basename(original_path))
+        output_ext = ".mp4" if has_video else ".ogg" if replied_msg.voice else ".mp3"
+        output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_fx{output_ext}")
+        codec_options = encode_args("fx", info, output_ext, video_filtered=True, audio_filtered=True)
+
+        maps = " ".join(f'-map "{label}"' for label in outputs)
+        command = (
+            f'ffmpeg {input_options}-i "{original_path}" '
+            f'-filter_complex "{filter_graph}" {maps} '
+            f'{codec_options} -y "{output_path}"'
+        )
+        _, stderr, code = await run_command(
+            command, progress=progress_message, label=f"Applying: {description}", duration=out_duration
+        )
+        if code != 0:
+            raise RuntimeError(f"FFmpeg failed: {stderr}")
+
+        await progress_message.edit("<code>Sending media...</code>")
+
+        caption = f"Applied: `{description}`"
+        if has_video and (replied_msg.animation or not has_audio):
+            sent = await bot.send_animation(message.chat.id, output_path, caption=caption, reply_parameters=reply_params)
+        elif has_video:
+            sent = await bot.send_video(message.chat.id, output_path, caption=caption, reply_parameters=reply_params)
+        elif replied_msg.voice:
+            sent = await bot.send_voice(message.chat.id, output_path, caption=caption, reply_parameters=reply_params)
+        else:
+            sent = await bot.send_audio(message.chat.id, output_path, caption=caption, reply_parameters=reply_params)
+
+        await MEDIA_CACHE.store(cache_key, sent, caption)
+        await progress_message.delete()
+
+    except Exception as e:
+        error_text = f"<b>Error:</b> Could not apply effects.\n<code>{html.escape(str(e))}</code>"
+        await progress_message.edit(error_text, del_in=LONG_TIMEOUT)
+    finally:
+        for f in (original_path, output_path):
+            if f and os.path.exists(f):
+                os.remove(f)
@@ -1,15 +1,16 @@
 import os
 import html
 import asyncio
-import qrcode
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.lazy import lazy_import, temp_dir
+
+qrcode = lazy_import("qrcode")
 
 TEMP_DIR = "temp_qrcode/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
 
 @bot.add_cmd(cmd=["mkqr", "makeqr"])
@@ -37,7 +38,7 @@ async def make_qr_handler(bot: BOT, message: Message):
 
     progress_msg = await message.reply("<code>Generating QR code...</code>")
     
-    output_path = os.path.join(TEMP_DIR, f"qrcode_{message.id}.png")
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"qrcode_{message.id}.png")
     
     try:
         def generate_qr_sync():
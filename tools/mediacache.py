@@ -0,0 +1,32 @@
+from pyrogram.types import Message
+
+from app import BOT, bot
+
+from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.media_cache import MEDIA_CACHE
+
+
+@bot.add_cmd(cmd=["mediacache", "mcache"])
+async def media_cache_handler(bot: BOT, message: Message):
+    """
+    CMD: MEDIACACHE / MCACHE
+    INFO: Shows statistics of the media result cache.
+    FLAGS: -clear to forget all cached results.
+    USAGE:
+        .mcache | .mcache -clear
+    """
+    if "-clear" in message.flags:
+        await MEDIA_CACHE.clear()
+        await message.reply("Media result cache cleared.", del_in=SMALL_TIMEOUT)
+        return
+
+    lookups = MEDIA_CACHE.hits + MEDIA_CACHE.misses
+    hit_rate = (MEDIA_CACHE.hits / lookups * 100) if lookups else 0
+    await message.reply(
+        "<b>Media Result Cache:</b>\n"
+        f"• <b>Entries:</b> <code>{len(MEDIA_CACHE)}/{MEDIA_CACHE.max_entries}</code>\n"
+        f"• <b>Hits:</b> <code>{MEDIA_CACHE.hits}</code>\n"
+        f"• <b>Misses:</b> <code>{MEDIA_CACHE.misses}</code>\n"
+        f"• <b>Hit Rate:</b> <code>{hit_rate:.1f}%</code>",
+        del_in=LARGE_TIMEOUT
+    )
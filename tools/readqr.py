@@ -1,16 +1,15 @@
 import os
 import html
-import asyncio
-from PIL import Image
-from pyzbar.pyzbar import decode
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.cpu_pool import image_ops, run_cpu
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_readqr/"
-os.makedirs(TEMP_DIR, exist_ok=True)
+
 
 
 @bot.add_cmd(cmd=["readqr", "rqr"])
@@ -34,23 +33,15 @@ async def read_qr_handler(bot: BOT, message: Message):
     
     downloaded_path = None
     try:
-        downloaded_path = await bot.download_media(replied_msg, file_name=TEMP_DIR)
-        
-        def decode_qr_sync():
-            img = Image.open(downloaded_path)
-            
-            if img.mode == 'RGBA':
-                img = img.convert('RGB')
-            
-            return decode(img)
+        downloaded_path = await bot.download_media(replied_msg, file_name=temp_dir(TEMP_DIR))
 
-        decoded_objects = await asyncio.to_thread(decode_qr_sync)
+        decoded_objects = await run_cpu(image_ops.decode_qr, downloaded_path)
         
         if not decoded_objects:
             await progress_msg.edit("<b>No QR code found in the media.</b>", del_in=MEDIUM_TIMEOUT)
             return
 
-        qr_data = decoded_objects[0].data.decode("utf-8")
+        qr_data = decoded_objects[0].decode("utf-8")
         
         output_text = (f"<b>QR Code Content:</b>\n"
                        f"<pre>{html.escape(qr_data)}</pre>")
@@ -1,54 +1,41 @@
 import os
 import html
-import asyncio
-from PIL import Image
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import run_command
+from app.modules.utils.encode import encode_args
+from app.modules.utils.metadata import get_media_info, get_file_unique_id
+from app.modules.utils.cpu_pool import image_ops, run_cpu
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_resize/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(
-        command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    return (
-        stdout.decode('utf-8', 'replace').strip(),
-        stderr.decode('utf-8', 'replace').strip(),
-        process.returncode
-    )
 
-def sync_resize_image(input_path: str, width: int, height: int) -> str:
-    base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_resized{ext}")
-    with Image.open(input_path) as img:
-        resized_img = img.resize((width, height), Image.Resampling.LANCZOS)
-        if resized_img.mode in ("RGBA", "P"): resized_img = resized_img.convert("RGB")
-        resized_img.save(output_path)
-    return output_path
+def build_scale_filter(width: int, height: int) -> str:
+    return f"scale={width}:{height},setsar=1"
 
-async def sync_resize_video_or_gif(input_path: str, width: int, height: int) -> tuple[str, str | None]:
+async def sync_resize_video_or_gif(input_path: str, width: int, height: int, progress: Message | None = None, file_unique_id: str | None = None) -> tuple[str, str | None]:
     base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_resized{ext}")
-    thumb_path = os.path.join(TEMP_DIR, f"{base}_thumb.jpg")
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_resized{ext}")
+    thumb_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_thumb.jpg")
     
+    info = await get_media_info(input_path, file_unique_id)
+    # The scaled frames are split so the thumbnail comes out of the same run as the video.
     command_resize = (
         f'ffmpeg -i "{input_path}" '
-        f'-vf "scale={width}:{height},setsar=1" '
-        f'-c:v libx264 -preset veryfast '
-        f'-c:a aac '
-        f'-y "{output_path}"'
+        f'-filter_complex "[0:v]{build_scale_filter(width, height)},split=2[v][t]" '
+        f'-map "[v]" -map "0:a?" '
+        f'{encode_args("resize", info, ext, video_filtered=True)} '
+        f'-y "{output_path}" '
+        f'-map "[t]" -ss 00:00:01 -frames:v 1 -y "{thumb_path}"'
     )
-    _, stderr, code = await run_command(command_resize)
+    _, stderr, code = await run_command(command_resize, progress=progress, label=f"Resizing to {width}x{height}...", duration=info.duration)
     if code != 0: raise RuntimeError(f"FFmpeg resize failed: {stderr}")
     
-    command_thumb = f'ffmpeg -i "{output_path}" -ss 00:00:01 -vframes 1 -y "{thumb_path}"'
-    _, stderr, code = await run_command(command_thumb)
-    thumb_path = thumb_path if code == 0 else None
+    thumb_path = thumb_path if os.path.exists(thumb_path) and os.path.getsize(thumb_path) > 0 else None
         
     return output_path, thumb_path
 
@@ -78,7 +65,7 @@ async def resize_handler(bot: BOT, message: Message):
     original_path, resized_path, thumb_path = "", "", None
     temp_files = []
     try:
-        original_path = await bot.download_media(replied_msg, file_name=TEMP_DIR)
+        original_path = await bot.download_media(replied_msg, file_name=temp_dir(TEMP_DIR))
         temp_files.append(original_path)
         
         await progress_message.edit(f"<code>Resizing to {width}x{height}...</code>")
@@ -88,7 +75,9 @@ async def resize_handler(bot: BOT, message: Message):
         is_animation = replied_msg.animation
 
         if is_image:
-            resized_path = await asyncio.to_thread(sync_resize_image, original_path, width, height)
+            base, ext = os.path.splitext(os.path.basename(original_path))
+            output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_resized{ext}")
+            resized_path = await run_cpu(image_ops.resize_image, original_path, output_path, width, height)
             temp_files.append(resized_path)
             await progress_message.edit("<code>Sending media...</code>")
             await bot.send_photo(
@@ -99,7 +88,7 @@ async def resize_handler(bot: BOT, message: Message):
             )
         
         elif is_video or is_animation:
-            resized_path, thumb_path = await sync_resize_video_or_gif(original_path, width, height)
+            resized_path, thumb_path = await sync_resize_video_or_gif(original_path, width, height, progress=progress_message, file_unique_id=get_file_unique_id(replied_msg))
             temp_files.extend([resized_path, thumb_path] if thumb_path else [resized_path])
 
             await progress_message.edit("<code>Sending media...</code>")
@@ -1,42 +1,38 @@
 import os
 import html
-import asyncio
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import run_command
+from app.modules.utils.encode import encode_args
+from app.modules.utils.metadata import get_media_info
+from app.modules.utils.media_cache import MEDIA_CACHE
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_reverse/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(
-        command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    return (
-        stdout.decode('utf-8', 'replace').strip(),
-        stderr.decode('utf-8', 'replace').strip(),
-        process.returncode
-    )
-
-async def sync_reverse_media(input_path: str, is_visual: bool) -> str:
+async def sync_reverse_media(input_path: str, is_visual: bool, progress: Message | None = None, file_unique_id: str | None = None) -> str:
     base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_reversed{ext}")
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_reversed{ext}")
     
+    info = await get_media_info(input_path, file_unique_id)
+    codec_args = encode_args("reverse", info, ext, video_filtered=True, audio_filtered=True)
+
     command = ""
     if is_visual:
-        command = f'ffmpeg -i "{input_path}" -vf "reverse" -af "areverse" -y "{output_path}"'
+        command = f'ffmpeg -i "{input_path}" -vf "reverse" -af "areverse" {codec_args} -y "{output_path}"'
     else:
-        command = f'ffmpeg -i "{input_path}" -af "areverse" -y "{output_path}"'
+        command = f'ffmpeg -i "{input_path}" -af "areverse" {codec_args} -y "{output_path}"'
 
-    _, stderr, code = await run_command(command)
+    duration = info.duration
+    _, stderr, code = await run_command(command, progress=progress, label="Reversing...", duration=duration)
     
     if code != 0:
         if is_visual and ("Cannot find a matching stream" in stderr or "anull" in stderr):
-            command = f'ffmpeg -i "{input_path}" -vf "reverse" -an -y "{output_path}"'
-            _, stderr_fallback, code_fallback = await run_command(command)
+            command = f'ffmpeg -i "{input_path}" -vf "reverse" -an {encode_args("reverse", info, ext, video_filtered=True)} -y "{output_path}"'
+            _, stderr_fallback, code_fallback = await run_command(command, progress=progress, label="Reversing...", duration=duration)
             if code_fallback != 0: raise RuntimeError(f"FFmpeg reverse failed (no audio): {stderr_fallback}")
         else:
             raise RuntimeError(f"FFmpeg reverse failed: {stderr}")
@@ -59,12 +55,17 @@ async def reverse_handler(bot: BOT, message: Message):
     if not is_media:
         return await message.reply("Please reply to a video, GIF, or audio file.", del_in=MEDIUM_TIMEOUT)
 
+    media_object = (replied_msg.video or replied_msg.animation or replied_msg.audio or replied_msg.voice or replied_msg.document)
+    reply_params = ReplyParameters(message_id=replied_msg.id)
+    cache_key = MEDIA_CACHE.make_key(media_object.file_unique_id, "reverse")
+    if await MEDIA_CACHE.send(cache_key, message.chat.id, reply_parameters=reply_params):
+        return
+
     progress_message = await message.reply("<code>Downloading media...</code>")
     
     original_path, modified_path = "", ""
     temp_files = []
     try:
-        media_object = (replied_msg.video or replied_msg.animation or replied_msg.audio or replied_msg.voice or replied_msg.document)
         original_path = await bot.download_media(media_object)
         temp_files.append(original_path)
         
@@ -76,26 +77,26 @@ async def reverse_handler(bot: BOT, message: Message):
         
         await progress_message.edit("<code>Reversing...</code>")
         
-        modified_path = await sync_reverse_media(original_path, is_visual)
+        modified_path = await sync_reverse_media(original_path, is_visual, progress=progress_message, file_unique_id=media_object.file_unique_id)
         temp_files.append(modified_path)
         
         await progress_message.edit("<code>Sending media...</code>")
 
         caption = "Reversed!"
-        reply_params = ReplyParameters(message_id=replied_msg.id)
         
         is_animation = bool(replied_msg.animation or (replied_msg.document and replied_msg.document.mime_type == 'image/gif'))
         is_video = bool(replied_msg.video or (replied_msg.document and replied_msg.document.mime_type.startswith('video/')))
 
         if is_animation:
-            await bot.send_animation(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+            sent = await bot.send_animation(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         elif is_video:
-            await bot.send_video(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+            sent = await bot.send_video(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         elif replied_msg.voice:
-             await bot.send_voice(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+             sent = await bot.send_voice(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         else:
-            await bot.send_audio(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+            sent = await bot.send_audio(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         
+        await MEDIA_CACHE.store(cache_key, sent, caption)
         await progress_message.delete()
 
     except Exception as e:
@@ -1,53 +1,35 @@
 import os
 import html
-import asyncio
-from PIL import Image
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import run_command
+from app.modules.utils.encode import encode_args
+from app.modules.utils.metadata import get_media_info, get_file_unique_id
+from app.modules.utils.cpu_pool import image_ops, run_cpu
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_rotate/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(
-        command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    return (
-        stdout.decode('utf-8', 'replace').strip(),
-        stderr.decode('utf-8', 'replace').strip(),
-        process.returncode
-    )
-
-def sync_rotate_image(input_path: str, angle: int) -> str:
-    """Synchronously rotates an image by a given angle."""
-    base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_rotated{ext}")
-    with Image.open(input_path) as img:
-        rotated_img = img.rotate(-angle, expand=True)
-        if rotated_img.mode in ("RGBA", "P"):
-            rotated_img = rotated_img.convert("RGB")
-        rotated_img.save(output_path)
-    return output_path
 
-async def sync_rotate_video_or_gif(input_path: str, rotations: int) -> str:
+async def sync_rotate_video_or_gif(input_path: str, rotations: int, progress: Message | None = None, file_unique_id: str | None = None) -> str:
     """Synchronously rotates a video or GIF by applying the transpose filter N times."""
     base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_rotated{ext}")
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_rotated{ext}")
     
     transpose_filter = ",".join(["transpose=1"] * rotations)
+    info = await get_media_info(input_path, file_unique_id)
     
     command = (
         f'ffmpeg -i "{input_path}" '
         f'-vf "{transpose_filter}" '
-        f'-c:a copy '
+        f'{encode_args("rotate", info, ext, video_filtered=True)} '
         f'-y "{output_path}"'
     )
 
-    _, stderr, code = await run_command(command)
+    _, stderr, code = await run_command(command, progress=progress, label=f"Rotating by {rotations * 90} degrees...", duration=info.duration)
     if code != 0:
         raise RuntimeError(f"FFmpeg rotate failed: {stderr}")
         
@@ -93,9 +75,11 @@ async def rotate_handler(bot: BOT, message: Message):
         is_image = replied_msg.photo or (replied_msg.document and replied_msg.document.mime_type.startswith('image/'))
         
         if is_image:
-            modified_path = await asyncio.to_thread(sync_rotate_image, original_path, angle)
+            base, ext = os.path.splitext(os.path.basename(original_path))
+            output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_rotated{ext}")
+            modified_path = await run_cpu(image_ops.rotate_image, original_path, output_path, angle)
         else:
-            modified_path = await sync_rotate_video_or_gif(original_path, rotations)
+            modified_path = await sync_rotate_video_or_gif(original_path, rotations, progress=progress_message, file_unique_id=get_file_unique_id(replied_msg))
             
         temp_files.append(modified_path)
         
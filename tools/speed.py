@@ -1,31 +1,20 @@
 import os
 import html
-import asyncio
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import run_command
+from app.modules.utils.encode import encode_args
+from app.modules.utils.metadata import get_media_info
+from app.modules.utils.media_cache import MEDIA_CACHE
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_speed/"
-os.makedirs(TEMP_DIR, exist_ok=True)
-
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(
-        command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    return (
-        stdout.decode('utf-8', 'replace').strip(),
-        stderr.decode('utf-8', 'replace').strip(),
-        process.returncode
-    )
-
-async def sync_change_speed(input_path: str, speed_factor: float, is_video: bool) -> str:
-    """Synchronously changes the speed of a media file using FFmpeg, handling a wide range of values."""
-    base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_speed_{speed_factor}x{ext}")
-    
+
+def build_atempo_filter(speed_factor: float) -> str:
+    """Chains atempo filters so factors outside its 0.5-100 range still work."""
     atempo_filters = []
     temp_factor = speed_factor
     while temp_factor > 100.0:
@@ -35,8 +24,16 @@ async def sync_change_speed(input_path: str, speed_factor: float, is_video: bool
         atempo_filters.append("atempo=0.5")
         temp_factor /= 0.5
     atempo_filters.append(f"atempo={temp_factor}")
+    return ",".join(atempo_filters)
+
+async def sync_change_speed(input_path: str, speed_factor: float, is_video: bool, progress: Message | None = None, file_unique_id: str | None = None) -> str:
+    """Synchronously changes the speed of a media file using FFmpeg, handling a wide range of values."""
+    base, ext = os.path.splitext(os.path.basename(input_path))
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_speed_{speed_factor}x{ext}")
     
-    audio_filter_str = ",".join(atempo_filters)
+    audio_filter_str = build_atempo_filter(speed_factor)
+    info = await get_media_info(input_path, file_unique_id)
+    codec_args = encode_args("speed", info, ext, video_filtered=True, audio_filtered=True)
 
     command = ""
     if is_video:
@@ -46,25 +43,29 @@ async def sync_change_speed(input_path: str, speed_factor: float, is_video: bool
             f'ffmpeg -i "{input_path}" '
             f'-filter_complex "{video_filter};{audio_filter}" '
             f'-map "[v]" -map "[a]" '
-            f'-y "{output_path}"'
+            f'{codec_args} -y "{output_path}"'
         )
     else:
         command = (
             f'ffmpeg -i "{input_path}" '
             f'-filter:a "{audio_filter_str}" '
-            f'-y "{output_path}"'
+            f'{codec_args} -y "{output_path}"'
         )
 
-    _, stderr, code = await run_command(command)
+    duration = info.duration
+    if duration:
+        duration /= speed_factor
+    label = f"Changing speed to {speed_factor}x..."
+    _, stderr, code = await run_command(command, progress=progress, label=label, duration=duration)
     
     if code != 0:
         if is_video and "Cannot find a matching stream" in stderr:
             command = (
                 f'ffmpeg -i "{input_path}" '
                 f'-filter:v "setpts={1/speed_factor}*PTS" -an '
-                f'-y "{output_path}"'
+                f'{encode_args("speed", info, ext, video_filtered=True)} -y "{output_path}"'
             )
-            _, stderr_fallback, code_fallback = await run_command(command)
+            _, stderr_fallback, code_fallback = await run_command(command, progress=progress, label=label, duration=duration)
             if code_fallback != 0: raise RuntimeError(f"FFmpeg failed (no audio): {stderr_fallback}")
         else:
             raise RuntimeError(f"FFmpeg failed: {stderr}")
@@ -95,12 +96,17 @@ async def speed_handler(bot: BOT, message: Message):
     except ValueError:
         return await message.reply("Invalid speed factor. Please use a number like `5` or `0.5`.", del_in=MEDIUM_TIMEOUT)
 
+    media_object = (replied_msg.video or replied_msg.audio or replied_msg.voice or replied_msg.document)
+    reply_params = ReplyParameters(message_id=replied_msg.id)
+    cache_key = MEDIA_CACHE.make_key(media_object.file_unique_id, "speed", factor=speed_factor)
+    if await MEDIA_CACHE.send(cache_key, message.chat.id, reply_parameters=reply_params):
+        return
+
     progress_message = await message.reply("<code>Downloading media...</code>")
     
     original_path, modified_path = "", ""
     temp_files = []
     try:
-        media_object = (replied_msg.video or replied_msg.audio or replied_msg.voice or replied_msg.document)
         original_path = await bot.download_media(media_object)
         temp_files.append(original_path)
         
@@ -108,21 +114,21 @@ async def speed_handler(bot: BOT, message: Message):
         
         await progress_message.edit(f"<code>Changing speed to {speed_factor}x...</code>")
         
-        modified_path = await sync_change_speed(original_path, speed_factor, is_video)
+        modified_path = await sync_change_speed(original_path, speed_factor, is_video, progress=progress_message, file_unique_id=media_object.file_unique_id)
         temp_files.append(modified_path)
         
         await progress_message.edit("<code>Sending media...</code>")
 
         caption = f"Speed changed to: `{speed_factor}x`"
-        reply_params = ReplyParameters(message_id=replied_msg.id)
 
         if is_video:
-            await bot.send_video(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+            sent = await bot.send_video(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         elif replied_msg.voice:
-             await bot.send_voice(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+             sent = await bot.send_voice(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         else:
-            await bot.send_audio(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+            sent = await bot.send_audio(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         
+        await MEDIA_CACHE.store(cache_key, sent, caption)
         await progress_message.delete()
 
     except Exception as e:
@@ -1,46 +1,34 @@
 import os
 import html
-import asyncio
-from PIL import Image
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import PRIORITY_LOW, run_command
+from app.modules.utils.encode import encode_args
+from app.modules.utils.metadata import get_media_info
+from app.modules.utils.cpu_pool import image_ops, run_cpu
+from app.modules.utils.media_cache import MEDIA_CACHE
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_upscale/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-    stdout, stderr = await process.communicate()
-    return (stdout.decode('utf-8', 'replace').strip(), stderr.decode('utf-8', 'replace').strip(), process.returncode)
 
-def sync_upscale_image(input_path: str, scale_factor: int = 2) -> tuple[str, int, int]:
+async def sync_upscale_video(input_path: str, scale_factor: int = 2, progress: Message | None = None, file_unique_id: str | None = None) -> tuple[str, int, int]:
     base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_upscaled{ext}")
-    with Image.open(input_path) as img:
-        orig_width, orig_height = img.size
-        new_width = orig_width * scale_factor
-        new_height = orig_height * scale_factor
-        upscaled_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        if upscaled_img.mode in ("RGBA", "P"): upscaled_img = upscaled_img.convert("RGB")
-        upscaled_img.save(output_path)
-    return output_path, new_width, new_height
-
-async def sync_upscale_video(input_path: str, scale_factor: int = 2) -> tuple[str, int, int]:
-    base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_upscaled{ext}")
+    output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_upscaled{ext}")
     
-    probe_command = f'ffprobe -v error -select_streams v:0 -show_entries stream=width,height -of csv=s=x:p=0 "{input_path}"'
-    stdout, _, _ = await run_command(probe_command)
-    orig_width, orig_height = map(int, stdout.split('x'))
+    info = await get_media_info(input_path, file_unique_id)
+    if not (info.width and info.height):
+        raise RuntimeError("Could not read the video resolution.")
+    orig_width, orig_height = info.width, info.height
     new_width = orig_width * scale_factor
     new_height = orig_height * scale_factor
     
     scale_filter = f"scale=iw*{scale_factor}:ih*{scale_factor}:flags=lanczos"
-    command = f'ffmpeg -i "{input_path}" -vf "{scale_filter}" -c:a copy -y "{output_path}"'
-    _, stderr, code = await run_command(command)
+    command = f'ffmpeg -i "{input_path}" -vf "{scale_filter}" {encode_args("upscale", info, ext, video_filtered=True)} -y "{output_path}"'
+    _, stderr, code = await run_command(command, priority=PRIORITY_LOW, progress=progress, label="Upscaling...", duration=info.duration)
     if code != 0: raise RuntimeError(f"FFmpeg upscale failed: {stderr}")
         
     return output_path, new_width, new_height
@@ -65,12 +53,17 @@ async def upscale_handler(bot: BOT, message: Message):
     if not is_media:
         return await message.reply("Please reply to an image or video to upscale it.", del_in=MEDIUM_TIMEOUT)
 
+    media_object = (replied_msg.photo or replied_msg.video or replied_msg.document)
+    reply_params = ReplyParameters(message_id=replied_msg.id)
+    cache_key = MEDIA_CACHE.make_key(media_object.file_unique_id, "upscale", scale=2)
+    if await MEDIA_CACHE.send(cache_key, message.chat.id, reply_parameters=reply_params):
+        return
+
     progress_message = await message.reply("<code>Downloading media...</code>")
     
     original_path, modified_path = "", ""
     temp_files = []
     try:
-        media_object = (replied_msg.photo or replied_msg.video or replied_msg.document)
         original_path = await bot.download_media(media_object)
         temp_files.append(original_path)
         
@@ -79,22 +72,24 @@ async def upscale_handler(bot: BOT, message: Message):
         is_image = replied_msg.photo or (replied_msg.document and replied_msg.document.mime_type.startswith('image/'))
         
         if is_image:
-            modified_path, new_width, new_height = await asyncio.to_thread(sync_upscale_image, original_path)
+            base, ext = os.path.splitext(os.path.basename(original_path))
+            output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_upscaled{ext}")
+            modified_path, new_width, new_height = await run_cpu(image_ops.upscale_image, original_path, output_path)
         else:
-            modified_path, new_width, new_height = await sync_upscale_video(original_path)
+            modified_path, new_width, new_height = await sync_upscale_video(original_path, progress=progress_message, file_unique_id=media_object.file_unique_id)
         
         temp_files.append(modified_path)
         
         await progress_message.edit("<code>Sending media...</code>")
         
         caption = f"Upscaled to: `{new_width}x{new_height}`"
-        reply_params = ReplyParameters(message_id=replied_msg.id)
         
         if is_image:
-            await bot.send_photo(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+            sent = await bot.send_photo(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         else:
-            await bot.send_video(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
+            sent = await bot.send_video(message.chat.id, modified_path, caption=caption, reply_parameters=reply_params)
         
+        await MEDIA_CACHE.store(cache_key, sent, caption)
         await progress_message.delete()
 
     except Exception as e:
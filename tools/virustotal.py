@@ -2,25 +2,20 @@ import os
 import html
 import asyncio
 import hashlib
-import requests
 import re
 import base64
 from pyrogram.types import Message, LinkPreviewOptions, ReplyParameters
-from dotenv import load_dotenv
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils import http
+from app.modules.utils.env import ENV
+from app.modules.utils.lazy import temp_dir
 
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-MODULES_DIR = os.path.dirname(SCRIPT_DIR)
-ENV_PATH = os.path.join(MODULES_DIR, "extra_config.env")
-load_dotenv(dotenv_path=ENV_PATH)
-
-VIRUSTOTAL_API_KEY = os.getenv("VIRUSTOTAL_API_KEY")
+VIRUSTOTAL_API_KEY = ENV.VIRUSTOTAL_API_KEY
 
 TEMP_DIR = "temp_virustotal/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 VT_API_URL = "https://www.virustotal.com/api/v3"
 
 
@@ -78,13 +73,13 @@ async def scan_file(api_key: str, message: Message):
     original_path = ""
     temp_files = []
     try:
-        original_path = await bot.download_media(message.replied, file_name=os.path.join(TEMP_DIR, ""))
+        original_path = await bot.download_media(message.replied, file_name=os.path.join(temp_dir(TEMP_DIR), ""))
         temp_files.append(original_path)
         await progress.edit("<code>Calculating hash...</code>")
         file_hash = await asyncio.to_thread(calculate_sha256, original_path)
         await progress.edit("<code>Querying VirusTotal...</code>")
         headers = {"x-apikey": api_key}; url = f"{VT_API_URL}/files/{file_hash}"
-        response = await asyncio.to_thread(requests.get, url, headers=headers)
+        response = await http.get(url, headers=headers)
         if response.status_code == 200: final_report = format_vt_report(response.json()["data"]["attributes"], "file", file_hash)
         elif response.status_code == 404: final_report = "<b>VirusTotal Report:</b>\n<b>  - Status:</b> ⚪ Not in database."
         else: final_report = f"<b>VirusTotal Report:</b>\n<b>  - Error:</b> API code {response.status_code}."
@@ -102,12 +97,12 @@ async def scan_url(api_key: str, message: Message):
         target_url = message.input
         url_id = base64.urlsafe_b64encode(target_url.encode()).decode().strip("=")
         headers = {"x-apikey": api_key}; url = f"{VT_API_URL}/urls/{url_id}"
-        response = await asyncio.to_thread(requests.get, url, headers=headers)
+        response = await http.get(url, headers=headers)
         if response.status_code == 200: final_report = format_vt_report(response.json()["data"]["attributes"], "url", url_id, target_url)
         elif response.status_code == 404:
             final_report = f"<b>VirusTotal Report for URL:</b>\n<code>{html.escape(target_url)}</code>\n<b>  - Status:</b> ⚪ Not in database. Submitting..."
             post_url = f"{VT_API_URL}/urls"; post_data = {"url": target_url}
-            await asyncio.to_thread(requests.post, post_url, data=post_data, headers=headers)
+            await http.post(post_url, data=post_data, headers=headers)
             final_report += "\n<i>  Check the report in a minute.</i>"
         else: final_report = f"<b>VirusTotal Report:</b>\n<b>  - Error:</b> API code {response.status_code}."
         await progress.edit(final_report, link_preview_options=LinkPreviewOptions(is_disabled=True))
@@ -121,7 +116,7 @@ async def scan_domain_or_ip(api_key: str, message: Message, scan_type: str):
         resource = message.input
         endpoint = "ip_addresses" if scan_type == "ip" else "domains"
         headers = {"x-apikey": api_key}; url = f"{VT_API_URL}/{endpoint}/{resource}"
-        response = await asyncio.to_thread(requests.get, url, headers=headers)
+        response = await http.get(url, headers=headers)
         if response.status_code == 200: final_report = format_vt_report(response.json()["data"]["attributes"], scan_type, resource, resource)
         elif response.status_code == 404: final_report = f"<b>VirusTotal Report:</b>\n<b>  - Status:</b> ⚪ {scan_type.capitalize()} not found."
         else: final_report = f"<b>VirusTotal Report:</b>\n<b>  - Error:</b> API code {response.status_code}."
@@ -1,42 +1,49 @@
 import os
 import html
-import asyncio
 from pyrogram.types import Message, ReplyParameters
 
 from app import BOT, bot
 
 from app.modules.settings import TINY_TIMEOUT, SMALL_TIMEOUT, MEDIUM_TIMEOUT, LONG_TIMEOUT, VERY_LONG_TIMEOUT, LARGE_TIMEOUT
+from app.modules.utils.ffmpeg import PRIORITY_HIGH, run_command
+from app.modules.utils.encode import encode_args
+from app.modules.utils.metadata import get_media_info
+from app.modules.utils.lazy import temp_dir
 
 TEMP_DIR = "temp_volume/"
-os.makedirs(TEMP_DIR, exist_ok=True)
 
-async def run_command(command: str) -> tuple[str, str, int]:
-    process = await asyncio.create_subprocess_shell(
-        command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    return (
-        stdout.decode('utf-8', 'replace').strip(),
-        stderr.decode('utf-8', 'replace').strip(),
-        process.returncode
-    )
-
-async def sync_change_volume(input_path: str, volume_factor: float) -> str:
+async def sync_change_volume(input_path: str, volume_factor: float, progress: Message | None = None, file_unique_id: str | None = None) -> str:
     """Synchronously changes the volume of a media file using FFmpeg."""
     base, ext = os.path.splitext(os.path.basename(input_path))
-    output_path = os.path.join(TEMP_DIR, f"{base}_volume_{int(volume_factor*100)}.mp3")
-    
-    command = (
-        f'ffmpeg -i "{input_path}" '
-        f'-af "aformat=sample_fmts=s16:sample_rates=44100,volume={volume_factor}" '
-        f'-c:a libmp3lame -b:a 192k '
-        f'-c:v copy '
-        f'-y "{output_path}"'
-    )
+    info = await get_media_info(input_path, file_unique_id)
+    # A failed probe says nothing about the streams; let FFmpeg try in that case.
+    if info and not info.has_audio:
+        raise ValueError("The media has no audio stream.")
+
+    if info.has_video:
+        # Only the audio changes, so the video stream is copied and the container kept.
+        output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_volume_{int(volume_factor*100)}{ext}")
+        command = (
+            f'ffmpeg -i "{input_path}" '
+            f'-af "volume={volume_factor}" '
+            f'{encode_args("volume", info, ext, audio_filtered=True)} '
+            f'-y "{output_path}"'
+        )
+    else:
+        output_path = os.path.join(temp_dir(TEMP_DIR), f"{base}_volume_{int(volume_factor*100)}.mp3")
+        command = (
+            f'ffmpeg -i "{input_path}" '
+            f'-af "aformat=sample_fmts=s16:sample_rates=44100,volume={volume_factor}" '
+            f'-c:a libmp3lame -b:a 192k '
+            f'-c:v copy '
+            f'-y "{output_path}"'
+        )
 
-    _, stderr, code = await run_command(command)
+    duration = info.duration
+    label = f"Changing volume to level {int(volume_factor*100)}..."
+    _, stderr, code = await run_command(command, priority=PRIORITY_HIGH, progress=progress, label=label, duration=duration)
     if code != 0:
-        if "does not contain any stream" in stderr or "Invalid argument" in stderr:
+        if not info.has_video and ("does not contain any stream" in stderr or "Invalid argument" in stderr):
             command = (
                 f'ffmpeg -i "{input_path}" '
                 f'-af "volume={volume_factor}" '
@@ -44,7 +51,7 @@ async def sync_change_volume(input_path: str, volume_factor: float) -> str:
                 f'-vn '
                 f'-y "{output_path}"'
             )
-            _, stderr_fallback, code_fallback = await run_command(command)
+            _, stderr_fallback, code_fallback = await run_command(command, priority=PRIORITY_HIGH, progress=progress, label=label, duration=duration)
             if code_fallback != 0: raise RuntimeError(f"FFmpeg volume change failed: {stderr_fallback}")
         else:
             raise RuntimeError(f"FFmpeg volume change failed: {stderr}")
@@ -91,7 +98,7 @@ async def volume_handler(bot: BOT, message: Message):
         
         await progress_message.edit(f"<code>Changing volume to level {int(volume_level)}...</code>")
         
-        modified_path = await sync_change_volume(original_path, volume_factor)
+        modified_path = await sync_change_volume(original_path, volume_factor, progress=progress_message, file_unique_id=media_object.file_unique_id)
         temp_files.append(modified_path)
         
         await progress_message.edit("<code>Sending media...</code>")
@@ -0,0 +1,179 @@
+import time
+import uuid
+import asyncio
+from typing import Awaitable, Callable
+
+from pyrogram.types import Message
+
+from app import CustomDB, bot
+
+BAN_JOBS_DB = CustomDB["BAN_JOBS"]
+
+PENDING = "pending"
+SENT = "sent"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+
+RUNNING = "running"
+DONE = "done"
+
+JOB_RETENTION = 7 * 24 * 3600  # finished jobs older than this are pruned at startup
+RESUME_DELAY = 15  # seconds after startup before unfinished jobs are resumed
+
+# kind -> coroutine that sends to the job's targets in the given states.
+JobRunner = Callable[[dict, Message | None, tuple[str, ...]], Awaitable[None]]
+JOB_RUNNERS: dict[str, JobRunner] = {}
+# Kinds whose runner moves targets on to CONFIRMED; the others stop at SENT.
+CONFIRMING_KINDS: set[str] = set()
+
+# Jobs are kept in memory and written through; every target update changes the in-memory job first.
+JOBS: dict[str, dict] = {}
+# One lock per job: saves of the same job are written one at a time, each from the latest in-memory state,
+# so an older snapshot can never land after a newer one.
+SAVE_LOCKS: dict[str, asyncio.Lock] = {}
+# Ids of jobs a runner is working on right now; a job is never run twice at the same time.
+ACTIVE_JOBS: set[str] = set()
+# Jobs found unfinished in the DB at startup; only these are resumed.
+RESUMABLE_JOBS: list[str] = []
+# The startup resume task, kept so it is not garbage collected mid-run.
+RESUME_TASK: asyncio.Task | None = None
+
+
+def register_runner(kinds: list[str], runner: JobRunner, confirms: bool = False):
+    """confirms: the runner marks targets CONFIRMED once the remote bot acknowledges them."""
+    for kind in kinds:
+        JOB_RUNNERS[kind] = runner
+        if confirms:
+            CONFIRMING_KINDS.add(kind)
+
+
+async def _save(job: dict):
+    async with SAVE_LOCKS.setdefault(job["_id"], asyncio.Lock()):
+        # Snapshot taken under the lock, so the write reflects every update made before it.
+        targets = {chat_id: dict(target) for chat_id, target in job["targets"].items()}
+        await BAN_JOBS_DB.add_data({"_id": job["_id"], "status": job["status"], "targets": targets, "updated": time.time()})
+
+
+async def create_job(
+    kind: str,
+    command: str,
+    user_id: int,
+    user_mention: str,
+    reason: str,
+    targets: dict[int, str],
+    initiated_in: str,
+    by: str | None = None,
+) -> dict:
+    """Records a fan-out before anything is sent. targets maps chat id to a display name."""
+    job = {
+        "_id": uuid.uuid4().hex[:8],
+        "kind": kind,
+        "command": command,
+        "user_id": user_id,
+        "user_mention": user_mention,
+        "reason": reason,
+        "initiated_in": initiated_in,
+        "by": by,
+        "created": time.time(),
+        "updated": time.time(),
+        "status": RUNNING,
+        "targets": {str(chat_id): {"name": name, "state": PENDING, "error": None} for chat_id, name in targets.items()},
+    }
+    JOBS[job["_id"]] = job
+    await BAN_JOBS_DB.add_data(dict(job))
+    return job
+
+
+async def set_target_state(job: dict, chat_id: int, state: str, error: str | None = None):
+    target = job["targets"][str(chat_id)]
+    target["state"] = state
+    target["error"] = error
+    await _save(job)
+
+
+async def finish_job(job: dict):
+    job["status"] = DONE
+    await _save(job)
+
+
+def targets_in(job: dict, states: tuple[str, ...]) -> list[tuple[int, dict]]:
+    return [(int(chat_id), target) for chat_id, target in job["targets"].items() if target["state"] in states]
+
+
+def confirms(job: dict) -> bool:
+    return job["kind"] in CONFIRMING_KINDS
+
+
+def count_states(job: dict) -> dict[str, int]:
+    counts = {PENDING: 0, SENT: 0, CONFIRMED: 0, FAILED: 0}
+    for target in job["targets"].values():
+        counts[target["state"]] = counts.get(target["state"], 0) + 1
+    return counts
+
+
+def get_job(job_id: str) -> dict | None:
+    return JOBS.get(job_id)
+
+
+def is_active(job_id: str) -> bool:
+    return job_id in ACTIVE_JOBS
+
+
+async def delete_job(job_id: str) -> bool:
+    """Deletes a finished or stopped job. Running jobs are left alone, their runner still writes to them."""
+    if is_active(job_id) or JOBS.pop(job_id, None) is None:
+        return False
+    SAVE_LOCKS.pop(job_id, None)
+    await BAN_JOBS_DB.delete_data(id=job_id)
+    return True
+
+
+async def run_job(job: dict, progress: Message | None = None, states: tuple[str, ...] = (PENDING,)):
+    """
+    Sends the job to its targets in `states`. Targets already sent or confirmed are never sent twice,
+    and a job that is already running is refused.
+    """
+    runner = JOB_RUNNERS.get(job["kind"])
+    if not runner:
+        raise ValueError(f"No runner registered for {job['kind']} jobs.")
+    if is_active(job["_id"]):
+        raise ValueError(f"Job {job['_id']} is already running.")
+    ACTIVE_JOBS.add(job["_id"])
+    try:
+        job["status"] = RUNNING
+        await runner(job, progress, states)
+    finally:
+        ACTIVE_JOBS.discard(job["_id"])
+
+
+async def _resume_unfinished():
+    await asyncio.sleep(RESUME_DELAY)
+    for job_id in RESUMABLE_JOBS:
+        job = JOBS.get(job_id)
+        # Deleted, finished or picked up by -retry in the meantime.
+        if not job or job["status"] != RUNNING or is_active(job_id):
+            continue
+        try:
+            await run_job(job)
+        except Exception as e:
+            await bot.log_text(text=f"#BANJOBS\nCould not resume job <code>{job['_id']}</code>: {e}", type="BANJOBS_ERROR")
+
+
+async def _log_resume_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        await bot.log_text(text=f"#BANJOBS\nResuming unfinished jobs failed: {task.exception()}", type="BANJOBS_ERROR")
+
+
+async def init_task():
+    global RESUME_TASK
+    now = time.time()
+    async for job in BAN_JOBS_DB.find():
+        if job.get("status") == DONE and now - job.get("updated", 0) > JOB_RETENTION:
+            await BAN_JOBS_DB.delete_data(id=job["_id"])
+            continue
+        JOBS[job["_id"]] = job
+        if job.get("status") == RUNNING:
+            RESUMABLE_JOBS.append(job["_id"])
+    # Resume in the background once every module has registered its runner and the client is up.
+    RESUME_TASK = asyncio.create_task(_resume_unfinished())
+    RESUME_TASK.add_done_callback(lambda task: asyncio.create_task(_log_resume_failure(task)))
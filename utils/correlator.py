@@ -0,0 +1,145 @@
+import time
+import asyncio
+from collections import OrderedDict, deque
+from typing import Callable, Iterable
+
+from pyrogram import filters
+from pyrogram.types import Message
+
+from app import BOT, bot
+
+from app.modules.settings import CORRELATOR_HANDLER_GROUP
+
+RECENT_CHATS = 200  # chats whose latest incoming messages are buffered
+RECENT_PER_CHAT = 20  # buffered messages per chat
+RECENT_TTL = 60  # seconds a buffered message can still satisfy a new expectation
+
+
+class Expectation:
+    """A pending wait for an incoming message in one chat, narrowed by reply target, sender and predicate."""
+
+    def __init__(
+        self,
+        chat_id: int,
+        reply_to: int | None = None,
+        sender: int | Iterable[int] | None = None,
+        predicate: Callable[[Message], bool] | None = None,
+        after_id: int = 0,
+    ):
+        self.chat_id = chat_id
+        self.reply_to = reply_to
+        self.senders = {sender} if isinstance(sender, int) else (set(sender) if sender is not None else None)
+        self.predicate = predicate
+        self.after_id = after_id
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def matches(self, message: Message) -> bool:
+        if message.id <= self.after_id:
+            return False
+        if self.reply_to is not None and message.reply_to_message_id != self.reply_to:
+            return False
+        if self.senders is not None:
+            sender = message.from_user or message.sender_chat
+            if not sender or sender.id not in self.senders:
+                return False
+        if self.predicate:
+            try:
+                return bool(self.predicate(message))
+            except Exception:
+                return False
+        return True
+
+
+class ReplyCorrelator:
+    """
+    Resolves waits for bot replies from a single message handler instead of polling chat history.
+    Expectations are indexed by chat and reply target; a short buffer of recent messages covers
+    replies that arrive before the caller gets to register.
+    """
+
+    def __init__(self):
+        self._pending: dict[int, dict[int | None, list[Expectation]]] = {}
+        self._recent: OrderedDict[int, deque[tuple[float, Message]]] = OrderedDict()
+
+    def expect(
+        self,
+        chat_id: int,
+        reply_to: int | None = None,
+        sender: int | Iterable[int] | None = None,
+        predicate: Callable[[Message], bool] | None = None,
+        after_id: int = 0,
+    ) -> Expectation:
+        expectation = Expectation(chat_id, reply_to, sender, predicate, after_id)
+
+        now = time.monotonic()
+        for received_at, message in self._recent.get(chat_id, ()):
+            if now - received_at <= RECENT_TTL and expectation.matches(message):
+                expectation.future.set_result(message)
+                return expectation
+
+        self._pending.setdefault(chat_id, {}).setdefault(reply_to, []).append(expectation)
+        return expectation
+
+    async def wait(self, expectation: Expectation, timeout: float) -> Message | None:
+        try:
+            return await asyncio.wait_for(asyncio.shield(expectation.future), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.discard(expectation)
+
+    async def wait_for(
+        self,
+        chat_id: int,
+        timeout: float,
+        reply_to: int | None = None,
+        sender: int | Iterable[int] | None = None,
+        predicate: Callable[[Message], bool] | None = None,
+        after_id: int = 0,
+    ) -> Message | None:
+        """Waits up to `timeout` seconds for the first matching message. Returns None on timeout."""
+        expectation = self.expect(chat_id, reply_to=reply_to, sender=sender, predicate=predicate, after_id=after_id)
+        return await self.wait(expectation, timeout)
+
+    def discard(self, expectation: Expectation):
+        by_reply = self._pending.get(expectation.chat_id)
+        if not by_reply:
+            return
+        waiting = by_reply.get(expectation.reply_to)
+        if waiting and expectation in waiting:
+            waiting.remove(expectation)
+            if not waiting:
+                del by_reply[expectation.reply_to]
+        if not by_reply:
+            del self._pending[expectation.chat_id]
+        if not expectation.future.done():
+            expectation.future.cancel()
+
+    def feed(self, message: Message):
+        chat_id = message.chat.id
+        recent = self._recent.get(chat_id)
+        if recent is None:
+            recent = self._recent[chat_id] = deque(maxlen=RECENT_PER_CHAT)
+            while len(self._recent) > RECENT_CHATS:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(chat_id)
+        recent.append((time.monotonic(), message))
+
+        by_reply = self._pending.get(chat_id)
+        if not by_reply:
+            return
+        candidates = list(by_reply.get(None, ()))
+        if message.reply_to_message_id is not None:
+            candidates += by_reply.get(message.reply_to_message_id, ())
+        for expectation in candidates:
+            if not expectation.future.done() and expectation.matches(message):
+                expectation.future.set_result(message)
+
+
+CORRELATOR = ReplyCorrelator()
+
+
+@bot.on_message(filters.incoming & ~filters.service, group=CORRELATOR_HANDLER_GROUP)
+async def correlator_watcher(bot: BOT, message: Message):
+    CORRELATOR.feed(message)
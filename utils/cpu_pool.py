@@ -0,0 +1,95 @@
+import os
+import site
+import asyncio
+import functools
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.modules.settings import CPU_POOL_WORKERS
+from app.modules.utils.cpu_workers import image_ops
+
+# Spawned workers load cpu_workers/ modules by their top-level name from this directory, so they import
+# only that module (and PIL) instead of the whole app package. The bot itself uses the package names.
+WORKERS_DIR = os.path.dirname(os.path.abspath(image_ops.__file__))
+
+
+class _WorkerFunction:
+    """
+    A cpu_workers function that pickles as getattr(importlib.import_module("<module>"), "<name>"),
+    so the worker resolves it by top-level module name rather than through app.
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __reduce__(self):
+        return getattr, (_WorkerModule(self.func.__module__.rpartition(".")[2]), self.func.__name__)
+
+
+class _WorkerModule:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __reduce__(self):
+        return importlib.import_module, (self.name,)
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_UNAVAILABLE = False
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    """Creates the shared pool on first use. Returns None once the pool is known not to work here."""
+    global _POOL, _POOL_UNAVAILABLE
+    if _POOL is None and not _POOL_UNAVAILABLE:
+        try:
+            workers = CPU_POOL_WORKERS or os.cpu_count() or 1
+            # Never fork the live client: its threads (Pyrogram workers, to_thread executors, the session
+            # sqlite connection) may hold locks that would stay locked forever in the child.
+            _POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=site.addsitedir,
+                initargs=(WORKERS_DIR,),
+            )
+        except (OSError, ValueError, NotImplementedError):
+            _POOL_UNAVAILABLE = True
+    return _POOL
+
+
+def _drop_pool(unavailable: bool = False):
+    global _POOL, _POOL_UNAVAILABLE
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+    _POOL = None
+    _POOL_UNAVAILABLE = _POOL_UNAVAILABLE or unavailable
+
+
+async def run_cpu(func, *args, **kwargs):
+    """
+    Runs a CPU-bound function from cpu_workers/ (e.g. image_ops) in the shared process pool so it doesn't
+    hold the GIL of the event loop. Arguments and results must be picklable, so pass file paths, not images.
+    Falls back to a thread when worker processes can't be started.
+    """
+    call = functools.partial(_WorkerFunction(func), *args, **kwargs)
+    pool = _get_pool()
+    if pool is None:
+        return await asyncio.to_thread(call)
+
+    loop = asyncio.get_running_loop()
+    try:
+        future = loop.run_in_executor(pool, call)
+    except (OSError, RuntimeError):
+        _drop_pool(unavailable=True)
+        return await asyncio.to_thread(call)
+
+    try:
+        return await future
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); start a fresh pool next time and finish this job in a thread.
+        _drop_pool()
+        return await asyncio.to_thread(call)
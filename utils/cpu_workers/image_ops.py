@@ -0,0 +1,87 @@
+"""
+Pillow work run in the cpu_pool worker processes.
+
+Workers are spawned fresh, so this module is imported there on its own (as the top-level module `image_ops`)
+and must not import the bot, ub_core or anything from app. Output paths are chosen by the caller.
+"""
+
+
+def upscale_image(input_path: str, output_path: str, scale_factor: int = 2) -> tuple[str, int, int]:
+    from PIL import Image
+
+    with Image.open(input_path) as img:
+        orig_width, orig_height = img.size
+        new_width = orig_width * scale_factor
+        new_height = orig_height * scale_factor
+        upscaled_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        if upscaled_img.mode in ("RGBA", "P"): upscaled_img = upscaled_img.convert("RGB")
+        upscaled_img.save(output_path)
+    return output_path, new_width, new_height
+
+
+def enhance_image(input_path: str, output_path: str) -> tuple[str, int, int]:
+    from PIL import Image, ImageEnhance, ImageFilter
+
+    with Image.open(input_path) as img:
+        if img.mode not in ("RGB", "RGBA"): img = img.convert("RGBA")
+        orig_width, orig_height = img.size
+        new_width, new_height = orig_width * 2, orig_height * 2
+        upscaled_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        enhancer_sharp = ImageEnhance.Sharpness(upscaled_img)
+        sharpened_img = enhancer_sharp.enhance(2.0)
+        smoothed_img = sharpened_img.filter(ImageFilter.SMOOTH)
+        enhancer_contrast = ImageEnhance.Contrast(smoothed_img)
+        final_image = enhancer_contrast.enhance(1.2)
+        final_image.save(output_path, "PNG")
+    return output_path, new_width, new_height
+
+
+def resize_image(input_path: str, output_path: str, width: int, height: int) -> str:
+    from PIL import Image
+
+    with Image.open(input_path) as img:
+        resized_img = img.resize((width, height), Image.Resampling.LANCZOS)
+        if resized_img.mode in ("RGBA", "P"): resized_img = resized_img.convert("RGB")
+        resized_img.save(output_path)
+    return output_path
+
+
+def rotate_image(input_path: str, output_path: str, angle: int) -> str:
+    """Rotates an image by a given angle."""
+    from PIL import Image
+
+    with Image.open(input_path) as img:
+        rotated_img = img.rotate(-angle, expand=True)
+        if rotated_img.mode in ("RGBA", "P"):
+            rotated_img = rotated_img.convert("RGB")
+        rotated_img.save(output_path)
+    return output_path
+
+
+def crop_image(input_path: str, output_path: str, width: int, height: int) -> str:
+    from PIL import Image
+
+    with Image.open(input_path) as img:
+        orig_width, orig_height = img.size
+        if width > orig_width or height > orig_height:
+            raise ValueError(f"Crop dimensions ({width}x{height}) cannot be larger than the original image.")
+        left = (orig_width - width) / 2
+        top = (orig_height - height) / 2
+        right = left + width
+        bottom = top + height
+        cropped_img = img.crop((left, top, right, bottom))
+        if cropped_img.mode in ("RGBA", "P"): cropped_img = cropped_img.convert("RGB")
+        cropped_img.save(output_path)
+    return output_path
+
+
+def decode_qr(image_path: str) -> list[bytes]:
+    from PIL import Image
+    from pyzbar import pyzbar
+
+    img = Image.open(image_path)
+
+    if img.mode == 'RGBA':
+        img = img.convert('RGB')
+
+    return [obj.data for obj in pyzbar.decode(img)]
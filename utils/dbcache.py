@@ -0,0 +1,94 @@
+import time
+import asyncio
+from typing import AsyncIterator
+
+from app import CustomDB, bot
+
+from app.modules.settings import DB_CACHE_REFRESH
+
+
+class CachedCollection:
+    """
+    Write-through mirror of a small CustomDB collection.
+    Reads are served from memory; writes go to the DB first and then to the mirror.
+    The mirror is re-read after `refresh_after` seconds to pick up writes made elsewhere.
+    Reloads and writes hold the same lock, so a reload can never overwrite a write made while it ran.
+    """
+
+    def __init__(self, name: str, refresh_after: float = DB_CACHE_REFRESH):
+        self.name = name
+        self.db = CustomDB[name]
+        self.refresh_after = refresh_after
+        self._docs: dict = {}
+        self._loaded_at: float = 0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    async def _reload(self):
+        """Caller holds the lock."""
+        self._docs = {doc["_id"]: doc async for doc in self.db.find()}
+        self._loaded_at = time.monotonic()
+
+    async def load(self):
+        async with self._lock:
+            await self._reload()
+
+    async def _refresh_in_background(self):
+        try:
+            await self.load()
+        except Exception as e:
+            await bot.log_text(text=f"#DBCACHE\nCould not refresh {self.name}: {e}", type="DBCACHE_ERROR")
+
+    async def _ensure_loaded(self):
+        if self._loaded_at and time.monotonic() - self._loaded_at < self.refresh_after:
+            return
+        if not self._loaded_at:
+            async with self._lock:
+                if not self._loaded_at:
+                    await self._reload()
+            return
+        # Stale but usable: refresh in the background so the caller is not held up.
+        if self._refresh_task is None or self._refresh_task.done():
+            self._loaded_at = time.monotonic()
+            self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def all(self) -> list[dict]:
+        await self._ensure_loaded()
+        return list(self._docs.values())
+
+    async def find(self) -> AsyncIterator[dict]:
+        for doc in await self.all():
+            yield doc
+
+    async def find_one(self, id) -> dict | None:
+        await self._ensure_loaded()
+        return self._docs.get(id)
+
+    async def add_data(self, data: dict):
+        # CustomDB.add_data pops "_id" from the dict it is given; keep ours intact for the mirror.
+        doc_id = data["_id"]
+        await self._ensure_loaded()
+        async with self._lock:
+            result = await self.db.add_data(dict(data))
+            self._docs[doc_id] = {**self._docs.get(doc_id, {}), **data}
+        return result
+
+    async def delete_data(self, id):
+        async with self._lock:
+            deleted = await self.db.delete_data(id=id)
+            self._docs.pop(id, None)
+        return deleted
+
+    async def drop(self):
+        async with self._lock:
+            await self.db.drop()
+            self._docs = {}
+            self._loaded_at = time.monotonic()
+
+
+GBAN_CHATS = CachedCollection("GBAN_CHAT_LIST")
+FED_LIST = CachedCollection("FED_LIST")
+
+
+async def init_task():
+    await asyncio.gather(GBAN_CHATS.load(), FED_LIST.load())
@@ -0,0 +1,95 @@
+from app.modules.settings import ENCODE_PROFILES, KEYFRAME_SNAP_TOLERANCE
+from app.modules.utils.metadata import MediaInfo, get_keyframes
+
+# Containers libx264 output can be written to.
+H264_CONTAINERS = (".mp4", ".mkv", ".mov")
+
+# Codecs a container accepts as-is; None means anything goes.
+CONTAINER_CODECS = {
+    ".mp4": {"h264", "hevc", "av1", "mpeg4", "aac", "mp3", "alac", "opus", "flac", "ac3", "eac3"},
+    ".mov": {"h264", "hevc", "mpeg4", "prores", "aac", "mp3", "alac", "pcm_s16le"},
+    ".m4a": {"aac", "alac"},
+    ".mp3": {"mp3"},
+    ".ogg": {"opus", "vorbis", "flac", "theora"},
+    ".oga": {"opus", "vorbis", "flac"},
+    ".opus": {"opus"},
+    ".webm": {"vp8", "vp9", "av1", "opus", "vorbis"},
+    ".flac": {"flac"},
+    ".mkv": None,
+}
+
+AUDIO_ENCODERS = {
+    ".mp4": "aac",
+    ".mov": "aac",
+    ".mkv": "aac",
+    ".m4a": "aac",
+    ".mp3": "libmp3lame",
+    ".ogg": "libopus",
+    ".oga": "libopus",
+    ".opus": "libopus",
+    ".webm": "libopus",
+}
+
+# Container an audio stream can be remuxed into without re-encoding.
+AUDIO_COPY_EXTENSIONS = {
+    "aac": ".m4a",
+    "alac": ".m4a",
+    "mp3": ".mp3",
+    "opus": ".ogg",
+    "vorbis": ".ogg",
+    "flac": ".flac",
+}
+
+
+def get_profile(command: str) -> dict:
+    return {**ENCODE_PROFILES["default"], **ENCODE_PROFILES.get(command, {})}
+
+
+def can_copy(codec: str | None, output_ext: str) -> bool:
+    if not codec:
+        return False
+    allowed = CONTAINER_CODECS.get(output_ext.lower(), set())
+    return allowed is None or codec in allowed
+
+
+def encode_args(
+    command: str, info: MediaInfo, output_ext: str, video_filtered: bool = False, audio_filtered: bool = False
+) -> str:
+    """
+    Picks codec options per stream: `copy` when the stream is untouched and fits the output container,
+    otherwise the command's encoder profile.
+    """
+    output_ext = output_ext.lower()
+    profile = get_profile(command)
+    args = []
+
+    if info.has_video:
+        if not video_filtered and can_copy(info.video_codec, output_ext):
+            args.append("-c:v copy")
+        elif output_ext in H264_CONTAINERS:
+            args.append(f"-c:v libx264 -preset {profile['preset']} -crf {profile['crf']} -pix_fmt yuv420p")
+
+    if info.has_audio:
+        if not audio_filtered and can_copy(info.audio_codec, output_ext):
+            args.append("-c:a copy")
+        elif output_ext in AUDIO_ENCODERS:
+            args.append(f"-c:a {AUDIO_ENCODERS[output_ext]} -b:a {profile['audio_bitrate']}")
+
+    if output_ext in (".mp4", ".mov", ".m4a"):
+        args.append("-movflags +faststart")
+    return " ".join(args)
+
+
+async def snap_to_keyframe(file_path: str, info: MediaInfo, timestamp: float) -> float | None:
+    """
+    Returns a start time a stream-copy cut can use: the timestamp itself for audio, the nearest video
+    keyframe within KEYFRAME_SNAP_TOLERANCE otherwise. None means the cut needs a re-encode.
+    """
+    if not info.has_video:
+        return timestamp
+    if timestamp <= 0:
+        return 0.0
+
+    keyframes = await get_keyframes(file_path, info)
+    candidates = [k for k in keyframes if abs(k - timestamp) <= KEYFRAME_SNAP_TOLERANCE]
+    return min(candidates, key=lambda k: abs(k - timestamp)) if candidates else None
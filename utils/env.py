@@ -0,0 +1,35 @@
+import os
+
+from dotenv import dotenv_values
+
+from app import Config
+
+MODULES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXTRA_ENV_PATH = os.path.join(MODULES_DIR, "extra_config.env")
+
+
+class ExtraEnv:
+    """
+    extra_config.env, read once for every module.
+    As with load_dotenv, variables already set in the process environment take precedence.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._values = dotenv_values(path) if os.path.exists(path) else {}
+
+        self.VIRUSTOTAL_API_KEY = self.get("VIRUSTOTAL_API_KEY")
+        self.CF_ACCOUNT_ID = self.get("CF_ACCOUNT_ID")
+        self.CF_API_TOKEN = self.get("CF_API_TOKEN")
+        self.TEXT_AI = self.get("TEXT_AI")
+        self.IMAGE_AI = self.get("IMAGE_AI")
+
+        # LOG_CHAT lives in the core config.env, which the core has already parsed.
+        log_chat = str(getattr(Config, "LOG_CHAT", None) or "").strip()
+        self.LOG_CHAT = int(log_chat) if log_chat.lstrip("-").isdigit() else None
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        return os.environ.get(key) or self._values.get(key) or default
+
+
+ENV = ExtraEnv(EXTRA_ENV_PATH)
@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import heapq
+import signal
+import asyncio
+import itertools
+from pyrogram.types import Message
+
+from app.modules.settings import FFMPEG_MAX_JOBS, FFMPEG_JOB_TIMEOUT, FFMPEG_STALL_TIMEOUT, FFMPEG_PROGRESS_INTERVAL
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10
+
+STDERR_TAIL_BYTES = 16 * 1024
+
+_SEQUENCE = itertools.count()
+
+
+class FFmpegTimeout(RuntimeError):
+    pass
+
+
+class FFmpegStalled(RuntimeError):
+    pass
+
+
+class FFmpegJob:
+    def __init__(
+        self,
+        command: str,
+        priority: int,
+        timeout: float | None,
+        progress: Message | None,
+        label: str | None,
+        duration: float | None,
+    ):
+        self.command = command
+        self.priority = priority
+        self.timeout = timeout
+        self.duration = duration
+        self.progress = progress
+        self.label = label or "Processing..."
+        self.seq = next(_SEQUENCE)
+        self.future = asyncio.get_running_loop().create_future()
+        self.task: asyncio.Task | None = None
+        self.process: asyncio.subprocess.Process | None = None
+        self.position = 0
+
+    def __lt__(self, other: "FFmpegJob") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class FFmpegEngine:
+    """Runs FFmpeg jobs through a shared priority queue with a global concurrency cap."""
+
+    def __init__(self, max_jobs: int = FFMPEG_MAX_JOBS):
+        self.max_jobs = max(1, max_jobs)
+        self._pending: list[FFmpegJob] = []
+        self._running: set[FFmpegJob] = set()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for job in self._pending if not job.future.done())
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    async def submit(
+        self,
+        command: str,
+        priority: int = PRIORITY_NORMAL,
+        timeout: float | None = FFMPEG_JOB_TIMEOUT,
+        progress: Message | None = None,
+        label: str | None = None,
+        duration: float | None = None,
+    ) -> tuple[str, str, int]:
+        job = FFmpegJob(command, priority, timeout, progress, label, duration)
+        heapq.heappush(self._pending, job)
+        self._dispatch()
+        try:
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            self.cancel(job)
+            raise
+
+    def cancel(self, job: FFmpegJob):
+        if not job.future.done():
+            job.future.cancel()
+        if job.task and not job.task.done():
+            job.task.cancel()
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._pending and len(self._running) < self.max_jobs:
+            job = heapq.heappop(self._pending)
+            if job.future.done():
+                continue
+            self._running.add(job)
+            job.task = asyncio.create_task(self._execute(job))
+        self._report_positions()
+
+    def _report_positions(self):
+        waiting = sorted(job for job in self._pending if not job.future.done())
+        for position, job in enumerate(waiting, start=1):
+            if job.position != position:
+                job.position = position
+                self._edit(job, f"<code>Queued for processing (position {position})...</code>")
+
+    def _edit(self, job: FFmpegJob, text: str):
+        if job.progress:
+            asyncio.create_task(_safe_edit(job.progress, text))
+
+    async def _execute(self, job: FFmpegJob):
+        if job.position:
+            self._edit(job, f"<code>{job.label}</code>")
+        try:
+            result = await asyncio.wait_for(self._spawn(job), timeout=job.timeout)
+            if not job.future.done():
+                job.future.set_result(result)
+        except asyncio.TimeoutError:
+            if not job.future.done():
+                job.future.set_exception(FFmpegTimeout(f"FFmpeg job timed out after {job.timeout}s."))
+        except asyncio.CancelledError:
+            if not job.future.done():
+                job.future.cancel()
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            _kill(job.process)
+            self._running.discard(job)
+            self._dispatch()
+
+    async def _spawn(self, job: FFmpegJob) -> tuple[str, str, int]:
+        """Runs FFmpeg with -progress on stdout, keeping only a bounded tail of stderr."""
+        command = job.command
+        if command.startswith("ffmpeg "):
+            command = command.replace("ffmpeg ", "ffmpeg -nostats -progress pipe:1 ", 1)
+
+        job.process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        stderr_reader = asyncio.create_task(_read_tail(job.process.stderr))
+        try:
+            await self._follow_progress(job)
+            await job.process.wait()
+        finally:
+            if not stderr_reader.done():
+                _kill(job.process)
+            stderr_tail = await stderr_reader
+        return "", stderr_tail.decode('utf-8', 'replace').strip(), job.process.returncode
+
+    async def _follow_progress(self, job: FFmpegJob):
+        stats: dict[str, str] = {}
+        last_edit = time.monotonic()
+        while True:
+            try:
+                line = await asyncio.wait_for(job.process.stdout.readline(), timeout=FFMPEG_STALL_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise FFmpegStalled(f"FFmpeg made no progress for {FFMPEG_STALL_TIMEOUT}s and was stopped.")
+            if not line:
+                return
+
+            key, _, value = line.decode('utf-8', 'replace').strip().partition("=")
+            if key != "progress":
+                stats[key] = value
+                continue
+            if value == "end":
+                return
+
+            now = time.monotonic()
+            if job.progress and now - last_edit >= FFMPEG_PROGRESS_INTERVAL:
+                last_edit = now
+                self._edit(job, format_progress(job.label, stats, job.duration))
+
+
+def _kill(process: asyncio.subprocess.Process | None):
+    if process is None or process.returncode is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _read_tail(stream: asyncio.StreamReader) -> bytes:
+    tail = b""
+    while chunk := await stream.read(4096):
+        tail = (tail + chunk)[-STDERR_TAIL_BYTES:]
+    return tail
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+def format_progress(label: str, stats: dict[str, str], duration: float | None) -> str:
+    try:
+        done = int(stats.get("out_time_us") or stats.get("out_time_ms") or 0) / 1_000_000
+    except ValueError:
+        done = 0
+    fps = stats.get("fps", "0")
+    lines = [f"<code>{label}</code>"]
+    if duration and duration > 0:
+        percent = min(max(done / duration, 0), 1)
+        bar = "█" * int(percent * 10) + "░" * (10 - int(percent * 10))
+        try:
+            speed = float(stats.get("speed", "0").rstrip("x") or 0)
+        except ValueError:
+            speed = 0
+        eta = _format_seconds((duration - done) / speed) if speed > 0 else "--:--"
+        lines.append(f"<code>[{bar}] {percent * 100:.1f}% | {fps} fps | ETA {eta}</code>")
+    else:
+        lines.append(f"<code>{_format_seconds(done)} processed | {fps} fps</code>")
+    return "\n".join(lines)
+
+
+async def _safe_edit(message: Message, text: str):
+    try:
+        await message.edit(text)
+    except Exception:
+        pass
+
+
+ENGINE = FFmpegEngine()
+
+
+async def run_command(
+    command: str,
+    priority: int = PRIORITY_NORMAL,
+    timeout: float | None = FFMPEG_JOB_TIMEOUT,
+    progress: Message | None = None,
+    label: str | None = None,
+    duration: float | None = None,
+) -> tuple[str, str, int]:
+    """
+    Queues an FFmpeg command on the shared engine and returns (stdout, stderr, returncode).
+    duration is the expected output length in seconds, used for percent done and ETA.
+    """
+    return await ENGINE.submit(
+        command, priority=priority, timeout=timeout, progress=progress, label=label, duration=duration
+    )
+
+
+async def run_probe(command: str, timeout: float = 60) -> tuple[str, str, int]:
+    """Runs a lightweight ffprobe command outside the encoder queue."""
+    process = await asyncio.create_subprocess_shell(
+        command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, start_new_session=True
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    finally:
+        _kill(process)
+    return (
+        stdout.decode('utf-8', 'replace').strip(),
+        stderr.decode('utf-8', 'replace').strip(),
+        process.returncode
+    )
+
+
+async def probe_duration(file_path: str) -> float | None:
+    command = f'ffprobe -v error -show_entries format=duration -of default=nw=1:nk=1 "{file_path}"'
+    stdout, _, code = await run_probe(command)
+    try:
+        return float(stdout) if code == 0 else None
+    except ValueError:
+        return None
+
+
+async def probe_media(file_path: str) -> dict | None:
+    command = f'ffprobe -v quiet -print_format json -show_format -show_streams "{file_path}"'
+    stdout, _, code = await run_probe(command)
+    try:
+        return json.loads(stdout) if code == 0 and stdout else None
+    except ValueError:
+        return None
@@ -0,0 +1,76 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.modules.settings import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HTTP_PER_HOST_LIMIT,
+    HTTP_RETRIES,
+    HTTP_TIMEOUT,
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_client: httpx.AsyncClient | None = None
+_host_limits: dict[str, asyncio.Semaphore] = {}
+
+
+def get_client() -> httpx.AsyncClient:
+    """The process-wide HTTP/2 client, created on first use so idle modules never open a pool."""
+    global _client
+    if _client is None or _client.is_closed:
+        limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE)
+        _client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=limits),
+            timeout=httpx.Timeout(HTTP_TIMEOUT),
+            follow_redirects=True,
+        )
+    return _client
+
+
+def _host_limit(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    if host not in _host_limits:
+        _host_limits[host] = asyncio.Semaphore(HTTP_PER_HOST_LIMIT)
+    return _host_limits[host]
+
+
+async def request(method: str, url: str, retries: int = HTTP_RETRIES, **kwargs) -> httpx.Response:
+    """
+    Sends a request through the shared client.
+    Idempotent requests are retried on transport errors and 429/5xx replies with a short backoff;
+    other methods are only retried when the connection itself failed, so nothing is submitted twice.
+    """
+    method = method.upper()
+    idempotent = method in IDEMPOTENT_METHODS
+    client = get_client()
+
+    for attempt in range(retries + 1):
+        try:
+            async with _host_limit(url):
+                response = await client.request(method, url, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            if attempt == retries:
+                raise
+        except httpx.TransportError:
+            if not idempotent or attempt == retries:
+                raise
+        else:
+            if not (idempotent and response.status_code in RETRY_STATUSES and attempt < retries):
+                return response
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                await asyncio.sleep(min(int(retry_after), 10))
+                continue
+        await asyncio.sleep(0.5 * 2**attempt)
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs) -> httpx.Response:
+    return await request("POST", url, **kwargs)
@@ -0,0 +1,52 @@
+import os
+import time
+import types
+import importlib
+
+# module name -> seconds its first import took, for libraries loaded through lazy_import
+LAZY_LOADS: dict[str, float] = {}
+LAZY_MODULES: dict[str, "LazyModule"] = {}
+
+_created_dirs: set[str] = set()
+
+
+class LazyModule(types.ModuleType):
+    """Placeholder for a module that is imported the first time one of its attributes is read."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            LAZY_LOADS.setdefault(self.__name__, time.perf_counter() - start)
+            self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Returns a stand-in for `name` that defers the real import (and any ImportError) to first use."""
+    if name not in LAZY_MODULES:
+        LAZY_MODULES[name] = LazyModule(name)
+    return LAZY_MODULES[name]
+
+
+def temp_dir(path: str) -> str:
+    """Creates a module's temp directory on first use instead of at import time."""
+    if path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+    return path
@@ -0,0 +1,105 @@
+import time
+from collections import OrderedDict
+from pyrogram.types import Message, ReplyParameters
+
+from app import CustomDB, bot
+
+from app.modules.settings import MEDIA_CACHE_MAX_ENTRIES
+
+MEDIA_CACHE_DB = CustomDB["MEDIA_RESULT_CACHE"]
+
+
+def _normalize(value) -> str:
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value).strip().lower()
+
+
+def _get_file_id(message: Message) -> str | None:
+    media = (
+        message.video or message.animation or message.audio or message.voice or
+        message.photo or message.document or message.sticker or message.video_note
+    )
+    return media.file_id if media else None
+
+
+class MediaResultCache:
+    """LRU map of (file_unique_id, command, params) to the file_id of an already uploaded result."""
+
+    def __init__(self, max_entries: int = MEDIA_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(file_unique_id: str, command: str, **params) -> str:
+        normalized = ",".join(f"{name}={_normalize(value)}" for name, value in sorted(params.items()))
+        return f"{file_unique_id}:{command}:{normalized}"
+
+    async def load(self):
+        entries = [entry async for entry in MEDIA_CACHE_DB.find()]
+        entries.sort(key=lambda entry: entry.get("used", 0))
+        for entry in entries[-self.max_entries:]:
+            self._entries[entry["_id"]] = entry
+
+    def get(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    async def send(self, key: str, chat_id: int, reply_parameters: ReplyParameters | None = None) -> bool:
+        """Re-sends a cached result by file_id. Returns False on a miss so the caller can do the work."""
+        entry = self.get(key)
+        if not entry:
+            return False
+        try:
+            await bot.send_cached_media(
+                chat_id=chat_id,
+                file_id=entry["file_id"],
+                caption=entry.get("caption") or "",
+                reply_parameters=reply_parameters
+            )
+        except Exception:
+            self.hits -= 1
+            self.misses += 1
+            await self.forget(key)
+            return False
+        entry["used"] = time.time()
+        await MEDIA_CACHE_DB.add_data({"_id": key, "used": entry["used"]})
+        return True
+
+    async def store(self, key: str, sent: Message, caption: str | None = None):
+        file_id = _get_file_id(sent) if sent else None
+        if not file_id:
+            return
+        entry = {"_id": key, "file_id": file_id, "caption": caption, "used": time.time()}
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        await MEDIA_CACHE_DB.add_data(dict(entry))
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            await MEDIA_CACHE_DB.delete_data(id=old_key)
+
+    async def forget(self, key: str):
+        if self._entries.pop(key, None) is not None:
+            await MEDIA_CACHE_DB.delete_data(id=key)
+
+    async def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+        await MEDIA_CACHE_DB.drop()
+
+
+MEDIA_CACHE = MediaResultCache()
+
+
+async def init_task():
+    await MEDIA_CACHE.load()
@@ -0,0 +1,91 @@
+import time
+import asyncio
+from collections import OrderedDict
+
+from pyrogram.types import ChatMember, ChatMemberUpdated
+
+from app import BOT, bot
+
+from app.modules.settings import MEMBER_CACHE_HANDLER_GROUP, MEMBER_CACHE_SIZE, MEMBER_CACHE_TTL, MEMBER_SELF_TTL
+
+
+class MemberCache:
+    """
+    Short-lived ChatMember snapshots keyed by (chat_id, user_id), replaced by ChatMemberUpdated events.
+    The account's own membership is kept warm: it is served for MEMBER_SELF_TTL and refreshed in the
+    background once older than MEMBER_CACHE_TTL, so rights checks before an action cost no API call.
+    """
+
+    def __init__(self, ttl: float = MEMBER_CACHE_TTL, self_ttl: float = MEMBER_SELF_TTL, max_size: int = MEMBER_CACHE_SIZE):
+        self.ttl = ttl
+        self.self_ttl = self_ttl
+        self.max_size = max_size
+        # (chat_id, user_id) -> (fetched_at, ChatMember)
+        self._entries: OrderedDict[tuple[int, int], tuple[float, ChatMember]] = OrderedDict()
+        self._inflight: dict[tuple[int, int], asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_self(self, user_id: int) -> bool:
+        return bool(bot.me) and user_id == bot.me.id
+
+    def store(self, chat_id: int, user_id: int, member: ChatMember):
+        self._entries[(chat_id, user_id)] = (time.monotonic(), member)
+        self._entries.move_to_end((chat_id, user_id))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, chat_id: int, user_id: int | None = None):
+        if user_id is not None:
+            self._entries.pop((chat_id, user_id), None)
+            return
+        for key in [key for key in self._entries if key[0] == chat_id]:
+            del self._entries[key]
+
+    def _refresh(self, chat_id: int, user_id: int) -> asyncio.Task:
+        key = (chat_id, user_id)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(chat_id, user_id))
+            # Background refreshes have no awaiter; mark their errors as retrieved.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return task
+
+    async def _fetch(self, chat_id: int, user_id: int) -> ChatMember:
+        try:
+            member = await bot.get_chat_member(chat_id, user_id)
+            self.store(chat_id, user_id, member)
+            return member
+        finally:
+            self._inflight.pop((chat_id, user_id), None)
+
+    async def get(self, chat_id: int, user_id: int) -> ChatMember:
+        """Same as bot.get_chat_member, errors (UserNotParticipant...) included, but served from cache when fresh."""
+        entry = self._entries.get((chat_id, user_id))
+        if entry:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                return entry[1]
+            if self._is_self(user_id) and age < self.self_ttl:
+                self._refresh(chat_id, user_id)
+                return entry[1]
+
+        # Shielded so one caller giving up does not cancel the lookup the others are waiting on.
+        return await asyncio.shield(self._refresh(chat_id, user_id))
+
+    async def get_own(self, chat_id: int) -> ChatMember:
+        return await self.get(chat_id, bot.me.id)
+
+
+MEMBER_CACHE = MemberCache()
+
+
+@bot.on_chat_member_updated(group=MEMBER_CACHE_HANDLER_GROUP)
+async def member_cache_watcher(bot: BOT, update: ChatMemberUpdated):
+    member = update.new_chat_member
+    if member and member.user:
+        MEMBER_CACHE.store(update.chat.id, member.user.id, member)
+    elif update.old_chat_member and update.old_chat_member.user:
+        MEMBER_CACHE.invalidate(update.chat.id, update.old_chat_member.user.id)
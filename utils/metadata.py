@@ -0,0 +1,138 @@
+import asyncio
+from collections import OrderedDict
+
+from app.modules.settings import MEDIA_INFO_CACHE_SIZE
+from app.modules.utils.ffmpeg import probe_media, run_probe
+
+
+class MediaInfo:
+    """The parts of an ffprobe report the media tools read. keyframes is filled on first use."""
+
+    def __init__(self, data: dict | None):
+        self.raw = data or {}
+        self.keyframes: list[float] | None = None
+        streams = self.raw.get("streams") or []
+        self.video = next(
+            (s for s in streams if s.get("codec_type") == "video" and not (s.get("disposition") or {}).get("attached_pic")),
+            None
+        )
+        self.audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+        try:
+            self.duration = float((self.raw.get("format") or {}).get("duration"))
+        except (TypeError, ValueError):
+            self.duration = None
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    @property
+    def has_video(self) -> bool:
+        return self.video is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio is not None
+
+    @property
+    def video_codec(self) -> str | None:
+        return self.video.get("codec_name") if self.video else None
+
+    @property
+    def audio_codec(self) -> str | None:
+        return self.audio.get("codec_name") if self.audio else None
+
+    @property
+    def width(self) -> int | None:
+        return self.video.get("width") if self.video else None
+
+    @property
+    def height(self) -> int | None:
+        return self.video.get("height") if self.video else None
+
+
+class MediaInfoCache:
+    """LRU of parsed ffprobe reports keyed by file_unique_id, so a file is probed once however many tools touch it."""
+
+    def __init__(self, max_entries: int = MEDIA_INFO_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, MediaInfo] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, file_path: str, file_unique_id: str | None = None) -> MediaInfo:
+        if not file_unique_id:
+            return MediaInfo(await probe_media(file_path))
+
+        if file_unique_id in self._entries:
+            self._entries.move_to_end(file_unique_id)
+            return self._entries[file_unique_id]
+
+        task = self._inflight.get(file_unique_id)
+        if task is None:
+            # Concurrent commands on the same file share one ffprobe run.
+            task = asyncio.create_task(self._probe(file_path, file_unique_id))
+            self._inflight[file_unique_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(file_unique_id, None))
+        return await asyncio.shield(task)
+
+    async def _probe(self, file_path: str, file_unique_id: str) -> MediaInfo:
+        info = MediaInfo(await probe_media(file_path))
+        # Failed probes aren't remembered; the next download gets another try.
+        if info:
+            self.store(file_unique_id, info)
+        return info
+
+    def store(self, file_unique_id: str, info: MediaInfo):
+        self._entries[file_unique_id] = info
+        self._entries.move_to_end(file_unique_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, file_unique_id: str):
+        self._entries.pop(file_unique_id, None)
+
+
+METADATA = MediaInfoCache()
+
+
+async def get_media_info(file_path: str, file_unique_id: str | None = None) -> MediaInfo:
+    """
+    Returns the probe report of a downloaded file. Pass the Telegram file_unique_id whenever it's
+    known so repeated commands on the same media skip ffprobe entirely.
+    """
+    return await METADATA.get(file_path, file_unique_id)
+
+
+async def get_keyframes(file_path: str, info: MediaInfo) -> list[float]:
+    """Lists the video keyframe timestamps once per file and keeps them on the cached MediaInfo."""
+    if info.keyframes is not None:
+        return info.keyframes
+    if not info.has_video:
+        return []
+
+    command = (
+        f'ffprobe -v error -select_streams v:0 -skip_frame nokey '
+        f'-show_entries frame=best_effort_timestamp_time -of csv=p=0 "{file_path}"'
+    )
+    stdout, _, code = await run_probe(command, timeout=120)
+    if code != 0:
+        return []
+
+    keyframes = []
+    for line in stdout.splitlines():
+        try:
+            keyframes.append(float(line.strip().strip(",")))
+        except ValueError:
+            continue
+    info.keyframes = keyframes
+    return keyframes
+
+
+def get_file_unique_id(message) -> str | None:
+    media = (
+        message.video or message.animation or message.audio or message.voice or
+        message.photo or message.document or message.sticker or message.video_note
+    )
+    return media.file_unique_id if media else None
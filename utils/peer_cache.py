@@ -0,0 +1,177 @@
+import time
+import asyncio
+from collections import OrderedDict
+
+from pyrogram.errors import UserIdInvalid, UsernameInvalid, UsernameNotOccupied
+from pyrogram.types import Chat, User
+
+from app import bot
+
+from app.modules.settings import PEER_CACHE_SIZE, PEER_CACHE_TTL, PEER_NEGATIVE_TTL
+
+# Definite "this peer does not exist" answers, the only errors that are remembered. PeerIdInvalid and
+# friends only mean the session has not met the peer yet and may succeed a minute later; FloodWait and
+# network errors are never cached either.
+NOT_FOUND_ERRORS = (UsernameNotOccupied, UsernameInvalid, UserIdInvalid)
+
+
+def normalize_identifier(identifier: int | str) -> int | str:
+    """
+    Turns '@name', 't.me/name', 'https://t.me/name/' and '12345' into 'name' / 12345.
+    Invite links (t.me/+hash, t.me/joinchat/hash) are returned as they are.
+    """
+    if isinstance(identifier, int):
+        return identifier
+    identifier = identifier.strip()
+    if "t.me/" in identifier:
+        path = identifier.rstrip("/").split("t.me/", 1)[1]
+        if path.startswith(("+", "joinchat/")):
+            return identifier
+        identifier = path.split("/", 1)[0]
+    identifier = identifier.lstrip("@")
+    if identifier.lstrip("-").isdigit():
+        return int(identifier)
+    return identifier.lower()
+
+
+class PeerCache:
+    """
+    Resolved Users and Chats keyed by ID and username, so repeated lookups skip ResolveUsername/GetUsers.
+    Not-found answers are remembered for PEER_NEGATIVE_TTL, and concurrent lookups of the same peer share one call.
+    Invite links are passed through without caching.
+    """
+
+    def __init__(self, ttl: float = PEER_CACHE_TTL, negative_ttl: float = PEER_NEGATIVE_TTL, max_size: int = PEER_CACHE_SIZE):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        # (kind, identifier) -> (expires_at, User | Chat | the not-found exception)
+        self._entries: OrderedDict[tuple[str, int | str], tuple[float, object]] = OrderedDict()
+        self._inflight: dict[tuple[str, int | str], asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: tuple[str, int | str]):
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _store(self, kind: str, key: int | str, value):
+        ttl = self.negative_ttl if isinstance(value, Exception) else self.ttl
+        expires = time.monotonic() + ttl
+        keys = {key}
+        if not isinstance(value, Exception):
+            # Remember the peer under both of its names so an ID lookup after a username lookup hits too.
+            keys.add(value.id)
+            if getattr(value, "username", None):
+                keys.add(value.username.lower())
+        for alias in keys:
+            self._entries[(kind, alias)] = (expires, value)
+            self._entries.move_to_end((kind, alias))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def _resolve(self, kind: str, identifier: int | str):
+        if isinstance(identifier, str) and "t.me/" in identifier:
+            return await bot.get_chat(identifier)
+
+        key = (kind, identifier)
+        cached = self._lookup(key)
+        if cached is not None:
+            if isinstance(cached, Exception):
+                raise self._fresh_error(cached)
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(kind, identifier))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        # Shielded so one caller giving up does not cancel the lookup the others are waiting on.
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _fresh_error(error: Exception) -> Exception:
+        # Raising the stored instance again would keep growing its traceback; raise a copy instead.
+        # Built without __init__, which for Telegram errors would reformat the message.
+        fresh = error.__class__.__new__(error.__class__)
+        fresh.__dict__.update(error.__dict__)
+        fresh.args = error.args
+        return fresh
+
+    async def _fetch(self, kind: str, identifier: int | str):
+        try:
+            fetch = bot.get_users if kind == "user" else bot.get_chat
+            try:
+                value = await fetch(identifier)
+            except NOT_FOUND_ERRORS as e:
+                self._store(kind, identifier, e)
+                raise
+            self._store(kind, identifier, value)
+            return value
+        finally:
+            self._inflight.pop((kind, identifier), None)
+
+    async def get_user(self, identifier: int | str) -> User:
+        return await self._resolve("user", normalize_identifier(identifier))
+
+    async def get_chat(self, identifier: int | str) -> Chat:
+        return await self._resolve("chat", normalize_identifier(identifier))
+
+    async def get_users(self, identifiers: list[int | str]) -> tuple[list[User], list[str]]:
+        """
+        Resolves many users: cached ones are served directly, the rest with one get_users call per 100.
+        A failing batch is retried one by one to find the bad entries. Returns (users, identifiers not found).
+        """
+        users: list[User] = []
+        failed: list[str] = []
+        missing: list[int | str] = []
+
+        for identifier in identifiers:
+            normalized = normalize_identifier(identifier)
+            cached = self._lookup(("user", normalized))
+            if cached is None:
+                missing.append(normalized)
+            elif isinstance(cached, Exception):
+                failed.append(str(identifier))
+            else:
+                users.append(cached)
+
+        for start in range(0, len(missing), 100):
+            chunk = missing[start:start + 100]
+            try:
+                resolved = await bot.get_users(chunk)
+            except Exception:
+                resolved = None
+            if resolved is not None:
+                for user in resolved:
+                    self._store("user", user.id, user)
+                users.extend(resolved)
+                # Anything the batch silently left out (or a name like "me") is looked up on its own.
+                chunk = [identifier for identifier in chunk if self._lookup(("user", identifier)) is None]
+            for identifier in chunk:
+                try:
+                    users.append(await self.get_user(identifier))
+                except Exception:
+                    failed.append(str(identifier))
+
+        # A peer asked for twice under different names ("me" and its ID) is listed once.
+        return list({user.id: user for user in users}.values()), failed
+
+    def invalidate(self, identifier: int | str):
+        identifier = normalize_identifier(identifier)
+        for kind in ("user", "chat"):
+            entry = self._entries.pop((kind, identifier), None)
+            if entry and not isinstance(entry[1], Exception):
+                self._entries.pop((kind, entry[1].id), None)
+                if getattr(entry[1], "username", None):
+                    self._entries.pop((kind, entry[1].username.lower()), None)
+
+
+PEER_CACHE = PeerCache()
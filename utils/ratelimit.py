@@ -0,0 +1,71 @@
+import time
+import asyncio
+import random
+from pyrogram.errors import FloodWait
+
+from app.modules.settings import FANOUT_RATE, FANOUT_BURST, FANOUT_MAX_RETRIES
+
+
+class TokenBucket:
+    """
+    Async token bucket. Every acquire() takes one token; tokens refill at `rate` per second up to `capacity`.
+    A FloodWait pauses the whole bucket and halves the rate, which then creeps back after successful calls.
+    """
+
+    def __init__(self, rate: float = FANOUT_RATE, capacity: int = FANOUT_BURST, min_rate: float = 0.2):
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_flood_wait(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0
+
+    def on_success(self):
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate * 1.1)
+
+
+# Shared by every fan-out so parallel gbans/fbans don't add up past the account's flood limits.
+FANOUT_LIMITER = TokenBucket()
+
+
+async def call_with_flood_retry(func, *args, limiter: TokenBucket = FANOUT_LIMITER, retries: int = FANOUT_MAX_RETRIES, **kwargs):
+    """Runs a Telegram call under the limiter, sleeping out FloodWaits with a growing, jittered backoff."""
+    for attempt in range(retries + 1):
+        await limiter.acquire()
+        try:
+            result = await func(*args, **kwargs)
+        except FloodWait as e:
+            if attempt == retries:
+                raise
+            wait = float(e.value or 1)
+            limiter.on_flood_wait(wait)
+            await asyncio.sleep(wait + attempt * 2 + random.uniform(0, 1))
+            continue
+        limiter.on_success()
+        return result
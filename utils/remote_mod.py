@@ -0,0 +1,124 @@
+import html
+import asyncio
+
+from pyrogram.types import Chat, ChatPermissions, Message, User
+
+from app import BOT, bot
+
+from app.modules.settings import MEDIUM_TIMEOUT, LONG_TIMEOUT
+from app.modules.settings import FANOUT_CONCURRENCY, REMOTE_MOD_MAX_LISTED
+from app.modules.utils.peer_cache import PEER_CACHE, normalize_identifier
+from app.modules.utils.ratelimit import call_with_flood_retry
+
+
+async def ban_member(chat_id: int, user_id: int):
+    await bot.ban_chat_member(chat_id=chat_id, user_id=user_id)
+
+async def unban_member(chat_id: int, user_id: int):
+    await bot.unban_chat_member(chat_id=chat_id, user_id=user_id)
+
+async def mute_member(chat_id: int, user_id: int):
+    await bot.restrict_chat_member(chat_id=chat_id, user_id=user_id, permissions=ChatPermissions(can_send_messages=False))
+
+
+# cmd -> (past tense shown in confirmations, calls made per user and chat)
+REMOTE_ACTIONS = {
+    "rban": ("Banned", [ban_member]),
+    "runban": ("Unbanned", [unban_member]),
+    "rmute": ("Muted", [mute_member]),
+    "runmute": ("Unmuted", [unban_member]),
+    "rkick": ("Kicked", [ban_member, unban_member]),
+}
+
+
+def split_identifiers(raw: str) -> list[int | str]:
+    """Comma separated IDs, usernames or t.me links, deduplicated in order."""
+    identifiers: dict[int | str, None] = {}
+    for item in raw.split(","):
+        if item.strip():
+            identifiers[normalize_identifier(item)] = None
+    return list(identifiers)
+
+
+async def resolve_chats(identifiers: list[int | str]) -> tuple[list[Chat], list[str]]:
+    async def resolve(identifier):
+        try:
+            return await PEER_CACHE.get_chat(identifier)
+        except Exception:
+            return None
+
+    chats = await asyncio.gather(*(resolve(identifier) for identifier in identifiers))
+    return (
+        [chat for chat in chats if chat],
+        [str(identifier) for identifier, chat in zip(identifiers, chats) if not chat],
+    )
+
+
+def listed_mentions(users: list[User]) -> str:
+    text = "\n".join(f"• {user.mention}" for user in users[:REMOTE_MOD_MAX_LISTED])
+    if len(users) > REMOTE_MOD_MAX_LISTED:
+        text += f"\n• <i>and {len(users) - REMOTE_MOD_MAX_LISTED} more</i>"
+    return text
+
+
+async def remote_action_handler(bot: BOT, message: Message):
+    if not message.input or len(message.input.split()) < 2:
+        await message.reply(f"<b>Usage:</b> <code>.{message.cmd} [user,user...] [chat,chat...] [reason]</code>", del_in=MEDIUM_TIMEOUT)
+        return
+
+    parts = message.input.split(maxsplit=2)
+    reason = parts[2] if len(parts) > 2 else "No reason provided."
+    action_str, calls = REMOTE_ACTIONS[message.cmd]
+
+    (users, failed_users), (chats, failed_chats) = await asyncio.gather(
+        PEER_CACHE.get_users(split_identifiers(parts[0])), resolve_chats(split_identifiers(parts[1]))
+    )
+    if not users or not chats:
+        await message.reply(
+            f"<b>Error:</b> Could not find user or chat.\n<code>{html.escape(', '.join(failed_users + failed_chats))}</code>",
+            del_in=LONG_TIMEOUT,
+        )
+        return
+
+    progress = await message.reply(f"<code>{message.cmd}: {len(users)} user(s) in {len(chats)} chat(s)...</code>")
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+    # chat_id -> users the action went through for / (user, error) pairs
+    done: dict[int, list[User]] = {chat.id: [] for chat in chats}
+    errors: dict[int, list[tuple[User, str]]] = {chat.id: [] for chat in chats}
+
+    async def act(chat: Chat, user: User):
+        async with semaphore:
+            try:
+                for call in calls:
+                    await call_with_flood_retry(call, chat.id, user.id)
+                done[chat.id].append(user)
+            except Exception as e:
+                errors[chat.id].append((user, str(e)))
+
+    await asyncio.gather(*(act(chat, user) for chat in chats for user in users))
+
+    target_str = users[0].mention if len(users) == 1 else f"<b>{len(users)}</b> users"
+    summary = [f"Remote {action_str}: {target_str}\nReason: {reason}"]
+    for chat in chats:
+        chat_users = done[chat.id]
+        if chat_users:
+            # One confirmation per chat, however many users were actioned there.
+            if len(chat_users) == 1:
+                confirmation_text = f"{action_str}: {chat_users[0].mention}\nReason: {reason}"
+            else:
+                confirmation_text = f"{action_str} {len(chat_users)} users:\n{listed_mentions(chat_users)}\nReason: {reason}"
+            try:
+                await call_with_flood_retry(bot.send_message, chat.id, confirmation_text)
+            except Exception:
+                pass
+
+        line = f"\n<b>Chat:</b> {html.escape(chat.title or str(chat.id))} — {len(chat_users)}/{len(users)}"
+        if errors[chat.id]:
+            first_error = html.escape(errors[chat.id][0][1])
+            line += f"\n<i>Failed for {len(errors[chat.id])}: {first_error}</i>"
+        summary.append(line)
+
+    if failed_users or failed_chats:
+        summary.append(f"\n<b>Not found:</b> <code>{html.escape(', '.join(failed_users + failed_chats))}</code>")
+
+    await progress.edit("\n".join(summary))
@@ -0,0 +1,87 @@
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from app.modules.settings import RESPONSE_CACHE_SIZE
+
+
+def _normalize(query) -> str:
+    if isinstance(query, (tuple, list)):
+        return "|".join(_normalize(part) for part in query)
+    return " ".join(str(query).lower().split())
+
+
+class ResponseCache:
+    """
+    Bounded TTL cache for upstream API answers, keyed by source and normalized query.
+    Concurrent lookups of the same key share one fetch. Once an entry expires it is still served
+    for `stale_for` more seconds while a background fetch replaces it.
+    """
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE):
+        self.max_size = max_size
+        # key -> (fresh_until, stale_until, value)
+        self._entries: OrderedDict[str, tuple[float, float, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_fetch(
+        self,
+        source: str,
+        query,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float | Callable[[], float],
+        stale_for: float | None = None,
+    ) -> Any:
+        """
+        Returns the cached answer for (source, query), calling `fetch` when there is none.
+        `ttl` may be a callable for sources that refresh on a schedule. `stale_for` defaults to the ttl.
+        Failed fetches are not cached; a failed background refresh leaves the stale entry in place.
+        """
+        key = f"{source}:{_normalize(query)}"
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry:
+            fresh_until, stale_until, value = entry
+            if now < fresh_until:
+                self._entries.move_to_end(key)
+                return value
+            if now < stale_until:
+                self._entries.move_to_end(key)
+                self._refresh(key, fetch, ttl, stale_for)
+                return value
+
+        # Shielded so one caller giving up does not cancel the fetch the others are waiting on.
+        return await asyncio.shield(self._refresh(key, fetch, ttl, stale_for))
+
+    def invalidate(self, source: str, query):
+        self._entries.pop(f"{source}:{_normalize(query)}", None)
+
+    def _refresh(self, key: str, fetch, ttl, stale_for) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch, ttl, stale_for))
+            # Background refreshes have no awaiter; mark their errors as retrieved.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return task
+
+    async def _fetch(self, key: str, fetch, ttl, stale_for) -> Any:
+        try:
+            value = await fetch()
+            ttl = ttl() if callable(ttl) else ttl
+            now = time.monotonic()
+            self._entries[key] = (now + ttl, now + ttl + (ttl if stale_for is None else stale_for), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+RESPONSE_CACHE = ResponseCache()